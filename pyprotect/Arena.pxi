@@ -0,0 +1,544 @@
+
+# Compact read-only object graphs returned by freeze_arena()
+#
+# Every value is encoded in one 64-bit word: the low ARENA_TAG_BITS bits
+# are the tag, the rest the payload
+cdef int ARENA_TAG_BITS = 3
+cdef long long ARENA_TAG_MASK = 7
+# payload: the int itself
+cdef long long ARENA_INT = 0
+# payload: index in __Arena.strings
+cdef long long ARENA_STR = 1
+# payload: index in __Arena.floats
+cdef long long ARENA_FLOAT = 2
+# payload: 0 for None, 1 for False, 2 for True
+cdef long long ARENA_CONST = 3
+# payload: index in __Arena.objects - other immutable objects
+cdef long long ARENA_OBJ = 4
+# payload: node index - ArenaMapping / ArenaSequence views
+cdef long long ARENA_DICT = 5
+cdef long long ARENA_LIST = 6
+cdef long long ARENA_TUPLE = 7
+# ints in [-ARENA_INT_LIMIT, ARENA_INT_LIMIT) are stored inline
+cdef object ARENA_INT_LIMIT = 1 << 60
+
+
+@cython.final
+@cython.internal
+cdef class __Arena(object):
+    '''
+    Storage shared by all the views of one freeze_arena() call - only
+    'running' is modified after creation
+    Attributes:
+        slots: encoded values of all nodes - each node is a contiguous
+            run starting at node_start
+        node_start: node index-->offset in slots
+        node_aux: node index-->shape index for dicts, length otherwise
+        strings: list of str - each distinct string stored ONCE
+        floats: float values
+        objects: list of other immutable objects
+        shape_keys: shape index-->tuple of keys in order
+        shape_index: shape index-->dict: key-->position in the node
+        running: set of keys of __eq__, __hash__ and __repr__ calls of
+            views in progress - see enter()
+    Dicts with the same keys in the same order share ONE shape
+    '''
+    cdef long long[::1] slots
+    cdef long long[::1] node_start
+    cdef long long[::1] node_aux
+    cdef double[::1] floats
+    cdef list strings
+    cdef list objects
+    cdef list shape_keys
+    cdef list shape_index
+    cdef set running
+
+    cdef enter(self, op, Py_ssize_t node, other):
+        '''
+        Recursion guard for cyclic views - like reprlib.recursive_repr
+        op-->str: operation
+        node-->int: node of the view
+        other-->object: identifies the other operand or None
+        Returns-->key to pass to leave() or None if the same operation
+            is already running on the same node in this thread
+        '''
+        k = (get_ident(), op, node, other)
+        if k in self.running:
+            return None
+        self.running.add(k)
+        return k
+
+    cdef leave(self, k):
+        self.running.discard(k)
+
+    cdef decode(self, long long v):
+        '''
+        v-->encoded value
+        Returns-->scalar or view
+        '''
+        cdef long long tag = v & ARENA_TAG_MASK
+        cdef long long p = (v - tag) // 8
+        if tag == ARENA_INT:
+            return p
+        if tag == ARENA_STR:
+            return self.strings[p]
+        if tag >= ARENA_DICT:
+            return arena_view(self, tag, p)
+        if tag == ARENA_FLOAT:
+            return self.floats[p]
+        if tag == ARENA_CONST:
+            if p == 0:
+                return None
+            return p == 2
+        return self.objects[p]
+
+
+@cython.final
+@cython.internal
+cdef class __ArenaBuilder(object):
+    '''
+    One call of freeze_arena() - lists are turned into the arrays of
+    __Arena by run()
+    Attributes:
+        memo: dict: id(container)-->encoded node - shared and cyclic
+            containers are stored ONCE
+        todo: list of (offset in slots, list of values) to encode
+        str_ids: dict: str-->index in strings
+        shape_ids: dict: (keys, types of keys)-->shape index
+    '''
+    cdef list slots
+    cdef list node_start
+    cdef list node_aux
+    cdef list floats
+    cdef list strings
+    cdef list objects
+    cdef list shape_keys
+    cdef list shape_index
+    cdef dict memo
+    cdef list todo
+    cdef dict str_ids
+    cdef dict shape_ids
+
+    cdef intern(self, str s):
+        '''Returns-->index of 's' in strings'''
+        i = self.str_ids.get(s, None)
+        if i is None:
+            i = len(self.strings)
+            self.strings.append(s)
+            self.str_ids[s] = i
+        return i
+
+    cdef key_of(self, k):
+        '''Returns-->dict key as stored in shape_keys'''
+        if type(k) is str:
+            return self.strings[self.intern(k)]
+        if not isimmutable(k):
+            raise TypeError(
+                'freeze_arena: unsupported dict key type: %s' % (
+                    type(k).__name__,
+                )
+            )
+        return k
+
+    cdef shape_of(self, tuple keys):
+        '''Returns-->index of shape with 'keys' in order'''
+        sig = (keys, tuple([type(k) for k in keys]))
+        i = self.shape_ids.get(sig, None)
+        if i is None:
+            i = len(self.shape_keys)
+            self.shape_keys.append(keys)
+            self.shape_index.append(
+                dict([(k, j) for (j, k) in enumerate(keys)])
+            )
+            self.shape_ids[sig] = i
+        return i
+
+    cdef node_of(self, x, long long tag):
+        '''
+        x-->dict, list or tuple
+        Returns-->int: encoded node - its slots are filled by run()
+        '''
+        k = id(x)
+        v = self.memo.get(k, None)
+        if v is not None:
+            return v
+        if tag == ARENA_DICT:
+            keys = tuple([self.key_of(y) for y in x.keys()])
+            vals = list(x.values())
+            aux = self.shape_of(keys)
+        else:
+            vals = list(x)
+            aux = len(vals)
+        v = (len(self.node_start) << ARENA_TAG_BITS) | tag
+        self.node_start.append(len(self.slots))
+        self.node_aux.append(aux)
+        self.todo.append((len(self.slots), vals))
+        self.slots.extend([0] * len(vals))
+        self.memo[k] = v
+        return v
+
+    cdef encode(self, x):
+        '''
+        x-->object
+        Returns-->int: encoded value
+        '''
+        t = type(x)
+        if t is str:
+            return (self.intern(x) << ARENA_TAG_BITS) | ARENA_STR
+        if t is int:
+            if -ARENA_INT_LIMIT <= x < ARENA_INT_LIMIT:
+                return (x << ARENA_TAG_BITS) | ARENA_INT
+        elif t is float:
+            self.floats.append(x)
+            return ((len(self.floats) - 1) << ARENA_TAG_BITS) | ARENA_FLOAT
+        elif x is None:
+            return ARENA_CONST
+        elif t is bool:
+            return ((2 if x else 1) << ARENA_TAG_BITS) | ARENA_CONST
+        elif isinstance(x, dict):
+            return self.node_of(x, ARENA_DICT)
+        elif isinstance(x, list):
+            return self.node_of(x, ARENA_LIST)
+        elif isinstance(x, tuple):
+            return self.node_of(x, ARENA_TUPLE)
+        elif not isimmutable(x):
+            raise TypeError(
+                'freeze_arena: unsupported type: %s' % (t.__name__,)
+            )
+        self.objects.append(x)
+        return ((len(self.objects) - 1) << ARENA_TAG_BITS) | ARENA_OBJ
+
+    cdef __Arena run(self):
+        '''Returns-->__Arena with all nodes filled'''
+        cdef __Arena a = __Arena.__new__(__Arena)
+        cdef Py_ssize_t off
+        while self.todo:
+            (off, vals) = self.todo.pop()
+            for x in vals:
+                self.slots[off] = self.encode(x)
+                off += 1
+        a.slots = array.array('q', self.slots)
+        a.node_start = array.array('q', self.node_start)
+        a.node_aux = array.array('q', self.node_aux)
+        a.floats = array.array('d', self.floats)
+        a.strings = self.strings
+        a.objects = self.objects
+        a.shape_keys = self.shape_keys
+        a.shape_index = self.shape_index
+        a.running = set()
+        return a
+
+
+cdef arena_freeze(o):
+    '''
+    o-->object
+    Returns-->ArenaMapping, ArenaSequence or 'o' - see freeze_arena()
+    '''
+    cdef __ArenaBuilder b
+    if isinstance(o, dict):
+        tag = ARENA_DICT
+    elif isinstance(o, list):
+        tag = ARENA_LIST
+    elif isinstance(o, tuple):
+        tag = ARENA_TUPLE
+    elif isimmutable(o):
+        return o
+    else:
+        raise TypeError(
+            'freeze_arena: unsupported type: %s' % (type(o).__name__,)
+        )
+    b = __ArenaBuilder.__new__(__ArenaBuilder)
+    (b.slots, b.node_start, b.node_aux, b.floats) = ([], [], [], [])
+    (b.strings, b.objects, b.shape_keys, b.shape_index) = ([], [], [], [])
+    (b.memo, b.todo, b.str_ids, b.shape_ids) = ({}, [], {}, {})
+    v = b.node_of(o, tag)
+    return b.run().decode(v)
+
+
+cdef arena_other_key(other):
+    '''
+    other-->object: compared with a view
+    Returns-->key identifying 'other' - views are created on each read,
+        so a view is identified by its arena and node
+    '''
+    if isinstance(other, ArenaMapping):
+        return (
+            id((<ArenaMapping>other).arena), (<ArenaMapping>other).node,
+        )
+    if isinstance(other, ArenaSequence):
+        return (
+            id((<ArenaSequence>other).arena), (<ArenaSequence>other).node,
+        )
+    return id(other)
+
+
+cdef arena_view(__Arena a, long long tag, long long node):
+    cdef ArenaMapping m
+    cdef ArenaSequence s
+    if tag == ARENA_DICT:
+        m = ArenaMapping.__new__(ArenaMapping)
+        m.arena = a
+        m.node = node
+        return m
+    s = ArenaSequence.__new__(ArenaSequence)
+    s.arena = a
+    s.node = node
+    s.is_tuple = (tag == ARENA_TUPLE)
+    return s
+
+
+@cython.final
+cdef class ArenaMapping(object):
+    '''
+    Read-only view of a dict stored by freeze_arena()
+        - Values are scalars or views - created on each read
+        - Keys are in the order of the original dict
+        - Cannot be created directly
+    '''
+    cdef __Arena arena
+    cdef Py_ssize_t node
+
+    def __init__(self, *args, **kwargs):
+        raise TypeError('ArenaMapping is created by freeze_arena()')
+
+    # --------------------------------------------------------------------
+    # Private methods
+    # --------------------------------------------------------------------
+
+    cdef tuple arena_keys(self):
+        return self.arena.shape_keys[self.arena.node_aux[self.node]]
+
+    cdef arena_get(self, key, default):
+        '''Returns-->value for 'key' or 'default' '''
+        cdef Py_ssize_t i
+        pos = (<dict>self.arena.shape_index[
+            self.arena.node_aux[self.node]
+        ]).get(key, None)
+        if pos is None:
+            return default
+        i = <Py_ssize_t>self.arena.node_start[self.node] + <Py_ssize_t>pos
+        return self.arena.decode(self.arena.slots[i])
+
+    cdef list item_list(self):
+        '''Returns-->list of (key, value) tuples'''
+        cdef Py_ssize_t i = self.arena.node_start[self.node]
+        ret = []
+        for k in self.arena_keys():
+            ret.append((k, self.arena.decode(self.arena.slots[i])))
+            i += 1
+        return ret
+
+    # --------------------------------------------------------------------
+    # Public methods
+    # --------------------------------------------------------------------
+
+    def get(self, key, default=None):
+        return self.arena_get(key, default)
+
+    def keys(self):
+        return CollectionsABC.KeysView(self)
+
+    def values(self):
+        return CollectionsABC.ValuesView(self)
+
+    def items(self):
+        return CollectionsABC.ItemsView(self)
+
+    def __getitem__(self, key):
+        x = self.arena_get(key, no_attr)
+        if x is no_attr:
+            raise KeyError(key)
+        return x
+
+    def __contains__(self, key):
+        return key in <dict>self.arena.shape_index[
+            self.arena.node_aux[self.node]
+        ]
+
+    def __len__(self):
+        return len(self.arena_keys())
+
+    def __iter__(self):
+        return iter(self.arena_keys())
+
+    def __eq__(self, other):
+        if isinstance(other, ArenaMapping):
+            if (
+                (<ArenaMapping>other).arena is self.arena and
+                (<ArenaMapping>other).node == self.node
+            ):
+                return True
+        elif not isinstance(other, CollectionsABC.Mapping):
+            return NotImplemented
+        if len(other) != len(self.arena_keys()):
+            return False
+        # Comparing again while comparing (cycle) - any difference is
+        # found by the outer comparison
+        k = self.arena.enter('eq', self.node, arena_other_key(other))
+        if k is None:
+            return True
+        try:
+            for (key, v) in self.item_list():
+                x = other.get(key, no_attr)
+                if x is no_attr or not (x is v or x == v):
+                    return False
+            return True
+        finally:
+            self.arena.leave(k)
+
+    def __ne__(self, other):
+        x = self.__eq__(other)
+        if x is NotImplemented:
+            return x
+        return not x
+
+    def __hash__(self):
+        k = self.arena.enter('hash', self.node, None)
+        if k is None:
+            return hash(ArenaMapping)
+        try:
+            return hash(frozenset(self.item_list()))
+        finally:
+            self.arena.leave(k)
+
+    def __repr__(self):
+        k = self.arena.enter('repr', self.node, None)
+        if k is None:
+            return '{...}'
+        try:
+            return 'ArenaMapping({%s})' % (', '.join([
+                '%r: %r' % (key, v) for (key, v) in self.item_list()
+            ]),)
+        finally:
+            self.arena.leave(k)
+
+
+@cython.final
+cdef class ArenaSequence(object):
+    '''
+    Read-only view of a list or tuple stored by freeze_arena()
+        - Values are scalars or views - created on each read
+        - Equal to a list or a tuple - as the original was
+        - Slicing returns a tuple
+        - Cannot be created directly
+    '''
+    cdef __Arena arena
+    cdef Py_ssize_t node
+    cdef bint is_tuple
+
+    def __init__(self, *args, **kwargs):
+        raise TypeError('ArenaSequence is created by freeze_arena()')
+
+    # --------------------------------------------------------------------
+    # Private methods
+    # --------------------------------------------------------------------
+
+    cdef Py_ssize_t arena_len(self):
+        return <Py_ssize_t>self.arena.node_aux[self.node]
+
+    cdef arena_item(self, Py_ssize_t i):
+        '''i-->index in [0, len)'''
+        return self.arena.decode(
+            self.arena.slots[<Py_ssize_t>self.arena.node_start[self.node] + i]
+        )
+
+    cdef list item_list(self):
+        return [self.arena_item(i) for i in range(self.arena_len())]
+
+    # --------------------------------------------------------------------
+    # Public methods
+    # --------------------------------------------------------------------
+
+    def count(self, val):
+        return self.item_list().count(val)
+
+    def index(self, val, *args):
+        return self.item_list().index(val, *args)
+
+    def __len__(self):
+        return self.arena_len()
+
+    def __getitem__(self, i):
+        cdef Py_ssize_t j
+        cdef Py_ssize_t n = self.arena_len()
+        if isinstance(i, slice):
+            return tuple([
+                self.arena_item(j) for j in range(*i.indices(n))
+            ])
+        j = operator.index(i)
+        if j < 0:
+            j += n
+        if j < 0 or j >= n:
+            raise IndexError('ArenaSequence index out of range')
+        return self.arena_item(j)
+
+    def __iter__(self):
+        cdef Py_ssize_t i = 0
+        while i < self.arena_len():
+            yield self.arena_item(i)
+            i += 1
+
+    def __reversed__(self):
+        return reversed(self.item_list())
+
+    def __contains__(self, val):
+        for x in self:
+            if x is val or x == val:
+                return True
+        return False
+
+    def __eq__(self, other):
+        if isinstance(other, ArenaSequence):
+            if (
+                (<ArenaSequence>other).arena is self.arena and
+                (<ArenaSequence>other).node == self.node
+            ):
+                return True
+            if (<ArenaSequence>other).is_tuple != self.is_tuple:
+                return False
+        elif not isinstance(other, tuple if self.is_tuple else list):
+            return NotImplemented
+        if len(other) != self.arena_len():
+            return False
+        # Comparing again while comparing (cycle) - any difference is
+        # found by the outer comparison
+        k = self.arena.enter('eq', self.node, arena_other_key(other))
+        if k is None:
+            return True
+        try:
+            for (x, y) in zip(self, other):
+                if not (x is y or x == y):
+                    return False
+            return True
+        finally:
+            self.arena.leave(k)
+
+    def __ne__(self, other):
+        x = self.__eq__(other)
+        if x is NotImplemented:
+            return x
+        return not x
+
+    def __hash__(self):
+        k = self.arena.enter('hash', self.node, None)
+        if k is None:
+            return hash(ArenaSequence)
+        try:
+            return hash(tuple(self.item_list()))
+        finally:
+            self.arena.leave(k)
+
+    def __repr__(self):
+        k = self.arena.enter('repr', self.node, None)
+        if k is None:
+            return '(...)' if self.is_tuple else '[...]'
+        try:
+            if self.is_tuple:
+                return 'ArenaSequence(%r)' % (tuple(self.item_list()),)
+            return 'ArenaSequence(%r)' % (self.item_list(),)
+        finally:
+            self.arena.leave(k)
+
+
+CollectionsABC.Mapping.register(ArenaMapping)
+CollectionsABC.Sequence.register(ArenaSequence)
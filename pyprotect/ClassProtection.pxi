@@ -0,0 +1,366 @@
+
+# Marker for a name not found through the MRO - see __ClassGuard
+cdef object no_attr = object()
+# True once protect_class() has created a class - until then
+# class_policy() returns None without looking at the class of the object
+cdef bint protected_classes_exist = False
+
+
+cdef set class_codes(cls):
+    '''
+    cls-->type
+    Returns-->set of code objects of functions defined in the class
+        body of 'cls' and its bases (except object), including nested
+        functions, lambdas and comprehensions
+    '''
+    ret = set()
+    todo = []
+    for b in cls.__mro__:
+        if b is object:
+            continue
+        for x in b.__dict__.values():
+            if isinstance(x, (classmethod, staticmethod)):
+                x = x.__func__
+            if isinstance(x, property):
+                todo.extend([x.fget, x.fset, x.fdel])
+                continue
+            todo.append(x)
+    while todo:
+        x = todo.pop()
+        # Code of decorators is not an insider - code of the
+        # decorated function is
+        seen = set()
+        while hasattr(x, '__wrapped__') and id(x) not in seen:
+            seen.add(id(x))
+            x = x.__wrapped__
+        c = getattr(x, '__code__', x)
+        if not isinstance(c, types.CodeType) or c in ret:
+            continue
+        ret.add(c)
+        todo.extend([
+            y for y in c.co_consts if isinstance(y, types.CodeType)
+        ])
+    return ret
+
+
+@cython.final
+@cython.internal
+cdef class __ClassPolicy(object):
+    '''
+    Set as attribute PROT_ATTR_NAME of classes returned by protect_class()
+    Attributes:
+        rules: dict: returned by protected_rules_from_kwargs
+        frozen: bool
+    Code objects in 'codes' are 'insiders' - not restricted
+    '''
+    cdef readonly dict rules
+    cdef readonly bint frozen
+    cdef str cn
+    cdef object hidden_private_attr
+    cdef set codes
+    cdef dict vis_cache
+    cdef object cls
+
+    def testop(self, a, op):
+        '''
+        a-->str: attribute name
+        op-->str: one of ('r', 'w')
+        Returns-->bool: rules allow 'op' on 'a' for code outside the class
+        '''
+        if op == 'r':
+            return self.visible(a)
+        if op == 'w':
+            return self.writeable(None, a)
+        return False
+
+    def __setattr__(self, a, val):
+        raise LazyProtectionError('Cannot modify attribute: %s', a)
+
+    # --------------------------------------------------------------------
+    # Private methods
+    # --------------------------------------------------------------------
+
+    cdef bint insider(self):
+        '''Returns-->bool: calling python frame belongs to the class'''
+        return sys._getframe(0).f_code in self.codes
+
+    cdef bint visible(self, a):
+        x = self.vis_cache.get(a, None)
+        if x is None:
+            x = not (
+                unmangled_private_attr.match(a) or
+                self.hidden_private_attr.match(a)
+            ) and rules_allow(self.rules, None, a, 'r', self.frozen, 0)
+            self.vis_cache[a] = x
+        return x
+
+    cdef bint writeable(self, inst, a):
+        cdef int method = -1
+        if self.frozen or not self.visible(a):
+            return False
+        if a in indirect_attributes or a == PROT_ATTR_NAME:
+            return False
+        if inst is None:
+            method = (attr_kind(self.cls, a) == KIND_METHOD)
+        return rules_allow(self.rules, inst, a, 'w', False, method)
+
+    cdef check_setattr(self, inst, a):
+        if self.frozen:
+            raise frozen_error
+        if not self.writeable(inst, a):
+            raise LazyProtectionError('Read only attribute: %s', a)
+        if not has_attr(inst, a):
+            raise LazyProtectionError(
+                'Cannot add attribute: %s.%s', self.cn, a
+            )
+
+    cdef check_delattr(self, inst, a):
+        if self.frozen:
+            raise frozen_error
+        if not self.visible(a) or not has_attr(inst, a):
+            raise LazyAttributeError(
+                "'%s' object has no attribute '%s'", self.cn, a
+            )
+        raise LazyProtectionError('Cannot delete attribute: %s.%s', self.cn, a)
+
+    cdef guard(self, a):
+        '''
+        a-->str: attribute name
+        Installs __ClassGuard for 'a' in the generated class if 'a'
+        is hidden and not already guarded
+        '''
+        if self.visible(a) or a == '__dict__':
+            return
+        if isinstance(self.cls.__dict__.get(a, None), __ClassGuard):
+            return
+        g = __ClassGuard.__new__(__ClassGuard)
+        (<__ClassGuard>g).policy = self
+        (<__ClassGuard>g).name = a
+        (<__ClassGuard>g).base_attr = no_attr
+        for b in self.cls.__mro__[1:]:
+            if a in b.__dict__:
+                (<__ClassGuard>g).base_attr = b.__dict__[a]
+                break
+        x = (<__ClassGuard>g).base_attr
+        (<__ClassGuard>g).base_data = (
+            hasattr(type(x), '__set__') or hasattr(type(x), '__delete__')
+        )
+        type.__setattr__(self.cls, a, g)
+
+    cdef outside_dict(self, inst):
+        '''
+        inst-->instance of the generated class
+        Returns-->FrozenPrivacyDict: visible items of the instance __dict__
+        '''
+        d = instance_dict(inst)
+        if d is None:
+            d = {}
+        return privatedict(
+            {k: v for (k, v) in d.items() if self.visible(k)},
+            self.cn, frozen=True
+        )
+
+
+@cython.final
+@cython.internal
+cdef class __ClassGuard(object):
+    '''
+    Data descriptor installed in classes returned by protect_class()
+    for hidden attributes - takes precedence over the instance __dict__
+    Code outside the class sees no attribute
+    '''
+    cdef __ClassPolicy policy
+    cdef str name
+    cdef object base_attr
+    cdef bint base_data
+
+    def __get__(self, inst, owner):
+        if not self.policy.insider():
+            raise LazyAttributeError(
+                "'%s' object has no attribute '%s'", self.policy.cn, self.name
+            )
+        x = self.base_attr
+        if inst is None:
+            if x is no_attr:
+                raise LazyAttributeError(
+                    "type object '%s' has no attribute '%s'",
+                    self.policy.cn, self.name
+                )
+            if hasattr(type(x), '__get__'):
+                return x.__get__(None, owner)
+            return x
+        if self.base_data:
+            return x.__get__(inst, owner)
+        d = instance_dict(inst)
+        if d is not None and self.name in d:
+            return d[self.name]
+        if x is no_attr:
+            raise LazyAttributeError(
+                "'%s' object has no attribute '%s'", self.policy.cn, self.name
+            )
+        if hasattr(type(x), '__get__'):
+            return x.__get__(inst, owner)
+        return x
+
+    def __set__(self, inst, val):
+        if not self.policy.insider():
+            raise LazyProtectionError(
+                'Cannot add attribute: %s.%s', self.policy.cn, self.name
+            )
+        if self.base_data:
+            self.base_attr.__set__(inst, val)
+            return
+        d = instance_dict(inst)
+        if d is None:
+            raise LazyAttributeError(
+                "'%s' object has no attribute '%s'", self.policy.cn, self.name
+            )
+        d[self.name] = val
+
+    def __delete__(self, inst):
+        if self.policy.insider():
+            if self.base_data:
+                self.base_attr.__delete__(inst)
+                return
+            d = instance_dict(inst)
+            if d is not None and self.name in d:
+                del d[self.name]
+                return
+        raise LazyAttributeError(
+            "'%s' object has no attribute '%s'", self.policy.cn, self.name
+        )
+
+
+@cython.final
+@cython.internal
+cdef class __DictGuard(object):
+    '''
+    Replaces __dict__ in classes returned by protect_class()
+    Code outside the class gets a FrozenPrivacyDict without hidden items
+    '''
+    cdef __ClassPolicy policy
+
+    def __get__(self, inst, owner):
+        if inst is None:
+            return owner.__dict__
+        if self.policy.insider():
+            return instance_dict(inst)
+        return self.policy.outside_dict(inst)
+
+    def __set__(self, inst, val):
+        raise frozen_error
+
+    def __delete__(self, inst):
+        raise frozen_error
+
+
+cdef make_protected_class(cls, kwargs):
+    '''
+    cls-->type
+    kwargs-->dict: protect() keyword arguments (without 'dynamic')
+    Returns-->type: subclass of 'cls' - see protect_class()
+    '''
+    global protected_classes_exist
+    cdef __ClassPolicy policy
+    cdef __DictGuard dg
+
+    for b in cls.__mro__:
+        x = b.__dict__.get(PROT_ATTR_NAME, None)
+        if isinstance(x, __ClassPolicy):
+            # Rules of protected base class are merged
+            kwargs = protected_merge_kwargs(
+                (<__ClassPolicy>x).rules['kwargs'], kwargs
+            )
+            kwargs.pop('dynamic', None)
+            break
+
+    policy = __ClassPolicy.__new__(__ClassPolicy)
+    policy.rules = dict(protected_rules_from_kwargs(kwargs))
+    policy.frozen = bool(kwargs.get('frozen', False))
+    policy.cn = cls.__name__
+    policy.hidden_private_attr = re.compile(
+        mangled_private_attr_regex_fmt % (cls.__name__.lstrip('_'),)
+    )
+    policy.codes = class_codes(cls)
+    policy.vis_cache = {}
+
+    base_setattr = cls.__setattr__
+    base_delattr = cls.__delattr__
+    base_dir = cls.__dir__
+    holder = []
+
+    def __setattr__(self, a, val):
+        if not policy.insider():
+            policy.check_setattr(self, a)
+        policy.guard(a)
+        base_setattr(self, a, val)
+
+    def __delattr__(self, a):
+        if not policy.insider():
+            policy.check_delattr(self, a)
+        base_delattr(self, a)
+
+    def __dir__(self):
+        # object.__dir__ reads __dict__ - outsiders get a FrozenPrivacyDict
+        ret = list(base_dir(self))
+        d = instance_dict(self)
+        if d is not None:
+            ret = list(set(ret).union(d))
+        if policy.insider():
+            return ret
+        return [
+            x for x in ret
+            if x != PROT_ATTR_NAME and policy.visible(x)
+        ]
+
+    def __init_subclass__(sub, **kw):
+        # Methods of subclasses are also insiders
+        policy.codes.update(class_codes(sub))
+        super(holder[0], sub).__init_subclass__(**kw)
+
+    ns = {
+        '__slots__': (),
+        '__module__': cls.__module__,
+        '__qualname__': getattr(cls, '__qualname__', cls.__name__),
+        '__doc__': cls.__doc__,
+        PROT_ATTR_NAME: policy,
+        '__setattr__': __setattr__,
+        '__delattr__': __delattr__,
+        '__dir__': __dir__,
+        '__init_subclass__': classmethod(__init_subclass__),
+    }
+    if attr_kind(cls, '__dict__') == KIND_DATA_DESCRIPTOR:
+        dg = __DictGuard.__new__(__DictGuard)
+        dg.policy = policy
+        ns['__dict__'] = dg
+    ret = type(cls)(cls.__name__, (cls,), ns)
+    holder.append(ret)
+    policy.cls = ret
+    protected_classes_exist = True
+
+    # Hidden names known now - others are guarded when first set
+    for a in list(kwargs.get('hide', [])):
+        if isinstance(a, str):
+            policy.guard(a)
+    for b in cls.__mro__:
+        if b is object:
+            continue
+        for a in list(b.__dict__):
+            if isinstance(a, str):
+                policy.guard(a)
+    return ret
+
+
+cdef __ClassPolicy class_policy(o):
+    '''
+    o-->object
+    Returns-->__ClassPolicy if 'o' is an instance of a class returned by
+        protect_class(); None otherwise
+    Needs to be FAST - called by isfrozen() for every object frozen
+    '''
+    if not protected_classes_exist or isinstance(o, (type, Wrapped)):
+        return None
+    x = type_lookup(type(o), PROT_ATTR_NAME)
+    if isinstance(x, __ClassPolicy):
+        return x
+    return None
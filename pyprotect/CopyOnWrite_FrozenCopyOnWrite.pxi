@@ -0,0 +1,612 @@
+
+# Builtin containers copied by __CowNode on first write - protect() with
+# cow=True does not accept them (their items are not attributes)
+cdef tuple cow_container_types = (list, dict, set, bytearray)
+
+# Reading these attributes through a __CowNode is a write - m_block plus
+# mutating methods of builtin containers that m_block does not name
+cdef frozenset cow_mutators = frozenset(m_block).union([
+    'extend', 'difference_update', 'intersection_update',
+    'symmetric_difference_update',
+])
+# Names in m_block that are ordinary methods of objects other than
+# builtin containers - CopyOnWrite reads them from the wrapped object
+cdef frozenset cow_method_names = frozenset([
+    a for a in m_block if not a.startswith('__')
+])
+
+
+cdef cow_value(x, parent, key, bint item):
+    '''
+    x-->object: value read through a copy-on-write wrapper
+    parent-->CopyOnWrite or __CowNode or None: wrapper 'x' was read from
+    key-->attribute name or item key of 'x' in 'parent'
+    item-->bool: 'key' is an item key
+    Returns-->'x' if it need not be copied; __CowNode otherwise
+    Callables and values without a parent (method results, iteration)
+    are detached - writes to them are not copied back into 'parent'
+    '''
+    if (
+        isinstance(x, (Wrapped, type, types.ModuleType)) or
+        isimmutable(x)
+    ):
+        return x
+    n = __CowNode(x)
+    if parent is not None and not callable(x):
+        (<__CowNode>n).cow_parent = parent
+        (<__CowNode>n).cow_key = key
+        (<__CowNode>n).cow_item = item
+    return n
+
+
+cdef cow_bind(x, o, self_obj):
+    '''
+    x-->object: attribute read from 'o'
+    o-->object wrapped by 'self_obj'
+    self_obj-->__CowNode
+    Returns-->'x' - a method of 'o' is bound to 'self_obj' instead, so
+        that its writes are copied on write too
+    '''
+    if isinstance(x, types.MethodType) and x.__self__ is o:
+        return types.MethodType(x.__func__, self_obj)
+    return x
+
+
+cdef cow_unwrap(x):
+    '''
+    x-->object: value written through a copy-on-write wrapper
+    Returns-->object stored in the overlay or copy - never a __CowNode
+    Values read from the overlay or a copy are wrapped again
+    '''
+    if isinstance(x, __CowNode):
+        return (<__CowNode>x).pvt_o
+    return x
+
+
+@cython.final
+@cython.internal
+cdef class __CowNode(Wrapped):
+    '''
+    Returned by CopyOnWrite for mutable values - container or object
+        - Reads go to the wrapped value, which is shared with the
+          object wrapped by CopyOnWrite until the first write
+        - The first write replaces the wrapped value by copy.copy() of
+          it and stores the copy in the parent - up to the overlay of
+          CopyOnWrite
+        - Writes: setattr, delattr, item assignment and deletion,
+          augmented assignment and reading a name in cow_mutators
+        - Methods of the wrapped value are bound to the node - their
+          writes are copied on write too
+    Values read from the node are nodes too - so nested values are
+    copied only when written
+    The node bound to methods of the object wrapped by CopyOnWrite has
+    cow_root set: its attributes are read and written through cow_root
+    '''
+    cdef object cow_parent
+    cdef object cow_root
+    cdef object cow_key
+    cdef bint cow_item
+    cdef bint cow_copied
+    cdef dict cow_children
+
+    def __init__(self, o):
+        '''o-->object to be wrapped'''
+        Wrapped.__init__(self, o, frozen=False)
+        self.cow_children = {}
+
+    # --------------------------------------------------------------------
+    # Private methods
+    # --------------------------------------------------------------------
+
+    cdef owned_parts(self):
+        '''Adds nodes of values read'''
+        return Wrapped.owned_parts(self) + (self.cow_children,)
+
+    cdef cow_replace(self, x):
+        '''
+        x-->object: private copy that replaces the wrapped value
+        Stores 'x' in the parent
+        '''
+        self.pvt_o = x
+        self.cow_copied = True
+        p = self.cow_parent
+        if isinstance(p, __CowNode):
+            (<__CowNode>p).cow_store(self, x)
+        elif isinstance(p, CopyOnWrite):
+            (<CopyOnWrite>p).cow_store(self, x)
+
+    cdef cow_materialize(self):
+        '''Copies the wrapped value on first write'''
+        if not self.cow_copied:
+            self.cow_replace(copy.copy(self.pvt_o))
+
+    cdef cow_store(self, __CowNode child, x):
+        '''
+        child-->__CowNode read from this node
+        x-->object: copy made by 'child'
+        Nothing is stored if 'child' was replaced - e.g. by a write
+        '''
+        k = child.cow_key
+        try:
+            if self.cow_children.get(k, None) is not child:
+                return
+        except TypeError:
+            return
+        if child.cow_item and type(self.pvt_o) is tuple:
+            l = list(self.pvt_o)
+            l[k] = x
+            self.cow_replace(tuple(l))
+            return
+        self.cow_materialize()
+        if child.cow_item:
+            self.pvt_o[k] = x
+        else:
+            setattr(self.pvt_o, k, x)
+
+    cdef cow_write(self, key=None, bint one=False):
+        '''
+        Called BEFORE a write - copies the wrapped value
+        key, one: only node for 'key' is replaced if 'one' is True;
+            otherwise positions may change - all nodes are replaced
+        '''
+        if self.cow_root is not None:
+            # Object wrapped by CopyOnWrite - only attributes are copied
+            raise LazyProtectionError('Cannot modify items: %s', self.cn)
+        self.cow_materialize()
+        if not one or isinstance(key, slice):
+            self.cow_children.clear()
+            return
+        try:
+            self.cow_children.pop(key, None)
+        except TypeError:
+            self.cow_children.clear()
+
+    cdef cow_child(self, key, bint item, x):
+        '''
+        key-->attribute name or item key
+        item-->bool
+        x-->object: value read for 'key'
+        Returns-->object: see cow_value - nodes are reused
+        '''
+        try:
+            n = self.cow_children.get(key, None)
+        except TypeError:
+            return cow_value(x, None, None, False)
+        if n is not None and (<__CowNode>n).pvt_o is x:
+            return n
+        n = cow_value(x, self, key, item)
+        if isinstance(n, __CowNode) and (<__CowNode>n).cow_parent is self:
+            self.cow_children[key] = n
+        return n
+
+    cdef wrapped_getattr(self, a):
+        if self.cow_root is not None and (
+            a not in indirect_attributes or a in cow_method_names
+        ):
+            return (<CopyOnWrite>self.cow_root).cow_get(a, False)
+        if a in cow_mutators:
+            self.cow_write()
+        if a in overridden_always or (a in m_block and hasattr(Wrapped, a)):
+            # Methods of this class - not of Wrapped - copy first
+            return __HiddenPartial(getattr(__CowNode, a), self)
+        if a in indirect_attributes:
+            if a in always_frozen:
+                return freeze(getattr(self.pvt_o, a))
+            return Wrapped.wrapped_getattr(self, a)
+        x = Wrapped.wrapped_getattr(self, a)
+        if type(x) is types.MethodType and x.__self__ is self.pvt_o:
+            return cow_bind(x, self.pvt_o, self)
+        return self.cow_child(a, False, x)
+
+    # --------------------------------------------------------------------
+    # Public methods
+    # --------------------------------------------------------------------
+
+    def __setattr__(self, a, val):
+        self.wrapped_check_setattr(a, val)
+        if stats_enabled:
+            stats_incr('writes', type(self).__name__)
+        if self.cow_root is not None:
+            (<CopyOnWrite>self.cow_root).cow_self_set(a, val)
+            return
+        self.cow_write(a, True)
+        setattr(self.pvt_o, a, cow_unwrap(val))
+
+    def __delattr__(self, a):
+        self.wrapped_check_delattr(a)
+        if self.cow_root is not None:
+            # The overlay cannot hide attributes of the wrapped object
+            raise LazyProtectionError(
+                'Cannot delete attribute: %s.%s', self.cn, a
+            )
+        if stats_enabled:
+            stats_incr('deletes', type(self).__name__)
+        self.cow_write(a, True)
+        delattr(self.pvt_o, a)
+
+    def __call__(self, *args, **kwargs):
+        f = cow_bind(
+            getattr(self.pvt_o, '__call__'), self.pvt_o, self
+        )
+        return cow_value(f(*args, **kwargs), None, None, False)
+
+    def __iter__(self):
+        if isinstance(self.pvt_o, (list, tuple)):
+            for i in range(len(self.pvt_o)):
+                yield self[i]
+            return
+        for x in iter(self.pvt_o):
+            yield cow_value(x, None, None, False)
+
+    def __getitem__(self, key):
+        x = self.pvt_o.__getitem__(key)
+        if isinstance(key, slice):
+            return cow_value(x, None, None, False)
+        return self.cow_child(key, True, x)
+
+    def __setitem__(self, key, val):
+        self.cow_write(key, True)
+        self.pvt_o.__setitem__(key, cow_unwrap(val))
+
+    def __delitem__(self, key):
+        self.cow_write()
+        self.pvt_o.__delitem__(key)
+
+    def __iadd__(self, val):
+        self.cow_write()
+        return Proxy.__iadd__(self, val)
+
+    def __imul__(self, val):
+        self.cow_write()
+        return Proxy.__imul__(self, val)
+
+    def __isub__(self, val):
+        self.cow_write()
+        return Proxy.__isub__(self, val)
+
+    def __imod__(self, val):
+        self.cow_write()
+        return Proxy.__imod__(self, val)
+
+    def __ilshift__(self, val):
+        self.cow_write()
+        return Proxy.__ilshift__(self, val)
+
+    def __irshift__(self, val):
+        self.cow_write()
+        return Proxy.__irshift__(self, val)
+
+    def __iand__(self, val):
+        self.cow_write()
+        return Proxy.__iand__(self, val)
+
+    def __ior__(self, val):
+        self.cow_write()
+        return Proxy.__ior__(self, val)
+
+    def __ixor__(self, val):
+        self.cow_write()
+        return Proxy.__ixor__(self, val)
+
+    def __ipow__(self, val):
+        self.cow_write()
+        return Proxy.__ipow__(self, val)
+
+    def __itruediv__(self, val):
+        self.cow_write()
+        return Proxy.__itruediv__(self, val)
+
+    def __ifloordiv__(self, val):
+        self.cow_write()
+        return Proxy.__ifloordiv__(self, val)
+
+    def __imatmul__(self, val):
+        self.cow_write()
+        return Proxy.__imatmul__(self, val)
+
+    # Python / cython does not automatically use parent __hash__
+    def __hash__(self):
+        return Wrapped.__hash__(self)
+
+    # __richcmp__ needs to be class-specific
+    def __richcmp__(self, other, int op):
+        '''Use common method for all Wrapped objects'''
+        return self.comparator(other, op)
+
+
+# @cython.internal
+cdef class CopyOnWrite(Protected):
+    '''
+    Subclass of Protected where writes allowed by the rules go to an
+    overlay held by the wrapper - the wrapped object is never modified
+        - Reads check the overlay first, then the wrapped object
+        - Mutable values are returned as wrappers that copy the value
+          (copy.copy) on first write and store the copy in the overlay
+        - Results of methods are wrapped the same way
+        - Methods of the wrapped object are bound to a wrapper that
+          reads and writes the overlay - they never modify the wrapped
+          object either
+    Memory used is proportional to what is written - not to the size
+    of the wrapped object
+    '''
+    # attribute name-->value written or copied
+    cdef dict overlay
+    # attribute name-->__CowNode returned for the attribute
+    cdef dict cow_children
+    # __CowNode methods of the wrapped object are bound to - created
+    # on first use
+    cdef object cow_self
+    # Names of the View that was protected with cow=True - only these
+    # can be visible or writeable. None if not created from a View
+    cdef frozenset cow_view
+
+    def __init__(self, o, rules):
+        '''
+        o-->object to be wrapped
+        rules-->dict: returned by protected_rules_from_kwargs
+        '''
+        if isinstance(o, cow_container_types):
+            raise TypeError(
+                'cow=True needs attributes to copy - not %s' % (type(o),)
+            )
+        self.cow_view = rules.get('view', None)
+        Protected.__init__(self, o, rules)
+        self.overlay = {}
+        self.cow_children = {}
+
+    # --------------------------------------------------------------------
+    # Private methods
+    # --------------------------------------------------------------------
+
+    cdef owned_parts(self):
+        '''Adds overlay and nodes of values read'''
+        return Protected.owned_parts(self) + (
+            self.overlay, self.cow_children,
+        )
+
+    cdef cow_rewrap(self, rules):
+        '''
+        rules-->dict: returned by protected_rules_from_kwargs
+        Returns-->CopyOnWrite or FrozenCopyOnWrite sharing the overlay
+        '''
+        cdef CopyOnWrite w
+        if rules.get('frozen', False):
+            w = FrozenCopyOnWrite(self.pvt_o, rules)
+        else:
+            w = CopyOnWrite(self.pvt_o, rules)
+        w.overlay = self.overlay
+        w.cow_children = self.cow_children
+        return w
+
+    cdef cow_store(self, __CowNode child, x):
+        '''
+        child-->__CowNode read from this wrapper
+        x-->object: copy made by 'child'
+        Nothing is stored if 'child' was replaced by a write
+        '''
+        if self.cow_children.get(child.cow_key, None) is child:
+            self.overlay[child.cow_key] = x
+
+    cdef cow_set(self, a, val):
+        '''Called only after protected_check_setattr(a, val)'''
+        self.cow_children.pop(a, None)
+        self.overlay[a] = cow_unwrap(val)
+
+    cdef cow_self_set(self, a, val):
+        '''Write by a method of the wrapped object - see cow_self_node'''
+        if self.frozen:
+            raise frozen_error
+        self.cow_set(a, val)
+
+    cdef cow_self_node(self):
+        '''
+        Returns-->__CowNode that methods of the wrapped object are bound
+            to - it reads and writes attributes through cow_get() and
+            cow_self_set() without checking the rules
+        '''
+        cdef __CowNode n
+        if self.cow_self is None:
+            n = __CowNode(self.pvt_o)
+            n.cow_root = self
+            self.cow_self = n
+        return self.cow_self
+
+    cdef cow_get(self, a, bint checked):
+        '''
+        a-->attribute name
+        checked-->bool: protected_getattr() - rules apply; reads by
+            methods bound to cow_self_node() are not checked
+        Returns-->value in the overlay or of the wrapped object
+        '''
+        if checked and not self.visible(a):
+            # Methods may have written attributes that are hidden
+            raise LazyAttributeError(
+                "Object Protected('%s') has no attribute '%s'", self.cn, a
+            )
+        n = self.cow_children.get(a, None)
+        if n is not None:
+            return self.fif(n)
+        ro = self.frozen
+        if a in self.overlay:
+            x = self.overlay[a]
+        else:
+            # Visibility is checked above - read the attribute itself so
+            # that methods are bound before being frozen
+            try:
+                x = getattr(self.pvt_o, a)
+            except AttributeError:
+                raise LazyAttributeError(
+                    "Object Protected('%s') has no attribute '%s'", self.cn, a
+                )
+            if checked and not callable(x) and not self.writeable(a):
+                ro = True
+        if type(x) is types.MethodType:
+            x = cow_bind(x, self.pvt_o, self.cow_self_node())
+        if ro:
+            return self.freeze_child(x)
+        n = cow_value(x, self, a, False)
+        if isinstance(n, __CowNode) and (<__CowNode>n).cow_parent is self:
+            self.cow_children[a] = n
+        return n
+
+    cdef protected_getattr(self, a):
+        if a == PROT_ATTR_NAME or (
+            a in indirect_attributes and a not in cow_method_names
+        ):
+            if a in overridden_always or (a in m_block and hasattr(Wrapped, a)):
+                self.aclcheck(a=a, op='r')
+                # Methods of this class - not of Wrapped
+                return __HiddenPartial(getattr(CopyOnWrite, a), self)
+            return Protected.protected_getattr(self, a)
+        self.aclcheck(a=a, op='r')
+        return self.cow_get(a, True)
+
+    cdef set_1(self, a, val):
+        if self.recording_on:
+            self.record_setattr(a, val)
+        self.cow_set(a, val)
+
+    cdef tuple path_read(self, bint item, key):
+        '''Attributes may be in the overlay'''
+        if item:
+            return path_unwrap(self[key])
+        return path_unwrap(self.get_1(key))
+
+    cdef dict cow_diff(self):
+        '''Returns-->dict: see cow_diff()'''
+        return dict(self.overlay)
+
+    cdef visible(self, a):
+        # Needs to be FAST - called in __getattribute__, __setattr__, __delattr__
+        if (
+            self.cow_view is not None and
+            a not in self.cow_view and a not in special_attributes
+        ):
+            return False
+        return self.protected_visible(a)
+
+    cdef writeable(self, a):
+        # Needs to be FAST - called in __setattr__, __delattr__
+        if self.cow_view is not None and a not in self.cow_view:
+            return False
+        return self.protected_writeable(a)
+
+    cdef protected_dir(self):
+        '''A View is never widened'''
+        ret = Protected.protected_dir(self)
+        if self.cow_view is None:
+            return ret
+        return [x for x in ret if x in self.cow_view]
+
+    # --------------------------------------------------------------------
+    # Public methods
+    # --------------------------------------------------------------------
+
+    def __setattr__(self, a, val):
+        # Only checks and raises exceptions
+        try:
+            self.protected_check_setattr(a, val)
+        except:
+            if stats_enabled:
+                stats_incr('writes_denied', type(self).__name__)
+            if self.recording_on:
+                self.record(a, 'w', False)
+            raise
+        if stats_enabled:
+            stats_incr('writes', type(self).__name__)
+        if self.recording_on:
+            self.record_setattr(a, val)
+        self.cow_set(a, val)
+
+    def __call__(self, *args, **kwargs):
+        f = cow_bind(
+            getattr(self.pvt_o, '__call__'), self.pvt_o, self.cow_self_node()
+        )
+        return self.fif(cow_value(f(*args, **kwargs), None, None, False))
+
+    def __iter__(self):
+        for x in iter(self.pvt_o):
+            yield self.fif(cow_value(x, None, None, False))
+
+    def __getitem__(self, key):
+        return self.fif(
+            cow_value(self.pvt_o.__getitem__(key), None, None, False)
+        )
+
+    # Items and in-place operators would modify the wrapped object
+    def __setitem__(self, key, val):
+        raise LazyProtectionError('Cannot modify items: %s', self.cn)
+
+    def __delitem__(self, key):
+        raise LazyProtectionError('Cannot delete items: %s', self.cn)
+
+    def __iadd__(self, val):
+        raise frozen_error
+
+    def __imul__(self, val):
+        raise frozen_error
+
+    def __isub__(self, val):
+        raise frozen_error
+
+    def __imod__(self, val):
+        raise frozen_error
+
+    def __ilshift__(self, val):
+        raise frozen_error
+
+    def __irshift__(self, val):
+        raise frozen_error
+
+    def __iand__(self, val):
+        raise frozen_error
+
+    def __ior__(self, val):
+        raise frozen_error
+
+    def __ixor__(self, val):
+        raise frozen_error
+
+    def __ipow__(self, val):
+        raise frozen_error
+
+    def __itruediv__(self, val):
+        raise frozen_error
+
+    def __ifloordiv__(self, val):
+        raise frozen_error
+
+    def __imatmul__(self, val):
+        raise frozen_error
+
+    # Python / cython does not automatically use parent __hash__
+    def __hash__(self):
+        return Wrapped.__hash__(self)
+
+    # __richcmp__ needs to be class-specific
+    def __richcmp__(self, other, int op):
+        '''Use common method for all Wrapped objects'''
+        return self.comparator(other, op)
+
+
+cdef class FrozenCopyOnWrite(CopyOnWrite):
+    '''
+    Subclass of CopyOnWrite that is automatically frozen - returned by
+    freeze() of a CopyOnWrite: values in the overlay are read frozen
+    '''
+    def __init__(self, o, rules):
+        '''
+        o-->object to be wrapped
+        rules-->dict: returned by protected_rules_from_kwargs
+        '''
+        rules['frozen'] = True
+        CopyOnWrite.__init__(self, o, rules)
+
+    # Python / cython does not automatically use parent __hash__
+    def __hash__(self):
+        return Wrapped.__hash__(self)
+
+    # __richcmp__ needs to be class-specific
+    def __richcmp__(self, other, int op):
+        '''Use common method for all Wrapped objects'''
+        return self.comparator(other, op)
@@ -0,0 +1,222 @@
+
+# Types of objects whose contents freeze_deep() visits
+cdef tuple deep_sequence_types = (list, tuple)
+cdef tuple deep_set_types = (set, frozenset)
+cdef tuple deep_container_types = (
+    (dict,) + deep_sequence_types + deep_set_types
+)
+# Types of objects that freeze_deep() freezes without visiting
+cdef tuple deep_opaque_types = (
+    type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+    types.MethodType,
+)
+
+
+cdef list slot_names(t):
+    '''
+    t-->type
+    Returns-->list of str: attribute names of __slots__ of 't' and its
+        bases - private names are mangled
+    '''
+    ret = []
+    for b in t.__mro__:
+        s = b.__dict__.get('__slots__', ())
+        if isinstance(s, str):
+            s = (s,)
+        for a in s:
+            if not isinstance(a, str) or a in ('__dict__', '__weakref__'):
+                continue
+            if a.startswith('__') and not a.endswith('__'):
+                a = '_%s%s' % (b.__name__.lstrip('_'), a)
+            ret.append(a)
+    return ret
+
+
+@cython.final
+@cython.internal
+cdef class __DeepFreezer(object):
+    '''
+    One traversal of freeze_deep()
+    Attributes:
+        memo: dict: id(object)-->frozen value - shared and cyclic
+            objects get ONE wrapper
+        todo: list of DeepFrozen not yet filled
+    '''
+    cdef dict memo
+    cdef list todo
+
+    cdef frozen_of(self, x):
+        '''
+        x-->object
+        Returns-->frozen value for 'x' - DeepFrozen wrappers are filled
+            later by run()
+        '''
+        if isinstance(x, Wrapped) or isimmutable(x):
+            return freeze(x)
+        k = id(x)
+        f = self.memo.get(k, None)
+        if f is not None:
+            return f
+        if (
+            isinstance(x, deep_opaque_types) or not (
+                isinstance(x, deep_container_types) or
+                instance_dict(x) is not None or
+                bool(slot_names(type(x)))
+            )
+        ):
+            f = freeze(x)
+        else:
+            f = DeepFrozen(x)
+            self.todo.append(f)
+            if stats_enabled:
+                stats_incr('freeze_allocated')
+        self.memo[k] = f
+        return f
+
+    cdef fill(self, DeepFrozen w):
+        '''
+        Freezes the attributes and items of object wrapped by 'w'
+        Attributes hidden by the policy of a class returned by
+        protect_class() are not stored - reading them through 'w' raises
+        as it does through freeze()
+        '''
+        cdef __ClassPolicy p
+        o = w.pvt_o
+        p = class_policy(o)
+        if isinstance(o, dict):
+            w.deep_items = {}
+            for (k, v) in list(o.items()):
+                w.deep_items[k] = self.frozen_of(v)
+            w.deep_iter = tuple([self.frozen_of(k) for k in w.deep_items])
+        elif isinstance(o, deep_container_types):
+            w.deep_iter = tuple([self.frozen_of(x) for x in list(o)])
+        d = instance_dict(o)
+        if d is not None:
+            for (a, v) in list(d.items()):
+                if isinstance(a, str):
+                    if p is not None and not p.visible(a):
+                        continue
+                    w.deep_attrs[a] = self.frozen_of(v)
+        for a in slot_names(type(o)):
+            if p is not None and not p.visible(a):
+                continue
+            v = getattr(o, a, no_attr)
+            if v is not no_attr:
+                w.deep_attrs[a] = self.frozen_of(v)
+
+    cdef run(self, o):
+        '''
+        o-->object
+        Returns-->frozen graph of 'o' - see freeze_deep()
+        '''
+        ret = self.frozen_of(o)
+        while self.todo:
+            self.fill(<DeepFrozen>self.todo.pop())
+        return ret
+
+
+cdef deep_freeze(o):
+    '''
+    o-->object
+    Returns-->DeepFrozen or frozen value - see freeze_deep()
+    '''
+    cdef __DeepFreezer f = __DeepFreezer.__new__(__DeepFreezer)
+    f.memo = {}
+    f.todo = []
+    return f.run(o)
+
+
+# @cython.internal
+cdef class DeepFrozen(Wrapped):
+    '''
+    Subclass of Wrapped that is automatically frozen and whose
+    attributes, items and iterated values were frozen ONCE by
+    freeze_deep():
+        - Reads return the value stored at creation - no freeze() call
+        - Objects reached by more than one path (or by a cycle) have ONE
+          wrapper
+        - Attributes not stored (methods, class attributes, properties)
+          are read and frozen as in Frozen
+    Attributes and items are those of the object at creation
+    '''
+    # attribute name-->frozen value
+    cdef dict deep_attrs
+    # dict: key-->frozen value; None if not a dict
+    cdef dict deep_items
+    # frozen values in iteration order; None if not a container
+    cdef tuple deep_iter
+
+    def __init__(self, o):
+        '''o-->object to be wrapped'''
+        Wrapped.__init__(self, o, frozen=True)
+        self.deep_attrs = {}
+
+    # --------------------------------------------------------------------
+    # Private methods
+    # --------------------------------------------------------------------
+
+    cdef owned_parts(self):
+        '''Adds stored attributes and items'''
+        return Wrapped.owned_parts(self) + (
+            self.deep_attrs, self.deep_items, self.deep_iter,
+        )
+
+    cdef deep_item(self, key):
+        '''
+        key-->item key or index
+        Returns-->stored frozen value or no_attr
+        '''
+        if self.deep_items is not None:
+            try:
+                return self.deep_items.get(key, no_attr)
+            except TypeError:
+                return no_attr
+        if (
+            self.deep_iter is not None and
+            isinstance(self.pvt_o, deep_sequence_types) and
+            isinstance(key, int)
+        ):
+            try:
+                return self.deep_iter[key]
+            except IndexError:
+                pass
+        return no_attr
+
+    cdef wrapped_getattr(self, a):
+        x = self.deep_attrs.get(a, no_attr)
+        if x is not no_attr:
+            return x
+        return Wrapped.wrapped_getattr(self, a)
+
+    cdef tuple path_read(self, bint item, key):
+        if item:
+            x = self.deep_item(key)
+        else:
+            x = self.deep_attrs.get(key, no_attr)
+        if x is not no_attr:
+            return (x, False)
+        return Wrapped.path_read(self, item, key)
+
+    # --------------------------------------------------------------------
+    # Public methods
+    # --------------------------------------------------------------------
+
+    def __getitem__(self, key):
+        x = self.deep_item(key)
+        if x is not no_attr:
+            return x
+        return Proxy.__getitem__(self, key)
+
+    def __iter__(self):
+        if self.deep_iter is None:
+            return Proxy.__iter__(self)
+        return iter(self.deep_iter)
+
+    # Python / cython does not automatically use parent __hash__
+    def __hash__(self):
+        return Wrapped.__hash__(self)
+
+    # __richcmp__ needs to be class-specific
+    def __richcmp__(self, other, int op):
+        '''Use common method for all Wrapped objects'''
+        return self.comparator(other, op)
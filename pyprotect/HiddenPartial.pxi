@@ -17,8 +17,8 @@ cdef class __HiddenPartial(object):
     cdef wrapped_getattr(self, a):
         if a in ['__call__']:
             return functools.partial(getattr(Wrapped, a), self)
-        raise AttributeError(
-            "Object __HiddenPartial has no attribute '%s'" % (a,)
+        raise LazyAttributeError(
+            "Object __HiddenPartial has no attribute '%s'", a
         )
 
     # --------------------------------------------------------------------
@@ -29,10 +29,10 @@ cdef class __HiddenPartial(object):
         return self.wrapped_getattr(a)
 
     def __setattr__(self, a, val):
-        raise ProtectionError('Cannot modify attribute: %s' % (a,))
+        raise LazyProtectionError('Cannot modify attribute: %s', a)
 
     def __delattr__(self, a):
-        raise ProtectionError('Cannot delete attribute: %s' % (a,))
+        raise LazyProtectionError('Cannot delete attribute: %s', a)
 
     def __dir__(self):
         return ['__call__']
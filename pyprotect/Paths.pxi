@@ -0,0 +1,130 @@
+
+# One step of a path: '.name' | '[int]' | "['str']" | '["str"]'
+# The leading '.' is optional only for the first step
+cdef object path_step_re = re.compile(
+    r'''(\.?)([_a-zA-Z][a-zA-Z0-9_]*)|\[(-?[0-9]+)\]|\['([^']*)'\]|\["([^"]*)"\]'''
+)
+
+
+@cython.final
+@cython.internal
+cdef class __CompiledPath(object):
+    '''
+    Returned by compile_path()
+    Attributes:
+        path: str: path that was compiled
+        steps: tuple of tuples: (item: bool, key: str or int)
+    '''
+    cdef str path
+    cdef tuple steps
+
+    def __repr__(self):
+        return 'compile_path(%r)' % (self.path,)
+
+    def __str__(self):
+        return self.path
+
+    def __setattr__(self, a, val):
+        raise LazyProtectionError('Cannot modify attribute: %s', a)
+
+
+cdef __CompiledPath parse_path(str path):
+    '''
+    path-->str: e.g. 'a.b.c[3].d'
+    Returns-->__CompiledPath
+    Raises ValueError if path is invalid
+    '''
+    cdef __CompiledPath p
+    steps = []
+    pos = 0
+    n = len(path)
+    while pos < n:
+        m = path_step_re.match(path, pos)
+        if m is None or (m.group(2) is not None and pos > 0 and not m.group(1)):
+            raise ValueError('Invalid path: %r' % (path,))
+        if m.group(2) is not None:
+            steps.append((False, m.group(2)))
+        elif m.group(3) is not None:
+            steps.append((True, int(m.group(3))))
+        elif m.group(4) is not None:
+            steps.append((True, m.group(4)))
+        else:
+            steps.append((True, m.group(5)))
+        pos = m.end()
+    if not steps or path.startswith('.'):
+        raise ValueError('Invalid path: %r' % (path,))
+    p = __CompiledPath.__new__(__CompiledPath)
+    p.path = path
+    p.steps = tuple(steps)
+    return p
+
+
+cdef __CompiledPath compiled_path(path):
+    '''
+    path-->str or __CompiledPath
+    Returns-->__CompiledPath - str paths are cached
+    '''
+    if isinstance(path, __CompiledPath):
+        return path
+    if not isinstance(path, str):
+        raise TypeError('Path must be str: %s' % (type(path),))
+    p = path_cache.get(path, None)
+    if p is None:
+        p = parse_path(path)
+        if len(path_cache) >= path_cache_max:
+            path_cache.clear()
+        path_cache[path] = p
+    return p
+
+
+cdef tuple path_unwrap(x):
+    '''
+    x-->object: value returned by a wrapper
+    Returns-->tuple: (value, bint: value must be frozen)
+    Frozen is unwrapped - remaining steps read the wrapped object directly
+    - unless reads are limited by freeze(o, depth=..., skip_types=...)
+    '''
+    if type(x) is Frozen and (<Wrapped>x).freeze_opts is None:
+        return ((<Wrapped>x).pvt_o, True)
+    return (x, False)
+
+
+cdef walk_path(o, __CompiledPath p):
+    '''
+    o-->object: wrapped or not
+    p-->__CompiledPath
+    Returns-->object: same as evaluating the path on 'o' - see get_path()
+    '''
+    cdef bint frozen = False
+    cdef bint item
+    x = o
+    for (item, key) in p.steps:
+        if frozen:
+            if isinstance(x, Wrapped):
+                # Freezing a wrapper keeps its rules
+                x = freeze(x)
+                frozen = False
+            elif isimmutable(x):
+                # freeze(x) would return 'x' itself
+                frozen = False
+        if isinstance(x, Wrapped):
+            (x, frozen) = (<Wrapped>x).path_step(item, key)
+        elif frozen:
+            if item:
+                x = x.__getitem__(key)
+            elif key in indirect_attributes or isinstance(x, types.ModuleType):
+                (x, frozen) = path_unwrap(getattr(Frozen(x), key))
+            else:
+                try:
+                    x = getattr(x, key)
+                except AttributeError:
+                    # Raise the same exception as Frozen
+                    getattr(Frozen(x), key)
+                    raise
+        elif item:
+            x = x[key]
+        else:
+            x = getattr(x, key)
+    if frozen:
+        return freeze(x)
+    return x
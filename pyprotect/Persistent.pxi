@@ -0,0 +1,656 @@
+
+# Persistent (structurally shared) collections returned by
+# freeze(o, persistent=True) - every change returns a new collection
+# sharing all unchanged nodes with the original
+
+# Bits of the hash used at each level of FrozenMap and width of FrozenVector
+cdef int P_BITS = 5
+cdef int P_WIDTH = 32
+cdef int P_MASK = 31
+# Hash bits are exhausted below this shift - equal hashes share a
+# __HamtCollision
+cdef int HAMT_MAX_SHIFT = 60
+
+
+cdef inline int popcount(unsigned int x):
+    x = x - ((x >> 1) & 0x55555555)
+    x = (x & 0x33333333) + ((x >> 2) & 0x33333333)
+    x = (x + (x >> 4)) & 0x0F0F0F0F
+    return <int>((x * 0x01010101) >> 24)
+
+
+cdef inline unsigned long long key_hash(key):
+    return <unsigned long long>(<long long>hash(key))
+
+
+@cython.final
+@cython.internal
+cdef class __HamtNode(object):
+    '''
+    Node of FrozenMap - never modified after creation
+    Attributes:
+        bitmap: bit i set if slot i at this level is used
+        items: tuple: one entry per bit set in bitmap - each is a
+            (key, value) tuple, __HamtNode or __HamtCollision
+    '''
+    cdef unsigned int bitmap
+    cdef tuple items
+
+
+@cython.final
+@cython.internal
+cdef class __HamtCollision(object):
+    '''
+    Keys whose hashes are equal - never modified after creation
+    Attributes:
+        h: hash of keys
+        pairs: tuple of (key, value) tuples
+    '''
+    cdef unsigned long long h
+    cdef tuple pairs
+
+
+cdef __HamtNode hamt_node(unsigned int bitmap, tuple items):
+    cdef __HamtNode n = __HamtNode.__new__(__HamtNode)
+    n.bitmap = bitmap
+    n.items = items
+    return n
+
+
+cdef hamt_pair(tuple e, unsigned long long h1, key, val,
+               unsigned long long h2, int shift):
+    '''
+    e-->(key, value) already in slot
+    h1-->hash of key of 'e'
+    key, val, h2: new entry and hash of 'key'
+    shift-->shift of level below the slot
+    Returns-->__HamtNode or __HamtCollision holding both entries
+    '''
+    cdef __HamtCollision c
+    cdef int i1
+    cdef int i2
+    if shift > HAMT_MAX_SHIFT:
+        c = __HamtCollision.__new__(__HamtCollision)
+        c.h = h1
+        c.pairs = (e, (key, val))
+        return c
+    i1 = (h1 >> shift) & P_MASK
+    i2 = (h2 >> shift) & P_MASK
+    if i1 == i2:
+        return hamt_node(
+            1u << i1, (hamt_pair(e, h1, key, val, h2, shift + P_BITS),)
+        )
+    if i1 < i2:
+        return hamt_node((1u << i1) | (1u << i2), (e, (key, val)))
+    return hamt_node((1u << i1) | (1u << i2), ((key, val), e))
+
+
+cdef hamt_find(n, unsigned long long h, int shift, key, default):
+    '''
+    n-->__HamtNode or __HamtCollision
+    Returns-->value for 'key' or 'default'
+    '''
+    cdef unsigned int bit
+    cdef __HamtNode node
+    while True:
+        if isinstance(n, __HamtCollision):
+            for e in (<__HamtCollision>n).pairs:
+                if e[0] is key or e[0] == key:
+                    return e[1]
+            return default
+        node = <__HamtNode>n
+        bit = 1u << ((h >> shift) & P_MASK)
+        if not (node.bitmap & bit):
+            return default
+        e = node.items[popcount(node.bitmap & (bit - 1))]
+        if type(e) is tuple:
+            if e[0] is key or e[0] == key:
+                return e[1]
+            return default
+        n = e
+        shift += P_BITS
+
+
+cdef hamt_assoc(n, unsigned long long h, int shift, key, val, list added):
+    '''
+    n-->__HamtNode or __HamtCollision
+    added-->list: True is appended if 'key' was not in 'n'
+    Returns-->new __HamtNode or __HamtCollision with key-->val
+    '''
+    cdef unsigned int bit
+    cdef int pos
+    cdef __HamtNode node
+    cdef __HamtCollision c
+    if isinstance(n, __HamtCollision):
+        c = __HamtCollision.__new__(__HamtCollision)
+        c.h = (<__HamtCollision>n).h
+        l = list((<__HamtCollision>n).pairs)
+        for (i, e) in enumerate(l):
+            if e[0] is key or e[0] == key:
+                l[i] = (key, val)
+                break
+        else:
+            l.append((key, val))
+            added.append(True)
+        c.pairs = tuple(l)
+        return c
+    node = <__HamtNode>n
+    bit = 1u << ((h >> shift) & P_MASK)
+    pos = popcount(node.bitmap & (bit - 1))
+    items = node.items
+    if not (node.bitmap & bit):
+        added.append(True)
+        return hamt_node(
+            node.bitmap | bit, items[:pos] + ((key, val),) + items[pos:]
+        )
+    e = items[pos]
+    if type(e) is tuple:
+        if e[0] is key or e[0] == key:
+            if e[1] is val:
+                return node
+            x = (key, val)
+        else:
+            added.append(True)
+            x = hamt_pair(e, key_hash(e[0]), key, val, h, shift + P_BITS)
+    else:
+        x = hamt_assoc(e, h, shift + P_BITS, key, val, added)
+        if x is e:
+            return node
+    return hamt_node(node.bitmap, items[:pos] + (x,) + items[pos + 1:])
+
+
+cdef hamt_without(n, unsigned long long h, int shift, key):
+    '''
+    n-->__HamtNode or __HamtCollision
+    Returns-->new __HamtNode, __HamtCollision, (key, value) tuple when
+        one entry is left, or None when empty
+    Raises KeyError if 'key' is not in 'n'
+    '''
+    cdef unsigned int bit
+    cdef int pos
+    cdef __HamtNode node
+    cdef __HamtCollision c
+    if isinstance(n, __HamtCollision):
+        l = [
+            e for e in (<__HamtCollision>n).pairs
+            if not (e[0] is key or e[0] == key)
+        ]
+        if len(l) == len((<__HamtCollision>n).pairs):
+            raise KeyError(key)
+        if len(l) == 1:
+            return l[0]
+        c = __HamtCollision.__new__(__HamtCollision)
+        c.h = (<__HamtCollision>n).h
+        c.pairs = tuple(l)
+        return c
+    node = <__HamtNode>n
+    bit = 1u << ((h >> shift) & P_MASK)
+    if not (node.bitmap & bit):
+        raise KeyError(key)
+    pos = popcount(node.bitmap & (bit - 1))
+    items = node.items
+    e = items[pos]
+    if type(e) is tuple:
+        if not (e[0] is key or e[0] == key):
+            raise KeyError(key)
+        x = None
+    else:
+        x = hamt_without(e, h, shift + P_BITS, key)
+    if x is None:
+        if len(items) == 1:
+            return None
+        items = items[:pos] + items[pos + 1:]
+        if len(items) == 1 and type(items[0]) is tuple:
+            return items[0]
+        return hamt_node(node.bitmap & ~bit, items)
+    if len(items) == 1 and type(x) is tuple:
+        return x
+    return hamt_node(node.bitmap, items[:pos] + (x,) + items[pos + 1:])
+
+
+cdef FrozenMap new_map(root, Py_ssize_t count):
+    '''
+    root-->__HamtNode, (key, value) tuple or None
+    Returns-->FrozenMap
+    '''
+    cdef FrozenMap m = FrozenMap.__new__(FrozenMap)
+    if type(root) is tuple:
+        # Root is always a node
+        h = key_hash(root[0])
+        root = hamt_node(1u << (h & P_MASK), (root,))
+    m.root = root
+    m.count = count
+    m.created = True
+    return m
+
+
+cdef FrozenMap map_set(FrozenMap m, key, val):
+    '''Returns-->FrozenMap: 'm' with key-->freeze(val)'''
+    val = freeze(val)
+    if m.root is None:
+        return new_map(
+            hamt_node(1u << (key_hash(key) & P_MASK), ((key, val),)), 1
+        )
+    added = []
+    root = hamt_assoc(m.root, key_hash(key), 0, key, val, added)
+    if root is m.root:
+        return m
+    return new_map(root, m.count + len(added))
+
+
+cdef FrozenMap map_update(FrozenMap m, items):
+    '''
+    items-->iterable of (key, value)
+    Returns-->FrozenMap: 'm' with all items set
+    '''
+    for (k, v) in items:
+        m = map_set(m, k, v)
+    return m
+
+
+cdef mapping_items(mapping, kwargs):
+    '''Returns-->list of (key, value): same as dict.update() arguments'''
+    if isinstance(mapping, FrozenMap):
+        l = list((<FrozenMap>mapping).item_list())
+    elif hasattr(mapping, 'keys'):
+        l = [(k, mapping[k]) for k in mapping.keys()]
+    else:
+        l = [tuple(x) for x in mapping]
+    if kwargs:
+        l.extend(kwargs.items())
+    return l
+
+
+cdef class FrozenMap(object):
+    '''
+    Persistent mapping - returned by freeze(d, persistent=True)
+        - Cannot be modified - set(), delete() and evolve() return a
+          NEW FrozenMap sharing all unchanged nodes with this one:
+          O(log n) time and memory per change
+        - Hash array mapped trie: lookups are O(log n) with 32-way
+          branching
+        - Values are frozen when stored
+        - Iteration order is NOT insertion order
+    '''
+    cdef object root
+    cdef Py_ssize_t count
+    cdef object hash_val
+    # Set once the contents are built - __init__ cannot rebuild them
+    cdef bint created
+
+    def __init__(self, mapping=(), **kwargs):
+        '''
+        mapping, kwargs: same as arguments of dict()
+        '''
+        if self.created:
+            raise TypeError('FrozenMap cannot be modified')
+        m = map_update(new_map(None, 0), mapping_items(mapping, kwargs))
+        self.root = m.root
+        self.count = m.count
+        self.created = True
+
+    # --------------------------------------------------------------------
+    # Private methods
+    # --------------------------------------------------------------------
+
+    cdef list item_list(self):
+        '''Returns-->list of (key, value) tuples'''
+        ret = []
+        if self.root is None:
+            return ret
+        todo = [self.root]
+        while todo:
+            n = todo.pop()
+            if isinstance(n, __HamtCollision):
+                ret.extend((<__HamtCollision>n).pairs)
+                continue
+            for e in (<__HamtNode>n).items:
+                if type(e) is tuple:
+                    ret.append(e)
+                else:
+                    todo.append(e)
+        return ret
+
+    # --------------------------------------------------------------------
+    # Public methods
+    # --------------------------------------------------------------------
+
+    def set(self, key, val):
+        '''set(key, val) -> FrozenMap: copy with key-->val'''
+        return map_set(self, key, val)
+
+    def delete(self, key):
+        '''
+        delete(key) -> FrozenMap: copy without 'key'
+        Raises KeyError if 'key' is not present
+        '''
+        if self.root is None:
+            raise KeyError(key)
+        return new_map(
+            hamt_without(self.root, key_hash(key), 0, key), self.count - 1
+        )
+
+    def evolve(self, mapping=(), **kwargs):
+        '''
+        evolve(mapping=(), **kwargs) -> FrozenMap: copy with the items
+        set - same arguments as dict.update()
+        '''
+        return map_update(self, mapping_items(mapping, kwargs))
+
+    def get(self, key, default=None):
+        if self.root is None:
+            return default
+        return hamt_find(self.root, key_hash(key), 0, key, default)
+
+    def keys(self):
+        return CollectionsABC.KeysView(self)
+
+    def values(self):
+        return CollectionsABC.ValuesView(self)
+
+    def items(self):
+        return CollectionsABC.ItemsView(self)
+
+    def __getitem__(self, key):
+        x = self.get(key, no_attr)
+        if x is no_attr:
+            raise KeyError(key)
+        return x
+
+    def __contains__(self, key):
+        return self.get(key, no_attr) is not no_attr
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for e in self.item_list():
+            yield e[0]
+
+    def __eq__(self, other):
+        if not isinstance(other, (FrozenMap, CollectionsABC.Mapping)):
+            return NotImplemented
+        if len(other) != self.count:
+            return False
+        for (k, v) in self.item_list():
+            x = other.get(k, no_attr)
+            if x is no_attr or not (x is v or x == v):
+                return False
+        return True
+
+    def __ne__(self, other):
+        x = self.__eq__(other)
+        if x is NotImplemented:
+            return x
+        return not x
+
+    def __hash__(self):
+        if self.hash_val is None:
+            self.hash_val = hash(frozenset(self.item_list()))
+        return self.hash_val
+
+    def __repr__(self):
+        return 'FrozenMap({%s})' % (', '.join([
+            '%r: %r' % (k, v) for (k, v) in self.item_list()
+        ]),)
+
+    def __reduce__(self):
+        return (FrozenMap, (dict(self.item_list()),))
+
+
+cdef tuple vector_set_node(int level, tuple node, Py_ssize_t i, val):
+    '''Returns-->copy of 'node' with item 'i' set to 'val' below 'level' '''
+    l = list(node)
+    if level == 0:
+        l[i & P_MASK] = val
+    else:
+        k = (i >> level) & P_MASK
+        l[k] = vector_set_node(level - P_BITS, node[k], i, val)
+    return tuple(l)
+
+
+cdef tuple vector_new_path(int level, tuple node):
+    while level > 0:
+        node = (node,)
+        level -= P_BITS
+    return node
+
+
+cdef FrozenVector new_vector(Py_ssize_t cnt, int shift, tuple root, tuple tail):
+    cdef FrozenVector v = FrozenVector.__new__(FrozenVector)
+    v.cnt = cnt
+    v.shift = shift
+    v.root = root
+    v.tail = tail
+    v.created = True
+    return v
+
+
+cdef FrozenVector vector_from(iterable):
+    '''
+    iterable-->iterable of values
+    Returns-->FrozenVector - values are frozen
+    '''
+    cdef FrozenVector v = new_vector(0, P_BITS, (), ())
+    cdef Py_ssize_t n
+    cdef Py_ssize_t full
+    l = [freeze(x) for x in iterable]
+    n = len(l)
+    full = ((n - 1) // P_WIDTH) * P_WIDTH if n else 0
+    for start in range(0, full, P_WIDTH):
+        v.tail = tuple(l[start:start + P_WIDTH])
+        v.cnt = start + P_WIDTH
+        v.push_tail()
+    v.tail = tuple(l[full:])
+    v.cnt = n
+    return v
+
+
+cdef class FrozenVector(object):
+    '''
+    Persistent sequence - returned by freeze(l, persistent=True)
+        - Cannot be modified - set(), append(), delete() and evolve()
+          return a NEW FrozenVector sharing all unchanged nodes with
+          this one
+        - 32-way trie with a tail: indexing, set() and append() are
+          O(log n); delete() is O(n) except for the last item
+        - Values are frozen when stored
+    '''
+    cdef Py_ssize_t cnt
+    cdef int shift
+    cdef tuple root
+    cdef tuple tail
+    cdef object hash_val
+    # Set once the contents are built - __init__ cannot rebuild them
+    cdef bint created
+
+    def __init__(self, iterable=()):
+        '''iterable-->values'''
+        if self.created:
+            raise TypeError('FrozenVector cannot be modified')
+        v = vector_from(iterable)
+        self.cnt = v.cnt
+        self.shift = v.shift
+        self.root = v.root
+        self.tail = v.tail
+        self.created = True
+
+    # --------------------------------------------------------------------
+    # Private methods
+    # --------------------------------------------------------------------
+
+    cdef Py_ssize_t tail_offset(self):
+        if self.cnt < P_WIDTH:
+            return 0
+        return ((self.cnt - 1) >> P_BITS) << P_BITS
+
+    cdef tuple leaf(self, Py_ssize_t i):
+        '''Returns-->tuple: leaf node holding item 'i' '''
+        cdef int level
+        if i >= self.tail_offset():
+            return self.tail
+        node = self.root
+        level = self.shift
+        while level > 0:
+            node = node[(i >> level) & P_MASK]
+            level -= P_BITS
+        return node
+
+    cdef Py_ssize_t norm_index(self, i) except -1:
+        cdef Py_ssize_t j = operator.index(i)
+        if j < 0:
+            j += self.cnt
+        if j < 0 or j >= self.cnt:
+            raise IndexError('FrozenVector index out of range')
+        return j
+
+    cdef tuple push_node(self, int level, tuple parent, tuple tail):
+        cdef Py_ssize_t k = ((self.cnt - 1) >> level) & P_MASK
+        if level == P_BITS:
+            x = tail
+        elif k < len(parent):
+            x = self.push_node(level - P_BITS, parent[k], tail)
+        else:
+            x = vector_new_path(level - P_BITS, tail)
+        return parent[:k] + (x,) + parent[k + 1:]
+
+    cdef push_tail(self):
+        '''
+        Moves the full tail into the tree - ONLY for a FrozenVector
+        not yet returned
+        '''
+        if (self.cnt >> P_BITS) > (1 << self.shift):
+            self.root = (self.root, vector_new_path(self.shift, self.tail))
+            self.shift += P_BITS
+        else:
+            self.root = self.push_node(self.shift, self.root, self.tail)
+        self.tail = ()
+
+    # --------------------------------------------------------------------
+    # Public methods
+    # --------------------------------------------------------------------
+
+    def set(self, i, val):
+        '''set(i, val) -> FrozenVector: copy with item 'i' set to 'val' '''
+        cdef Py_ssize_t j = self.norm_index(i)
+        cdef Py_ssize_t off = self.tail_offset()
+        val = freeze(val)
+        if j >= off:
+            l = list(self.tail)
+            l[j - off] = val
+            return new_vector(self.cnt, self.shift, self.root, tuple(l))
+        return new_vector(
+            self.cnt, self.shift,
+            vector_set_node(self.shift, self.root, j, val), self.tail
+        )
+
+    def append(self, val):
+        '''append(val) -> FrozenVector: copy with 'val' added at the end'''
+        cdef FrozenVector v
+        val = freeze(val)
+        if len(self.tail) < P_WIDTH:
+            return new_vector(
+                self.cnt + 1, self.shift, self.root, self.tail + (val,)
+            )
+        v = new_vector(self.cnt, self.shift, self.root, self.tail)
+        v.push_tail()
+        v.tail = (val,)
+        v.cnt += 1
+        return v
+
+    def delete(self, i):
+        '''
+        delete(i) -> FrozenVector: copy without item 'i'
+        Raises IndexError if 'i' is out of range
+        '''
+        cdef Py_ssize_t j = self.norm_index(i)
+        if j == self.cnt - 1 and len(self.tail) > 1:
+            return new_vector(self.cnt - 1, self.shift, self.root, self.tail[:-1])
+        l = list(self)
+        del l[j]
+        return vector_from(l)
+
+    def evolve(self, changes):
+        '''
+        evolve(changes) -> FrozenVector: copy with items set
+        changes-->mapping: index-->value
+        '''
+        v = self
+        for (i, val) in mapping_items(changes, None):
+            v = v.set(i, val)
+        return v
+
+    def count(self, val):
+        return sum([1 for x in self if x is val or x == val])
+
+    def index(self, val):
+        for (i, x) in enumerate(self):
+            if x is val or x == val:
+                return i
+        raise ValueError('%r is not in FrozenVector' % (val,))
+
+    def __len__(self):
+        return self.cnt
+
+    def __getitem__(self, i):
+        cdef Py_ssize_t j
+        if isinstance(i, slice):
+            return vector_from(list(self)[i])
+        j = self.norm_index(i)
+        return self.leaf(j)[j & P_MASK]
+
+    def __iter__(self):
+        cdef Py_ssize_t i = 0
+        while i < self.cnt:
+            for x in self.leaf(i):
+                yield x
+            i += P_WIDTH
+
+    def __reversed__(self):
+        return reversed(list(self))
+
+    def __contains__(self, val):
+        for x in self:
+            if x is val or x == val:
+                return True
+        return False
+
+    def __eq__(self, other):
+        if not isinstance(other, (FrozenVector, list)):
+            return NotImplemented
+        if len(other) != self.cnt:
+            return False
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        x = self.__eq__(other)
+        if x is NotImplemented:
+            return x
+        return not x
+
+    def __hash__(self):
+        if self.hash_val is None:
+            self.hash_val = hash(tuple(self))
+        return self.hash_val
+
+    def __repr__(self):
+        return 'FrozenVector(%r)' % (list(self),)
+
+    def __reduce__(self):
+        return (FrozenVector, (list(self),))
+
+
+CollectionsABC.Mapping.register(FrozenMap)
+CollectionsABC.Sequence.register(FrozenVector)
+
+
+cdef persistent_freeze(o):
+    '''
+    o-->object
+    Returns-->FrozenMap for a dict, FrozenVector for a list, None otherwise
+    '''
+    if isinstance(o, dict):
+        return FrozenMap(o)
+    if isinstance(o, list):
+        return FrozenVector(o)
+    return None
@@ -33,27 +33,32 @@ cdef class PrivacyDict(Wrapped):
     # Private methods
     # --------------------------------------------------------------------
 
-    # --------------------------------------------------------------------
-    # Public methods
-    # --------------------------------------------------------------------
-
-    def __getattribute__(self, a):
+    cdef bint readable(self, a):
+        '''
+        Exception-free probe - see Wrapped.readable
+        Mirrors privacydict_getattr
+        '''
+        if self.attr_hidden(a):
+            return False
+        if (
+            a == '__class__' or
+            a in privacydict_partials or a in privacydict_views
+        ):
+            return True
+        return Wrapped.readable(self, a)
+
+    cdef get_1(self, a):
+        return self.privacydict_getattr(a)
+
+    cdef privacydict_getattr(self, a):
         if self.attr_hidden(a):
             raise KeyError(a)
         # Cannot modify CLASS of wrapped object
         if a == '__class__':
             return freeze(self.pvt_o.__class__)
-        if a in set([
-            '__getitem__', '__setitem__', '__delitem__',
-            '__str__', '__repr__',
-            'copy',
-            'iterkeys', 'iteritems', 'itervalues',
-            'viewkeys', 'viewitems', 'viewvalues',
-        ]):
+        if a in privacydict_partials:
             return __HiddenPartial(getattr(PrivacyDict, a), self)
-        if a in set([
-            'keys', 'items', 'values', 'copy',
-        ]):
+        if a in privacydict_views:
             py2_map = {
                 'keys': __HiddenPartial(getattr(PrivacyDict, 'keys_py2'), self),
                 'items': __HiddenPartial(getattr(PrivacyDict, 'items_py2'), self),
@@ -66,6 +71,21 @@ cdef class PrivacyDict(Wrapped):
         # If frozen, freeze all the way down
         return self.wrapped_getattr(a)
 
+    # --------------------------------------------------------------------
+    # Public methods
+    # --------------------------------------------------------------------
+
+    def __getattribute__(self, a):
+        try:
+            x = self.privacydict_getattr(a)
+        except:
+            if stats_enabled:
+                stats_incr('reads_denied', type(self).__name__)
+            raise
+        if stats_enabled:
+            stats_incr('reads', type(self).__name__)
+        return x
+
     def __getitem__(self, key):
         if self.attr_hidden(key):
             raise KeyError(key)
@@ -74,18 +94,17 @@ cdef class PrivacyDict(Wrapped):
     def __delitem__(self, key):
         if self.attr_hidden(key):
             raise KeyError(key)
-        nodel_msg = 'Cannot delete private attribute: %s.%s' % (self.cn, str(key))
         if ro_private_attr.match(key):
-            raise ProtectionError(nodel_msg)
+            raise LazyProtectionError(
+                'Cannot delete private attribute: %s.%s', self.cn, key
+            )
         Wrapped.__delitem__(self, key)
 
     def __setitem__(self, key, val):
-        nopvt_msg = 'Cannot set private attribute: %s.%s' % (self.cn, str(key))
-
-        if self.attr_hidden(key):
-            raise ProtectionError(nopvt_msg)
-        if ro_private_attr.match(key):
-            raise ProtectionError(nopvt_msg)
+        if self.attr_hidden(key) or ro_private_attr.match(key):
+            raise LazyProtectionError(
+                'Cannot set private attribute: %s.%s', self.cn, key
+            )
         Wrapped.__setitem__(self, key, val)
 
     def __repr__(self):
@@ -11,6 +11,21 @@ cdef class Private(Wrapped):
         - DONE: cannot access any unmangled double '_' attributes
         - DONE: Cannot add or delete attributes
     '''
+    # Python 3.12+: dir(pvt_o) is cached until dict / type watchers
+    # report a change to the instance __dict__ or class of pvt_o
+    cdef frozenset dir_names
+    # Keys of a managed instance __dict__ when dir_names was cached -
+    # stores to inline values do not always report dict watcher events
+    cdef frozenset watch_keys
+    cdef unsigned long dir_generation
+    cdef object watch_type
+    cdef object watch_dict
+    cdef __WatchToken type_token
+    cdef __WatchToken dict_token
+    cdef unsigned long type_token_version
+    cdef unsigned long dict_token_version
+    # dir(pvt_o) pinned for the duration of a bulk ACL query - see acl()
+    cdef frozenset pinned_names
 
     def __init__(self, o, frozen=False, rules=None):
         '''
@@ -24,13 +39,101 @@ cdef class Private(Wrapped):
     # Private methods
     # --------------------------------------------------------------------
 
+    cdef bint watch_unchanged(self, a):
+        '''
+        a-->str: attribute name accessed - or None to check all keys
+        Returns-->bool: dir_names is still valid
+        Needs to be FAST - called in __getattribute__, __setattr__, __delattr__
+        '''
+        o = self.pvt_o
+        if not (
+            self.type_token.version == self.type_token_version and
+            self.dict_token.version == self.dict_token_version and
+            (o if isinstance(o, type) else type(o)) is self.watch_type and
+            instance_dict(o) is self.watch_dict
+        ):
+            return False
+        keys = self.watch_keys
+        if keys is None:
+            return True
+        # Managed __dict__: watchers are not trusted for added / deleted
+        # keys - check size and presence of 'a' (all keys if 'a' is None)
+        d = self.watch_dict
+        if len(d) != len(keys):
+            return False
+        if a is None:
+            return keys.issuperset(d)
+        return (a in d) == (a in keys)
+
+    cdef watch_snapshot(self):
+        '''
+        Starts watching class and instance __dict__ of pvt_o and caches
+        dir(pvt_o) in dir_names - dir_names is None if pvt_o cannot be
+        watched
+        '''
+        self.dir_names = None
+        self.type_token = None
+        o = self.pvt_o
+        if not default_dir(o):
+            return
+        t = o if isinstance(o, type) else type(o)
+        d = instance_dict(o)
+        # Watchers only report changes to types with a version tag
+        if type_version(t) == 0:
+            return
+        type_token = watch(t)
+        if type_token is None:
+            return
+        if d is None:
+            dict_token = unchanging_token
+        else:
+            dict_token = watch(d)
+            if dict_token is None:
+                return
+        (self.watch_type, self.watch_dict) = (t, d)
+        self.watch_keys = (
+            frozenset(d) if d is not None and managed_dict(t) else None
+        )
+        (self.type_token, self.dict_token) = (type_token, dict_token)
+        self.type_token_version = type_token.version
+        self.dict_token_version = dict_token.version
+        self.dir_names = frozenset(pvt_dir(o))
+        self.dir_generation += 1
+
+    cdef private_names(self, a=None):
+        '''
+        a-->str: attribute name accessed - or None for all of dir(pvt_o)
+        Returns-->frozenset of str: dir(pvt_o) - or None if dir(pvt_o)
+            cannot be cached (Python < 3.12, PyPy, custom __dir__)
+        Needs to be FAST - called in __getattribute__, __setattr__, __delattr__
+        '''
+        if self.type_token is not None and self.watch_unchanged(a):
+            return self.dir_names
+        if not watchers_available():
+            return None
+        self.watch_snapshot()
+        return self.dir_names
+
+    cdef bint in_dir(self, a):
+        '''
+        a-->str: attribute name
+        Returns-->bool: 'a' in dir(pvt_o)
+        Needs to be FAST - called in __getattribute__, __setattr__, __delattr__
+        '''
+        names = self.pinned_names
+        if names is None:
+            names = self.private_names(a)
+        if names is None:
+            return a in pvt_dir(self.pvt_o, a)
+        return a in names
+
     cdef private_visible(self, a):
         '''Share with Private-derived'''
         if a in special_attributes:
             return True
         if self.attr_hidden(a):
             return False
-        if a not in dir(self.pvt_o):
+        if not self.in_dir(a):
             return False
         # Special case for PY2 that does not seem to obey __dir__ for modules
         # Also applies to PY3 < 3.7
@@ -69,12 +172,80 @@ cdef class Private(Wrapped):
         # Needs to be FAST - called in __setattr__, __delattr__
         return self.private_writeable(a)
 
+    cdef bint readable(self, a):
+        '''
+        Exception-free probe - see Wrapped.readable
+        Mirrors private_getattr
+        '''
+        if not self.visible(a):
+            return False
+        if a in overridden_always:
+            return True
+        if a in always_frozen:
+            return has_attr(self.pvt_o, a)
+        return Wrapped.readable(self, a)
+
+    cdef pin_names(self):
+        '''
+        Returns-->frozenset of str: ONE snapshot of dir(pvt_o)
+        in_dir() uses the snapshot until caller sets pinned_names to None
+        Used by bulk operations - acl(), getattrs(), setattrs()
+        '''
+        names = self.private_names()
+        if names is None:
+            names = frozenset(pvt_dir(self.pvt_o))
+        self.pinned_names = names
+        return names
+
+    cdef acl(self, names):
+        '''
+        See Wrapped.acl
+        All names are checked against ONE snapshot of dir(pvt_o)
+        '''
+        snap = self.pin_names()
+        try:
+            if names is None:
+                names = special_attributes.union(snap).difference(
+                    pickle_attributes
+                )
+            return Wrapped.acl(self, names)
+        finally:
+            self.pinned_names = None
+
+    cdef get_1(self, a):
+        return self.private_getattr(a)
+
+    cdef check_set_1(self, a, val):
+        self.private_check_setattr(a, val)
+
+    cdef getattrs(self, names):
+        '''
+        See Wrapped.getattrs
+        All names are checked against ONE snapshot of dir(pvt_o)
+        '''
+        self.pin_names()
+        try:
+            return Wrapped.getattrs(self, names)
+        finally:
+            self.pinned_names = None
+
+    cdef setattrs(self, mapping):
+        '''
+        See Wrapped.setattrs
+        All names are checked against ONE snapshot of dir(pvt_o)
+        '''
+        self.pin_names()
+        try:
+            Wrapped.setattrs(self, mapping)
+        finally:
+            self.pinned_names = None
+
     cdef private_getattr(self, a):
         # Cannot access any attribute not exported by dir(pvt_o)
         # cannot access any unmangled double '_' attributes
         if not self.visible(a):
-            raise AttributeError(
-                "Object Private('%s') has no attribute '%s'" % (self.cn, a)
+            raise LazyAttributeError(
+                "Object Private('%s') has no attribute '%s'", self.cn, a
             )
         if a in overridden_always:
             return functools.partial(getattr(Private, a), self)
@@ -88,21 +259,22 @@ cdef class Private(Wrapped):
         return self.wrapped_getattr(a)
 
     cdef private_check_setattr(self, a, val):
-        nopvt_msg = 'Cannot set attribute: %s.%s' % (self.cn, str(a))
-        noadd_msg = 'Cannot add attribute: %s.%s' % (self.cn, str(a))
         if not self.writeable(a):
-            raise ProtectionError(nopvt_msg)
-        if a not in dir(self.pvt_o):
-            raise ProtectionError(noadd_msg)
+            raise LazyProtectionError(
+                'Cannot set attribute: %s.%s', self.cn, a
+            )
+        if not self.in_dir(a):
+            raise LazyProtectionError(
+                'Cannot add attribute: %s.%s', self.cn, a
+            )
         self.wrapped_check_setattr(a, val)
 
     cdef private_check_delattr(self, a):
-        nodel_msg = 'Cannot delete attribute: %s.%s' % (self.cn, str(a))
         if not hasattr(self.pvt_o, a):
-            raise AttributeError(
-                "Object Private('%s') has no attribute '%s'" % (self.cn, a)
+            raise LazyAttributeError(
+                "Object Private('%s') has no attribute '%s'", self.cn, a
             )
-        raise ProtectionError(nodel_msg)
+        raise LazyProtectionError('Cannot delete attribute: %s.%s', self.cn, a)
 
     cdef private_dir(self):
         return [
@@ -115,18 +287,44 @@ cdef class Private(Wrapped):
     # --------------------------------------------------------------------
 
     def __getattribute__(self, a):
-        return self.private_getattr(a)
+        try:
+            x = self.private_getattr(a)
+            if self.frozen and a in array_export_attributes:
+                x = self.array_export(a, x)
+        except:
+            if stats_enabled:
+                stats_incr('reads_denied', type(self).__name__)
+            raise
+        if stats_enabled:
+            stats_incr('reads', type(self).__name__)
+        return x
 
     def __setattr__(self, a, val):
         # Only checks and raises exceptions
-        self.private_check_setattr(a, val)
+        try:
+            self.private_check_setattr(a, val)
+        except:
+            if stats_enabled:
+                stats_incr('writes_denied', type(self).__name__)
+            raise
+        if stats_enabled:
+            stats_incr('writes', type(self).__name__)
         setattr(self.pvt_o, a, val)
 
     def __delattr__(self, a):
         # Only checks and raises exceptions
-        self.private_check_delattr(a)
+        try:
+            self.private_check_delattr(a)
+        except:
+            if stats_enabled:
+                stats_incr('deletes_denied', type(self).__name__)
+            raise
+        if stats_enabled:
+            stats_incr('deletes', type(self).__name__)
 
     def __dir__(self):
+        if stats_enabled:
+            stats_incr('dir', type(self).__name__)
         return self.private_dir()
 
     # Python / cython does not automatically use parent __hash__
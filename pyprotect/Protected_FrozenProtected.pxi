@@ -9,6 +9,19 @@ cdef class Protected(Private):
     cdef dict acl_cache
     # Cache dir() output
     cdef list dir_out
+    # dynamic='auto': acl_cache and dir_out are validated against
+    # class, class version tag and instance __dict__ of wrapped object
+    cdef bint dynamic_auto
+    cdef object auto_type
+    cdef unsigned int auto_version
+    cdef object auto_dict
+    # keys of instance __dict__ at auto_snapshot()
+    cdef frozenset auto_keys
+    cdef unsigned long auto_generation
+    cdef bint auto_filling
+    # Access-pattern recording - see record_access(), access_report()
+    cdef dict recording
+    cdef bint recording_on
 
     def __init__(self, o, rules):
         '''
@@ -30,23 +43,131 @@ cdef class Protected(Private):
             return dict()
         return self.rules
 
+    cdef owned_parts(self):
+        '''Adds ACL cache and cached dir() output'''
+        return Wrapped.owned_parts(self) + (
+            self.acl_cache, self.dir_out, self.recording,
+        )
+
     cdef process_rules(self, rules):
         '''
         rules-->dict
         Called once at object wrapping time
         '''
         self.dir_out = []
+        if slow_path_hook is not None:
+            slow_path('policy_compile', None, self.pvt_o)
         # frozen does NOT override dynamic
-        if bool(rules.get('dynamic', False)):
+        dynamic = rules.get('dynamic', False)
+        self.dynamic_auto = (dynamic == 'auto')
+        if self.dynamic_auto:
+            self.acl_cache = {}
+            self.auto_version = 0
+            self.auto_cache_valid()
+        elif bool(dynamic):
             self.acl_cache = None
         else:
-            self.acl_cache = {}
-            self.build_cache()
-            # Make dir() pre-computed
-            self.dir_out = [
-                    k for (k, v) in self.acl_cache.items()
-                    if v.get('r', False)
-            ]
+            self.fill_cache()
+
+    cdef fill_cache(self):
+        '''
+        Builds acl_cache and pre-computed dir()
+        Called once at object wrapping time - and for dynamic='auto'
+        each time wrapped object changes
+        '''
+        if slow_path_hook is not None:
+            slow_path('build_cache', None, self.pvt_o)
+        self.acl_cache = {}
+        self.build_cache()
+        # Make dir() pre-computed
+        self.dir_out = [
+                k for (k, v) in self.acl_cache.items()
+                if v.get('r', False)
+        ]
+
+    cdef bint auto_unchanged(self, a):
+        '''
+        a-->str: attribute name accessed - or None to check all keys
+        Returns-->bool: True IFF class, class version tag and instance
+            __dict__ (identity, size and presence of 'a' - all keys if
+            'a' is None) of wrapped object are unchanged since the last
+            auto_snapshot()
+        With dict / type watchers (Python 3.12+), True IFF the watchers
+            have not reported a change since the last auto_snapshot() -
+            see Private.watch_unchanged()
+        Needs to be FAST - called in __getattribute__, __setattr__, __delattr__
+        '''
+        o = self.pvt_o
+        if self.auto_version == 0:
+            return False
+        if self.private_names(a) is not None:
+            return self.dir_generation == self.auto_generation
+        t = o if isinstance(o, type) else type(o)
+        if t is not self.auto_type or type_version(t) != self.auto_version:
+            return False
+        d = instance_dict(o)
+        if d is not self.auto_dict:
+            return False
+        if d is None:
+            return True
+        if len(d) != len(self.auto_keys):
+            return False
+        if a is None:
+            # Same size - all keys must be the same
+            return self.auto_keys.issuperset(d)
+        # Keys may be swapped at the same size - 'a' is the one used
+        return (a in d) == (a in self.auto_keys)
+
+    cdef auto_snapshot(self):
+        '''
+        Records class, class version tag and instance __dict__ of wrapped
+        object. auto_version is 0 if they cannot be used to detect changes
+        '''
+        o = self.pvt_o
+        t = o if isinstance(o, type) else type(o)
+        self.auto_type = t
+        self.auto_version = type_version(t) if default_dir(o) else 0
+        self.auto_dict = instance_dict(o)
+        self.auto_keys = (
+            frozenset() if self.auto_dict is None
+            else frozenset(self.auto_dict)
+        )
+        self.private_names()
+        self.auto_generation = self.dir_generation
+
+    cdef bint auto_cache_valid(self, a=None):
+        '''
+        a-->str: attribute name accessed - None for dir()
+        Returns-->bool: acl_cache and dir_out can be used (dynamic='auto')
+        Rebuilds them if wrapped object changed
+        Returns False if changes to wrapped object cannot be detected -
+            rules are then evaluated dynamically
+        Needs to be FAST - called in __getattribute__, __setattr__, __delattr__
+        '''
+        if self.auto_filling:
+            # Rules are evaluated dynamically while building the cache
+            return False
+        if self.auto_unchanged(a):
+            return True
+        return self.auto_refill()
+
+    cdef bint auto_refill(self):
+        '''
+        Records state of wrapped object and rebuilds acl_cache and dir_out
+        Returns-->bool: False if changes to wrapped object cannot be
+            detected (cache is not built)
+        '''
+        self.auto_snapshot()
+        if self.auto_version == 0:
+            return False
+        if stats_enabled:
+            stats_incr('acl_cache_rebuilds')
+        self.auto_filling = True
+        try:
+            self.fill_cache()
+        finally:
+            self.auto_filling = False
+        return True
 
     cdef build_cache(self):
         '''
@@ -58,7 +179,7 @@ cdef class Protected(Private):
 
         hidden_d = {'r': False, 'w': False}
 
-        for a in dir(self.pvt_o):
+        for a in pvt_dir(self.pvt_o):
             if self.attr_hidden(a):
                 self.acl_cache[a] = hidden_d
                 continue
@@ -66,9 +187,27 @@ cdef class Protected(Private):
                 'r': self.protected_visible(a, use_cache=False),
                 'w': self.protected_writeable(a, use_cache=False),
             }
+            if self.dynamic_auto and self.auto_dict is not None:
+                # Remember method / data for instance attributes
+                if a in self.auto_dict:
+                    d['m'] = callable(self.auto_dict[a])
             self.acl_cache[a] = d
             continue
 
+    cdef bint auto_rebound(self, a, e):
+        '''
+        a-->str: attribute name
+        e-->dict: acl_cache entry for 'a'
+        Returns-->bool: instance attribute 'a' was rebound between method
+            and data after 'e' was built (dynamic='auto')
+        Attributes of the class are covered by its version tag
+        '''
+        m = e.get('m', None)
+        if m is None or self.type_token is not None:
+            # Dict watchers report rebinding between method and data
+            return False
+        return callable(self.auto_dict.get(a, None)) != m
+
     cdef check_1_op(self, a, op, use_cache=True):
         '''
         a-->str: attribute name
@@ -84,14 +223,29 @@ cdef class Protected(Private):
 
         d = self.rules
         attr_type_check = bool(d.get('attr_type_check', False))
-        ro_method = bool(d.get('ro_method', False))
-        ro_data = bool(d.get('ro_data', False))
-        hide_private = bool(d.get('hide_private', False))
 
-        if use_cache and self.acl_cache is not None:
+        if (
+            use_cache and self.acl_cache is not None and
+            (not self.dynamic_auto or self.auto_cache_valid(a))
+        ):
             def_d = {'r': True, 'w': True}
-            d = self.acl_cache.get(a, def_d)
-            return d[op]
+            e = self.acl_cache.get(a, None)
+            if stats_enabled:
+                stats_incr(
+                    'acl_cache_misses' if e is None else 'acl_cache_hits'
+                )
+            if e is None:
+                e = def_d
+            if not (
+                self.dynamic_auto and op == 'w' and attr_type_check and
+                self.auto_rebound(a, e)
+            ):
+                return e[op]
+        if self.acl_cache is None or (use_cache and self.dynamic_auto):
+            if stats_enabled:
+                stats_incr('acl_dynamic')
+            if slow_path_hook is not None:
+                slow_path('acl_dynamic', a, self.pvt_o)
 
         # If we got here, we need DYNAMIC lookup
         # Either use_cache is False (in call to check_1_op)
@@ -102,52 +256,7 @@ cdef class Protected(Private):
         if self.attr_hidden(a):
             return False
 
-        if op == 'r':
-            # special_attributes always visible
-            if a in special_attributes:
-                return True
-            # always_frozen are .... always frozen
-            if a in always_frozen:
-                return True
-
-            if hide_private and ro_private_attr.match(a):
-                return False
-            if (
-                'hide_regex' in d and
-                d['hide_regex'].pattern and
-                d['hide_regex'].match(a)
-            ):
-                return False
-        elif op == 'w':
-            if self.frozen:
-                return False
-            # special_attributes never writeable
-            if a in special_attributes:
-                return False
-            if ro_private_attr.match(a):
-                return False
-            # rw overrides ro_*
-            if (
-                'rw_regex' in d and
-                d['rw_regex'].pattern and
-                d['rw_regex'].match(a)
-            ):
-                return True
-            if (
-                'ro_regex' in d and
-                d['ro_regex'].pattern and
-                d['ro_regex'].match(a)
-            ):
-                return False
-
-        if attr_type_check is True:
-            if op == 'w' and (ro_method or ro_data):
-                bMethod = callable(getattr(self.pvt_o, a))
-                if ro_method:
-                    return not bMethod
-                elif ro_data:
-                    return bMethod
-        return True
+        return rules_allow(d, self.pvt_o, a, op, self.frozen, -1)
 
     cdef protected_visible(self, a, use_cache=True):
         '''
@@ -158,6 +267,20 @@ cdef class Protected(Private):
 
         Needs to be FAST - called in __getattribute__, __setattr__, __delattr__
         '''
+        if (
+            use_cache and self.dynamic_auto and
+            a not in special_attributes and self.auto_cache_valid(a)
+        ):
+            # Cache was built from dir() of unchanged wrapped object -
+            # attributes not in cache are not in dir()
+            d = self.acl_cache.get(a, None)
+            if stats_enabled:
+                stats_incr(
+                    'acl_cache_misses' if d is None else 'acl_cache_hits'
+                )
+            if d is None:
+                return False
+            return d['r']
         if not self.private_visible(a):
             return False
         if self.acl_cache is None:
@@ -187,38 +310,41 @@ cdef class Protected(Private):
 
         Needs to be FAST - called in __getattribute__, __setattr__, __delattr__
         '''
-        ro_msg = 'Read only attribute: %s' % (a,)
-
         if self.frozen and op in ('w', 'd'):
             # Module hack
             if not isinstance(self.pvt_o, types.ModuleType):
                 raise frozen_error
         if op == 'r':
             if not self.visible(a):
-                raise AttributeError(
-                    "Object Protected('%s') has no attribute '%s'" % (self.cn, a)
+                raise LazyAttributeError(
+                    "Object Protected('%s') has no attribute '%s'", self.cn, a
                 )
             return     # OK
         elif op == 'w':
             if not self.writeable(a):
-                raise ProtectionError(ro_msg)
+                raise LazyProtectionError('Read only attribute: %s', a)
             return   # OK
         elif op == 'd':
             return   # OK
 
     cdef protected_getattr(self, a):
         self.aclcheck(a=a, op='r')
-        x = self.private_getattr(a)
+        # Decide whether result is frozen BEFORE fetching the attribute
         # Can always read PROT_ATTR_NAME, even with hide_private == True
-        if a == PROT_ATTR_NAME:
-            return x
-        if a in m_block and hasattr(Wrapped, a):
-            return x
-        try:
-            self.aclcheck(a=a, op='w')
-            return x
-        except:   # not writeable for any reason
-            return freeze(x)
+        if a == PROT_ATTR_NAME or (a in m_block and hasattr(Wrapped, a)):
+            return self.private_getattr(a)
+        # Same decision as aclcheck(a, 'w') - without raising
+        ro = (
+            (
+                self.frozen and
+                not isinstance(self.pvt_o, types.ModuleType)
+            ) or
+            not self.writeable(a)
+        )
+        x = self.private_getattr(a)
+        if ro:
+            return self.freeze_child(x)
+        return x
 
     cdef protected_check_setattr(self, a, val):
         self.aclcheck(a=a, op='w')
@@ -228,7 +354,35 @@ cdef class Protected(Private):
         self.aclcheck(a=a, op='d')
         self.private_check_delattr(a)
 
+    cdef get_1(self, a):
+        if not self.recording_on:
+            return self.protected_getattr(a)
+        try:
+            x = self.protected_getattr(a)
+        except:
+            self.record(a, 'r', False)
+            raise
+        self.record(a, 'r', True)
+        return x
+
+    cdef check_set_1(self, a, val):
+        if not self.recording_on:
+            self.protected_check_setattr(a, val)
+            return
+        try:
+            self.protected_check_setattr(a, val)
+        except:
+            self.record(a, 'w', False)
+            raise
+
+    cdef set_1(self, a, val):
+        if self.recording_on:
+            self.record_setattr(a, val)
+        setattr(self.pvt_o, a, val)
+
     cdef protected_dir(self):
+        if self.dynamic_auto and self.auto_cache_valid():
+            return self.dir_out
         if bool(self.rules.get('dynamic', True)):
             return [
                 x for x in self.private_dir()
@@ -237,6 +391,92 @@ cdef class Protected(Private):
         else:
             return self.dir_out
 
+    cdef start_recording(self):
+        '''
+        Starts a new recording - discards any previous recording
+        Snapshots attribute names of wrapped object
+        '''
+        self.recording = {
+            'r': set(), 'w': set(), 'd': set(), 'denied': set(),
+            'attrs': frozenset(pvt_dir(self.pvt_o)),
+            'changed': False,
+        }
+        self.recording_on = True
+
+    cdef record(self, a, op, ok):
+        '''
+        a-->str: attribute name
+        op-->str: one of ('r', 'w', 'd')
+        ok-->bool: access was allowed
+        Only called while recording_on is True
+        '''
+        if a == PROT_ATTR_NAME:
+            return
+        d = self.recording
+        if not ok:
+            d['denied'].add(a)
+            return
+        d[op].add(a)
+        if op == 'd' or a not in d['attrs']:
+            d['changed'] = True
+
+    cdef record_setattr(self, a, val):
+        '''
+        Records write of 'a' and whether it changes 'a' between method
+        and data (which changes result of ro_method / ro_data)
+        Only called while recording_on is True, BEFORE setattr
+        '''
+        self.record(a, 'w', True)
+        if is_method(self.pvt_o, a) != callable(val):
+            self.recording['changed'] = True
+
+    cdef recording_report(self):
+        '''
+        Returns-->dict: see access_report()
+        '''
+        d = self.recording
+        if d is None:
+            d = {
+                'r': set(), 'w': set(), 'd': set(), 'denied': set(),
+                'attrs': frozenset(), 'changed': False,
+            }
+        attrs = frozenset(pvt_dir(self.pvt_o))
+        changed = bool(d['changed']) or (
+            self.recording is not None and attrs != d['attrs']
+        )
+        used = d['r'].union(d['w'])
+
+        kw = dict(self.rules.get('kwargs', {}))
+        # Only suggest named attributes - never special methods
+        candidates = [
+            a for a in attrs
+            if attr_identifier.match(a) and not a.startswith('__')
+        ]
+        rw = set([x for x in kw.get('rw', []) if x in d['w']])
+        hide = set(kw.get('hide', [])).union([
+            a for a in candidates
+            if a not in used and self.visible(a)
+        ])
+        ro = set(kw.get('ro', [])).union([
+            a for a in candidates
+            if a in d['r'] and a not in d['w'] and self.writeable(a)
+        ])
+        ro = ro.difference(rw)
+        kw['hide'] = sorted(hide)
+        kw['ro'] = sorted(ro)
+        kw['rw'] = sorted(rw)
+        if not changed:
+            kw['dynamic'] = False
+        return {
+            'recording': bool(self.recording_on),
+            'reads': sorted(d['r']),
+            'writes': sorted(d['w']),
+            'deletes': sorted(d['d']),
+            'denied': sorted(d['denied']),
+            'changed': changed,
+            'suggested': kw,
+        }
+
     cdef visible(self, a):
         # Needs to be FAST - called in __getattribute__, __setattr__, __delattr__
         return self.protected_visible(a)
@@ -251,18 +491,56 @@ cdef class Protected(Private):
     # --------------------------------------------------------------------
 
     def __getattribute__(self, a):
-        return self.protected_getattr(a)
+        try:
+            x = self.protected_getattr(a)
+            if self.frozen and a in array_export_attributes:
+                x = self.array_export(a, x)
+        except:
+            if stats_enabled:
+                stats_incr('reads_denied', type(self).__name__)
+            if self.recording_on:
+                self.record(a, 'r', False)
+            raise
+        if self.recording_on:
+            self.record(a, 'r', True)
+        if stats_enabled:
+            stats_incr('reads', type(self).__name__)
+        return x
 
     def __setattr__(self, a, val):
         # Only checks and raises exceptions
-        self.protected_check_setattr(a, val)
+        try:
+            self.protected_check_setattr(a, val)
+        except:
+            if stats_enabled:
+                stats_incr('writes_denied', type(self).__name__)
+            if self.recording_on:
+                self.record(a, 'w', False)
+            raise
+        if stats_enabled:
+            stats_incr('writes', type(self).__name__)
+        if self.recording_on:
+            self.record_setattr(a, val)
         setattr(self.pvt_o, a, val)
 
     def __delattr__(self, a):
         # Only checks and raises exceptions
-        self.protected_check_delattr(a)
+        try:
+            self.protected_check_delattr(a)
+        except:
+            if stats_enabled:
+                stats_incr('deletes_denied', type(self).__name__)
+            if self.recording_on:
+                self.record(a, 'd', False)
+            raise
+        if stats_enabled:
+            stats_incr('deletes', type(self).__name__)
+        if self.recording_on:
+            self.record(a, 'd', True)
 
     def __dir__(self):
+        if stats_enabled:
+            stats_incr('dir', type(self).__name__)
         return self.protected_dir()
 
     # Python / cython does not automatically use parent __hash__
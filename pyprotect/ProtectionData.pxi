@@ -92,11 +92,9 @@ cdef class __ProtectionData(object):
     def __getattribute__(self, a):
         if a in self.attributes_map:
             return self.attributes_map.get(a)
-        missing_msg = "Object '%s' has no attribute '%s'" % (
-            '__ProtectionData',
-            str(a)
+        raise LazyAttributeError(
+            "Object '%s' has no attribute '%s'", '__ProtectionData', a
         )
-        raise AttributeError(missing_msg)
 
     def __setattr__(self, a, val):
         raise ProtectionError('Object is read-only')
@@ -7,6 +7,10 @@ cdef class Proxy(object):
     '''
     cdef object pvt_o
     cdef bint frozen
+    # None or tuple set by freeze(o, depth=..., skip_types=...):
+    #   (depth: int: levels below this wrapper that are frozen - -1 for
+    #   all levels, skip_types: tuple of types never frozen)
+    cdef object freeze_opts
 
     def __init__(self, o, frozen=False):
         '''
@@ -16,6 +20,62 @@ cdef class Proxy(object):
         self.pvt_o = o
         self.frozen = bool(frozen)
 
+    # --------------------------------------------------------------------
+    # Private methods
+    # --------------------------------------------------------------------
+
+    cdef freeze_child(self, x):
+        '''
+        x-->object read through this frozen wrapper
+        Returns-->freeze(x) - 'x' itself below the depth or if of a type
+            in skip_types given to freeze()
+        '''
+        if self.freeze_opts is None:
+            return freeze(x)
+        (depth, skip_types) = self.freeze_opts
+        if depth == 0:
+            return x
+        if (
+            skip_types and
+            not isinstance(x, Wrapped) and
+            isinstance(x, skip_types)
+        ):
+            return x
+        f = freeze(x)
+        if f is not x and isinstance(f, Proxy):
+            # New wrapper - its own reads are limited one level further
+            (<Proxy>f).freeze_opts = (
+                depth - 1 if depth > 0 else -1, skip_types
+            )
+        return f
+
+    cdef array_export(self, a, x):
+        '''
+        a-->str: name in array_export_attributes read through this frozen
+            wrapper
+        x-->value read
+        Returns-->NEW dict for __array_interface__ with the data marked
+            read-only
+        Raises AttributeError for other names - consumers fall back to
+        __array_interface__ or the (read-only) buffer
+        '''
+        if a != '__array_interface__':
+            raise LazyAttributeError(
+                "Frozen object does not export '%s'", a
+            )
+        if isinstance(x, Proxy):
+            x = (<Proxy>x).pvt_o
+        if not isinstance(x, dict):
+            return x
+        d = dict(x)
+        data = d.get('data', None)
+        if isinstance(data, tuple) and len(data) == 2:
+            # (address, read-only flag)
+            d['data'] = (data[0], True)
+        elif data is not None:
+            d['data'] = memoryview(data).toreadonly()
+        return d
+
     # --------------------------------------------------------------------
     # Public methods
     # --------------------------------------------------------------------
@@ -31,6 +91,45 @@ cdef class Proxy(object):
     def __bytes__(self):
         return bytes(self.pvt_o)
 
+    # Buffer protocol - frozen wrappers export the buffer of the wrapped
+    # object READ-ONLY, without copying. The exporter is the wrapper -
+    # the wrapped object is not reachable from the buffer
+    def __getbuffer__(self, Py_buffer *buffer, int flags):
+        cdef Py_buffer *view
+        if not self.frozen:
+            raise TypeError(
+                'Buffer is exported only by frozen objects: %s' % (
+                    type(self.pvt_o).__name__,
+                )
+            )
+        if flags & PyBUF_WRITABLE:
+            raise BufferError('Object is read-only')
+        view = <Py_buffer *>PyMem_Malloc(sizeof(Py_buffer))
+        if view == NULL:
+            raise MemoryError()
+        try:
+            PyObject_GetBuffer(self.pvt_o, view, flags)
+        except:
+            PyMem_Free(view)
+            raise
+        buffer.buf = view.buf
+        buffer.len = view.len
+        buffer.itemsize = view.itemsize
+        buffer.format = view.format
+        buffer.ndim = view.ndim
+        buffer.shape = view.shape
+        buffer.strides = view.strides
+        buffer.suboffsets = view.suboffsets
+        buffer.readonly = 1
+        buffer.internal = view
+        buffer.obj = self
+
+    def __releasebuffer__(self, Py_buffer *buffer):
+        cdef Py_buffer *view = <Py_buffer *>buffer.internal
+        if view != NULL:
+            PyBuffer_Release(view)
+            PyMem_Free(view)
+
     # --------------------------------------------------------------------
     # From: https://docs.python.org/3/reference/datamodel.html
     # --------------------------------------------------------------------
@@ -43,13 +142,13 @@ cdef class Proxy(object):
 
         x = self.pvt_o(*args, **kwargs)
         if self.frozen and not isimmutable(x):
-            x = Frozen(x)
+            x = self.freeze_child(x)
         return x
 
     def __iter__(self):
         for x in iter(self.pvt_o):
             if self.frozen:
-                x = freeze(x)
+                x = self.freeze_child(x)
             yield x
 
     # Representations - return immutable
@@ -64,7 +163,7 @@ cdef class Proxy(object):
     def __getitem__(self, key):
         x = self.pvt_o.__getitem__(key)
         if self.frozen:
-            x = freeze(x)
+            x = self.freeze_child(x)
         return x
 
     def __contains__(self, val):
@@ -0,0 +1,101 @@
+
+class Sealed(tuple):
+    '''
+    Base class of records returned by seal()
+    Values are stored in the tuple - each field is a property reading
+    one index, so reading a field does not go through a wrapper
+    Attributes:
+        _fields: tuple of str: field names in index order
+        _index: dict: field name-->index
+    '''
+    __slots__ = ()
+    _fields = ()
+    _index = {}
+
+    def __setattr__(self, a, val):
+        raise frozen_error
+
+    def __delattr__(self, a):
+        raise frozen_error
+
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__, ', '.join([
+            '%s=%r' % (k, v) for (k, v) in zip(self._fields, self)
+        ]))
+
+    def __reduce__(self):
+        raise ProtectionError('Sealed record cannot be pickled')
+
+    def _asdict(self):
+        '''_asdict() -> dict: field name-->value'''
+        return dict(zip(self._fields, self))
+
+
+# Names that cannot be fields - they would hide attributes of Sealed
+cdef frozenset sealed_reserved = frozenset(dir(Sealed))
+
+
+cdef bint is_sealed(o):
+    '''
+    o-->object
+    Returns-->bool: 'o' is a record returned by seal()
+    isinstance() with a python class reads __class__ - which wrappers
+    count as an attribute read. Wrappers are never tuples
+    '''
+    return isinstance(o, tuple) and isinstance(o, Sealed)
+
+
+cdef sealed_class(cn, tuple fields):
+    '''
+    cn-->str: class name of sealed object
+    fields-->tuple of str
+    Returns-->subclass of Sealed - one per (cn, fields)
+    '''
+    k = (cn, fields)
+    c = sealed_classes.get(k, None)
+    if c is not None:
+        return c
+    ns = {
+        '__slots__': (),
+        '_fields': fields,
+        '_index': dict([(a, i) for (i, a) in enumerate(fields)]),
+    }
+    for (i, a) in enumerate(fields):
+        ns[a] = property(operator.itemgetter(i))
+    c = type(cn, (Sealed,), ns)
+    sealed_classes[k] = c
+    return c
+
+
+cdef seal_object(o):
+    '''
+    o-->object: not a Sealed record
+    Returns-->Sealed record - see seal()
+    '''
+    if iswrapped(o):
+        w = o
+        pvt_o = (<Wrapped>o).pvt_o
+    else:
+        w = Private(o)
+        pvt_o = o
+    names = []
+    for a in sorted((<Wrapped>w).acl(None)[0]):
+        if a.startswith('__') or a in indirect_attributes:
+            continue
+        if a in sealed_reserved or not attr_identifier.match(a):
+            continue
+        if is_method(pvt_o, a):
+            continue
+        names.append(a)
+    values = []
+    fields = []
+    for a in names:
+        try:
+            x = getattr(w, a)
+        except AttributeError:
+            # e.g. property raising AttributeError - not in the record
+            continue
+        fields.append(a)
+        values.append(freeze(x))
+    c = sealed_class((<Wrapped>w).cn, tuple(fields))
+    return tuple.__new__(c, values)
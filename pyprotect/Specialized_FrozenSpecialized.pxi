@@ -0,0 +1,286 @@
+
+# Keyword arguments of protect() accepted in policy of specialize()
+cdef frozenset specialize_keywords = frozenset([
+    'frozen', 'dynamic', 'hide_private', 'ro_data', 'ro_method',
+    'ro', 'rw', 'hide',
+])
+
+# Results of __Specialization.lookup()
+cdef int SPEC_GENERIC = 0
+cdef int SPEC_PLAIN = 1
+cdef int SPEC_RO = 2
+cdef int SPEC_HIDDEN = 3
+# Bits of entries in __Specialization.table - kind (see attr_kind)
+# of the class attribute is stored above SPEC_KIND_SHIFT
+cdef int SPEC_R = 1
+cdef int SPEC_W_DATA = 2
+cdef int SPEC_W_METHOD = 4
+cdef int SPEC_INDIRECT = 8
+cdef int SPEC_KIND_SHIFT = 4
+
+
+@cython.final
+@cython.internal
+cdef class __Specialization(object):
+    '''
+    Attribute table for ONE (type, policy) - see specialize()
+    Attributes:
+        t: type: exact type of wrapped objects
+        kwargs: dict: protect() keyword arguments
+        rules: dict: returned by protected_rules_from_kwargs
+        table: dict: name-->int: rules evaluated ONCE per name
+        version: version tag of 't' when table was filled
+        cls: generated subclass of Specialized or FrozenSpecialized
+    Only whether an attribute is a method or data is decided per
+    object - from the instance __dict__
+    '''
+    cdef object t
+    cdef dict kwargs
+    cdef dict rules
+    cdef bint frozen
+    cdef bint default_dir
+    cdef object hidden_private_attr
+    cdef dict table
+    cdef unsigned int version
+    cdef object cls
+
+    cdef int entry(self, a):
+        '''
+        a-->str: attribute name
+        Returns-->int: table entry for 'a' - computed on first use
+        '''
+        e = self.table.get(a, None)
+        if e is not None:
+            return e
+        if a in indirect_attributes:
+            x = SPEC_INDIRECT
+        elif (
+            unmangled_private_attr.match(a) or
+            self.hidden_private_attr.match(a) or
+            not rules_allow(self.rules, None, a, 'r', self.frozen, 0)
+        ):
+            x = 0
+        else:
+            x = SPEC_R
+            if rules_allow(self.rules, None, a, 'w', self.frozen, 0):
+                x |= SPEC_W_DATA
+            if rules_allow(self.rules, None, a, 'w', self.frozen, 1):
+                x |= SPEC_W_METHOD
+        x |= (attr_kind(self.t, a) << SPEC_KIND_SHIFT)
+        if len(self.table) >= attr_kind_cache_max:
+            self.table.clear()
+        self.table[a] = x
+        return x
+
+    cdef bint refresh(self):
+        '''
+        Refills table with attributes of the class if the class changed
+        Returns-->bool: table can be used
+        '''
+        cdef unsigned int v = type_version(self.t)
+        if v == 0 or not self.default_dir:
+            return False
+        if v == self.version:
+            return True
+        if slow_path_hook is not None:
+            slow_path('policy_compile', None, self.t)
+        self.table = {}
+        for b in self.t.__mro__:
+            for a in list(b.__dict__):
+                if isinstance(a, str):
+                    self.entry(a)
+        self.version = v
+        return True
+
+    cdef int lookup(self, o, a):
+        '''
+        o-->object: wrapped object - instance of 't'
+        a-->str: attribute name
+        Returns-->int: one of SPEC_GENERIC, SPEC_PLAIN, SPEC_RO, SPEC_HIDDEN
+        Needs to be FAST - called in __getattribute__, __setattr__
+        '''
+        cdef int e
+        cdef int kind
+        if type_version(self.t) != self.version and not self.refresh():
+            return SPEC_GENERIC
+        e = self.entry(a)
+        if e & SPEC_INDIRECT:
+            return SPEC_GENERIC
+        if not (e & SPEC_R):
+            return SPEC_HIDDEN
+        kind = e >> SPEC_KIND_SHIFT
+        if kind == KIND_DATA_DESCRIPTOR:
+            # Data descriptors (property, __slots__) take precedence
+            method = False
+        else:
+            d = instance_dict(o)
+            if d is not None and a in d:
+                method = callable(d[a])
+            elif kind == KIND_MISSING:
+                # Not in dir(o) - or provided by __getattr__
+                return SPEC_GENERIC
+            else:
+                method = (kind == KIND_METHOD)
+        if e & (SPEC_W_METHOD if method else SPEC_W_DATA):
+            return SPEC_PLAIN
+        return SPEC_RO
+
+
+cdef tuple specialization_key(kwargs, bint frozen):
+    '''
+    kwargs-->dict: protect() keyword arguments
+    frozen-->bool
+    Returns-->tuple: same for policies that give the same attribute table
+    'dynamic' does not change the table - it is not part of the key
+    '''
+    def _names(k):
+        return frozenset([
+            x for x in list(kwargs.get(k, []))
+            if isinstance(x, str) and attr_identifier.match(x)
+        ])
+
+    return (
+        frozen,
+        bool(kwargs.get('hide_private', False)),
+        bool(kwargs.get('ro_data', False)),
+        bool(kwargs.get('ro_method', True)),
+        _names('ro'), _names('rw'), _names('hide'),
+    )
+
+
+cdef __Specialization build_specialization(t, kwargs):
+    '''
+    t-->type
+    kwargs-->dict: protect() keyword arguments
+    Returns-->__Specialization
+    Evaluates the rules ONCE for attributes of the class 't' - other
+    names are added to the table on first use
+    '''
+    cdef __Specialization spec
+    spec = __Specialization.__new__(__Specialization)
+    spec.t = t
+    spec.kwargs = dict(kwargs)
+    spec.rules = protected_rules_from_kwargs(kwargs)
+    spec.frozen = bool(spec.rules['frozen'])
+    # Custom __dir__ can hide attributes - generic path only
+    spec.default_dir = (t.__dir__ is object.__dir__)
+    spec.hidden_private_attr = re.compile(
+        mangled_private_attr_regex_fmt % (t.__name__,)
+    )
+    spec.table = {}
+    spec.version = 0
+    spec.refresh()
+    base = FrozenSpecialized if spec.frozen else Specialized
+    spec.cls = type(
+        '%s_%s' % (base.__name__, t.__name__), (base,), {
+            '__slots__': (),
+            '__module__': base.__module__,
+            '__doc__': base.__doc__,
+        }
+    )
+    return spec
+
+
+cdef specialized_class(o, kwargs, bint frozen):
+    '''
+    o-->object to be wrapped - not Wrapped
+    kwargs-->dict: protect() keyword arguments
+    frozen-->bool
+    Returns-->class generated by specialize() for type(o) and policy -
+        or None
+    '''
+    if isinstance(o, (type, types.ModuleType)):
+        return None
+    spec = specializations.get(
+        (type(o), specialization_key(kwargs, frozen)), None
+    )
+    if spec is None:
+        return None
+    return (<__Specialization>spec).cls
+
+
+# @cython.internal
+cdef class Specialized(Protected):
+    '''
+    Subclass of Protected using an attribute table shared by all
+    wrappers of the same type and protect() policy
+        - Not created directly - protect() returns an instance of a
+          subclass generated by specialize() when one is registered
+        - Rules are evaluated once per name, not on every access
+        - Names the table cannot decide use the generic path of Protected
+    '''
+    cdef __Specialization spec
+
+    def __init__(self, o, rules):
+        '''
+        o-->object to be wrapped
+        rules-->dict: returned by protected_rules_from_kwargs
+        '''
+        self.spec = specialized_classes.get(type(self), None)
+        if self.spec is None or type(o) is not self.spec.t:
+            raise TypeError(
+                'Use protect() on an instance of a specialized type'
+            )
+        Protected.__init__(self, o, rules)
+
+    # --------------------------------------------------------------------
+    # Private methods
+    # --------------------------------------------------------------------
+
+    cdef protected_getattr(self, a):
+        k = self.spec.lookup(self.pvt_o, a)
+        if k == SPEC_PLAIN or k == SPEC_RO:
+            try:
+                x = getattr(self.pvt_o, a)
+            except AttributeError:
+                # Raise the same exception as the generic path
+                return Protected.protected_getattr(self, a)
+            if k == SPEC_PLAIN:
+                return x
+            return self.freeze_child(x)
+        if k == SPEC_HIDDEN:
+            raise LazyAttributeError(
+                "Object Protected('%s') has no attribute '%s'", self.cn, a
+            )
+        return Protected.protected_getattr(self, a)
+
+    cdef protected_check_setattr(self, a, val):
+        if self.spec.lookup(self.pvt_o, a) == SPEC_PLAIN:
+            self.wrapped_check_setattr(a, val)
+            return
+        Protected.protected_check_setattr(self, a, val)
+
+    # --------------------------------------------------------------------
+    # Public methods
+    # --------------------------------------------------------------------
+
+    # Python / cython does not automatically use parent __hash__
+    def __hash__(self):
+        return Wrapped.__hash__(self)
+
+    # __richcmp__ needs to be class-specific
+    def __richcmp__(self, other, int op):
+        '''Use common method for all Wrapped objects'''
+        return self.comparator(other, op)
+
+
+cdef class FrozenSpecialized(Specialized):
+    '''
+    Subclass of Specialized that is automatically frozen
+    '''
+    def __init__(self, o, rules):
+        '''
+        o-->object to be wrapped
+        rules-->dict: returned by protected_rules_from_kwargs
+        '''
+        rules['frozen'] = True
+        Specialized.__init__(self, o, rules)
+
+    # Python / cython does not automatically use parent __hash__
+    def __hash__(self):
+        return Wrapped.__hash__(self)
+
+    # __richcmp__ needs to be class-specific
+    def __richcmp__(self, other, int op):
+        '''Use common method for all Wrapped objects'''
+        return self.comparator(other, op)
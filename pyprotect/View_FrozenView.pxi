@@ -0,0 +1,161 @@
+
+# @cython.internal
+cdef class View(Protected):
+    '''
+    Subclass of Protected where ONLY attributes named at creation
+    can be visible:
+        - Visible and writeable names are computed ONCE at creation -
+          dir(o) is never called
+        - dir() is constant - the visible names
+        - Reading a visible attribute is one set lookup plus getattr()
+    Rules of Private and of protect() keyword arguments (if any) are
+    applied to each named attribute at creation - names that are not
+    attributes of the wrapped object at creation are not visible
+    '''
+    # Names that are visible
+    cdef frozenset view_names
+    # Names that are writeable
+    cdef frozenset view_writeable
+    # Visible names read directly from wrapped object in protected_getattr
+    cdef frozenset view_plain
+
+    def __init__(self, o, rules):
+        '''
+        o-->object to be wrapped
+        rules-->dict: with key 'view' - see view()
+        '''
+        Protected.__init__(self, o, rules)
+
+    # --------------------------------------------------------------------
+    # Private methods
+    # --------------------------------------------------------------------
+
+    cdef owned_parts(self):
+        '''Adds precomputed tables'''
+        return Protected.owned_parts(self) + (
+            self.view_names, self.view_writeable, self.view_plain,
+        )
+
+    cdef process_rules(self, rules):
+        '''
+        rules-->dict
+        Called once at object wrapping time
+        Evaluates the rules for the named attributes ONLY
+        '''
+        if slow_path_hook is not None:
+            slow_path('policy_compile', None, self.pvt_o)
+        # Not used by View - but check_1_op evaluates rules dynamically
+        # without reporting acl_dynamic only when acl_cache is not None
+        self.acl_cache = {}
+        # protect() keyword arguments - only for view() of a Protected
+        checked = ('hide_regex' in rules)
+        r = []
+        w = []
+        for a in rules.get('view', ()):
+            if not isinstance(a, str):
+                continue
+            if self.attr_hidden(a) or a in pickle_attributes:
+                continue
+            if not has_attr(self.pvt_o, a):
+                continue
+            if checked and not self.check_1_op(a, 'r', use_cache=False):
+                continue
+            r.append(a)
+            if (
+                self.frozen or a in indirect_attributes or
+                ro_private_attr.match(a)
+            ):
+                continue
+            if checked and not self.check_1_op(a, 'w', use_cache=False):
+                continue
+            w.append(a)
+        self.view_names = frozenset(r)
+        self.view_writeable = frozenset(w)
+        self.view_plain = self.view_names.difference(indirect_attributes)
+        self.dir_out = list(self.view_names)
+
+    cdef visible(self, a):
+        # Needs to be FAST - called in __getattribute__, __setattr__, __delattr__
+        return a in self.view_names or a in special_attributes
+
+    cdef writeable(self, a):
+        # Needs to be FAST - called in __setattr__, __delattr__
+        return a in self.view_writeable
+
+    cdef acl(self, names):
+        '''
+        See Wrapped.acl
+        dir(pvt_o) is not needed
+        '''
+        if names is None:
+            names = self.view_names.union(special_attributes)
+        return Wrapped.acl(self, names)
+
+    cdef getattrs(self, names):
+        '''See Wrapped.getattrs - dir(pvt_o) is not needed'''
+        return Wrapped.getattrs(self, names)
+
+    cdef setattrs(self, mapping):
+        '''See Wrapped.setattrs - dir(pvt_o) is not needed'''
+        Wrapped.setattrs(self, mapping)
+
+    cdef protected_getattr(self, a):
+        if a in self.view_plain:
+            try:
+                x = getattr(self.pvt_o, a)
+            except AttributeError:
+                raise LazyAttributeError(
+                    "Object View('%s') has no attribute '%s'", self.cn, a
+                )
+            if a in self.view_writeable:
+                return x
+            return self.freeze_child(x)
+        return Protected.protected_getattr(self, a)
+
+    cdef protected_check_setattr(self, a, val):
+        if self.frozen and not isinstance(self.pvt_o, types.ModuleType):
+            raise frozen_error
+        if a not in self.view_writeable:
+            raise LazyProtectionError('Read only attribute: %s', a)
+        if not has_attr(self.pvt_o, a):
+            raise LazyProtectionError(
+                'Cannot add attribute: %s.%s', self.cn, a
+            )
+
+    cdef protected_dir(self):
+        return self.dir_out
+
+    # --------------------------------------------------------------------
+    # Public methods
+    # --------------------------------------------------------------------
+
+    # Python / cython does not automatically use parent __hash__
+    def __hash__(self):
+        return Wrapped.__hash__(self)
+
+    # __richcmp__ needs to be class-specific
+    def __richcmp__(self, other, int op):
+        '''Use common method for all Wrapped objects'''
+        return self.comparator(other, op)
+
+
+cdef class FrozenView(View):
+    '''
+    Subclass of View that is automatically frozen
+    '''
+    def __init__(self, o, rules):
+        '''
+        o-->object to be wrapped
+        rules-->dict: with key 'view' - see view()
+        '''
+        rules['frozen'] = True
+        View.__init__(self, o, rules)
+
+    # Python / cython does not automatically use parent __hash__
+    def __hash__(self):
+        return Wrapped.__hash__(self)
+
+    # __richcmp__ needs to be class-specific
+    def __richcmp__(self, other, int op):
+        '''Use common method for all Wrapped objects'''
+        return self.comparator(other, op)
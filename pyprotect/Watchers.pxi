@@ -0,0 +1,117 @@
+
+@cython.final
+@cython.internal
+cdef class __WatchToken(object):
+    '''
+    Shared by all wrappers watching the same dict or type
+    Attributes:
+        version: int: incremented whenever a watcher reports a change
+            that can change dir() or method / data classification
+        type_ref: weakref to the watched type - its callback removes the
+            token from watch_tokens, so that the id of a deallocated type
+            is never reused for its token. None for dicts
+    '''
+    cdef unsigned long version
+    cdef object type_ref
+    cdef Py_ssize_t key
+
+    def type_dead(self, r):
+        '''Callback of type_ref'''
+        if watch_tokens.get(self.key, None) is self:
+            del watch_tokens[self.key]
+
+
+# Never changes - used for objects without an instance __dict__
+cdef __WatchToken unchanging_token = __WatchToken()
+
+
+cdef int dict_watch_callback(
+    int event, PyObject *d, PyObject *key, PyObject *new_value
+) noexcept:
+    '''
+    Registered with PyDict_AddWatcher - called BEFORE 'd' is changed
+    Value rebinding only counts if it changes method / data
+    '''
+    cdef __WatchToken tok
+    try:
+        k = <Py_ssize_t>d
+        tok = watch_tokens.get(k, None)
+        if tok is None:
+            return 0
+        if event == DICT_EVENT_DEALLOCATED:
+            del watch_tokens[k]
+        elif event == DICT_EVENT_MODIFIED:
+            # Python 3.12 reports adding a key to a shared-keys instance
+            # __dict__ as MODIFIED - a missing key is an addition
+            old = (<dict>d).get(<object>key, no_attr)
+            if (
+                old is not no_attr and
+                callable(old) == callable(<object>new_value)
+            ):
+                return 0
+        tok.version += 1
+        if stats_enabled:
+            stats_incr('watch_events')
+    except BaseException:
+        pass
+    return 0
+
+
+cdef int type_watch_callback(PyObject *t) noexcept:
+    '''
+    Registered with PyType_AddWatcher - called when 't' or its bases
+    are changed
+    '''
+    cdef __WatchToken tok
+    try:
+        tok = watch_tokens.get(<Py_ssize_t>t, None)
+        if tok is None:
+            return 0
+        tok.version += 1
+        if stats_enabled:
+            stats_incr('watch_events')
+    except BaseException:
+        pass
+    return 0
+
+
+cdef bint watchers_available():
+    '''
+    Returns-->bool: dict and type watchers are registered
+    Registers them on first call
+    '''
+    global dict_watcher_id, type_watcher_id
+    if dict_watcher_id == -2:
+        dict_watcher_id = -1
+        type_watcher_id = -1
+        if HAVE_WATCHERS:
+            i = add_dict_watcher(<void *>dict_watch_callback)
+            if i >= 0:
+                j = add_type_watcher(<void *>type_watch_callback)
+                if j >= 0:
+                    (dict_watcher_id, type_watcher_id) = (i, j)
+    return type_watcher_id >= 0
+
+
+cdef __WatchToken watch(o):
+    '''
+    o-->dict or type
+    Returns-->__WatchToken or None if 'o' cannot be watched
+    Callers check watchers_available() BEFORE calling
+    '''
+    cdef __WatchToken tok
+    k = id(o)
+    tok = watch_tokens.get(k, None)
+    if isinstance(o, type):
+        ret = watch_type(type_watcher_id, o)
+    else:
+        ret = watch_dict(dict_watcher_id, o)
+    if ret < 0:
+        return None
+    if tok is None:
+        tok = __WatchToken()
+        tok.key = k
+        if isinstance(o, type):
+            tok.type_ref = weakref.ref(o, tok.type_dead)
+        watch_tokens[k] = tok
+    return tok
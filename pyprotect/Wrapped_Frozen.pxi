@@ -30,6 +30,8 @@ cdef class Wrapped(Proxy):
             # We claim to be avoiding double-wrapping, so this exception
             # should never be raised
             raise RuntimeError('Double-wrapped!')
+        if stats_enabled:
+            stats_incr('created', type(self).__name__)
 
         self.pvt_o = o
         self.frozen = bool(frozen)
@@ -80,6 +82,23 @@ cdef class Wrapped(Proxy):
                 )
             )
 
+        # __ProtectionData is built on first access - see protection_data()
+        if rules is not None:
+            self.protection_data(rules)
+
+    # --------------------------------------------------------------------
+    # Private methods
+    # --------------------------------------------------------------------
+
+    cdef protection_data(self, rules=None):
+        '''
+        rules-->dict or None: None means get_rules()
+        Returns-->__ProtectionData: built on first call
+        Building it in __init__ allocates a dozen partials - and reference
+        cycles - for EVERY wrapper, most of which are never asked for it
+        '''
+        if self.protected_attribute is not None:
+            return self.protected_attribute
         # Special code to avoid double-wrapping of Protected
         if rules is None:
             rules = dict(self.get_rules())
@@ -90,6 +109,13 @@ cdef class Wrapped(Proxy):
         else:
             protect_class = Protected
             private_class = Private
+        if isinstance(self, View):
+            # Never widen a View by re-wrapping
+            protect_class = FrozenView if self.frozen else View
+        protect_val = __HiddenPartial(protect_class, self.pvt_o)
+        if isinstance(self, CopyOnWrite):
+            # Re-wrapping keeps the overlay
+            protect_val = __HiddenPartial((<CopyOnWrite>self).cow_rewrap)
         if isinstance(self.pvt_o, type):
             id_class = id(self.pvt_o)
         else:
@@ -98,24 +124,21 @@ cdef class Wrapped(Proxy):
         self.protected_attribute = __ProtectionData(
             id_val=id(self.pvt_o),
             id_class=id_class,
-            hash_val=__HiddenPartial(self.hash_protected, self),
-            isinstance_val=__HiddenPartial(self.isinstance_protected, self),
-            issubclass_val=__HiddenPartial(self.issubclass_protected, self),
-            instanceof=__HiddenPartial(self.instanceof_protected, self),
-            subclassof=__HiddenPartial(self.subclassof_protected, self),
-            help_val=__HiddenPartial(self.help_protected, self),
-            help_str=__HiddenPartial(self.help_str_protected, self),
-            testop=__HiddenPartial(self.testop, self),
+            hash_val=__HiddenPartial(self.hash_protected),
+            isinstance_val=__HiddenPartial(self.isinstance_protected),
+            issubclass_val=__HiddenPartial(self.issubclass_protected),
+            instanceof=__HiddenPartial(self.instanceof_protected),
+            subclassof=__HiddenPartial(self.subclassof_protected),
+            help_val=__HiddenPartial(self.help_protected),
+            help_str=__HiddenPartial(self.help_str_protected),
+            testop=__HiddenPartial(self.testop),
             rules=rules,
-            freeze=__HiddenPartial(self.freeze, self),
+            freeze=__HiddenPartial(self.freeze),
             private=__HiddenPartial(private_class, self.pvt_o),
-            protect=__HiddenPartial(protect_class, self.pvt_o),
-            multiwrapped=__HiddenPartial(self.multiwrapped, self),
+            protect=protect_val,
+            multiwrapped=__HiddenPartial(self.multiwrapped),
         )
-
-    # --------------------------------------------------------------------
-    # Private methods
-    # --------------------------------------------------------------------
+        return self.protected_attribute
 
     cdef attr_hidden(self, attr):
         '''
@@ -134,13 +157,24 @@ cdef class Wrapped(Proxy):
         Returns-->o or Frozen(o)
         '''
         if self.frozen:
-            return freeze(o)
+            return self.freeze_child(o)
         return o
 
     cdef freeze(self):
         '''Smartly avoid double wrapping when freezing a Wrapped object'''
         if self.frozen:
             return self
+        if isinstance(self, CopyOnWrite):
+            # Keep the overlay
+            d = {}
+            d.update(self.rules)
+            d['frozen'] = True
+            return (<CopyOnWrite>self).cow_rewrap(d)
+        if isinstance(self, View):
+            d = {}
+            d.update(self.rules)
+            d['frozen'] = True
+            return FrozenView(self.pvt_o, d)
         if isinstance(self, Protected):
             d = {}
             d.update(self.rules)
@@ -201,6 +235,21 @@ cdef class Wrapped(Proxy):
             return False
         return not self.frozen
 
+    cdef bint readable(self, a):
+        '''
+        a-->str: attribute name
+        Returns-->bool: reading attribute 'a' would succeed
+        Exception-free probe - never fetches, freezes or wraps the
+        attribute value, never formats error messages
+        '''
+        if a == PROT_ATTR_NAME or a in overridden_always:
+            return True
+        if a in pickle_attributes:
+            return False
+        if a in always_delegated or (a in m_block and hasattr(Wrapped, a)):
+            return True
+        return has_attr(self.pvt_o, a)
+
     cdef testop(self, a, op):
         '''
         a-->str: attribute name
@@ -208,16 +257,154 @@ cdef class Wrapped(Proxy):
         Returns-->bool
         '''
         if op == 'r':
-            return hasattr(self, a)
+            return self.readable(a)
         elif op == 'w':
             if not self.writeable(a):
                 return False
             return not self.frozen
         return False
 
+    cdef acl(self, names):
+        '''
+        names-->iterable of str or None: None means all names in
+            dir(pvt_o) and special_attributes
+        Returns-->tuple of 2 frozensets: (visible, writeable)
+            visible: names 'a' for which testop(a, 'r') is True
+            writeable: names 'a' for which isreadonly(self, a) is False
+        '''
+        if names is None:
+            names = self.wrapped_dir()
+        elif isinstance(names, str):
+            names = (names,)
+        private = isinstance(self, Private)
+        r = []
+        w = []
+        for a in names:
+            if self.testop(a, 'r'):
+                r.append(a)
+            if private:
+                if self.testop(a, 'w'):
+                    w.append(a)
+            elif not self.frozen:
+                w.append(a)
+        return (frozenset(r), frozenset(w))
+
+    cdef get_1(self, a):
+        '''
+        a-->str: attribute name
+        Returns-->object: same as getattr(self, a) - without stats
+        Overridden by Private, Protected, PrivacyDict
+        '''
+        return self.wrapped_getattr(a)
+
+    cdef check_set_1(self, a, val):
+        '''
+        Raises exception if setattr(self, a, val) is not allowed
+        Overridden by Private, Protected
+        '''
+        self.wrapped_check_setattr(a, val)
+
+    cdef set_1(self, a, val):
+        '''Called only after check_set_1(a, val) - without stats'''
+        setattr(self.pvt_o, a, val)
+
+    cdef getattrs(self, names):
+        '''
+        names-->iterable of str
+        Returns-->tuple: values of attributes in 'names'
+        '''
+        if isinstance(names, str):
+            names = (names,)
+        cn = type(self).__name__
+        out = []
+        for a in names:
+            try:
+                out.append(self.get_1(a))
+            except:
+                if stats_enabled:
+                    stats_incr('reads_denied', cn)
+                raise
+            if stats_enabled:
+                stats_incr('reads', cn)
+        return tuple(out)
+
+    cdef setattrs(self, mapping):
+        '''
+        mapping-->dict: attribute name-->value
+        ALL attributes are checked before ANY attribute is set
+        '''
+        cn = type(self).__name__
+        items = list(mapping.items())
+        for (a, val) in items:
+            try:
+                self.check_set_1(a, val)
+            except:
+                if stats_enabled:
+                    stats_incr('writes_denied', cn)
+                raise
+        for (a, val) in items:
+            if stats_enabled:
+                stats_incr('writes', cn)
+            self.set_1(a, val)
+
+    cdef tuple path_step(self, bint item, key):
+        '''
+        item-->bool: True for self[key]; False for getattr(self, key)
+        key-->str or int
+        Returns-->tuple: (value, bint: value must be frozen)
+        value is the same as returned by self[key] or getattr(self, key),
+        but is not frozen - see walk_path()
+        '''
+        try:
+            ret = self.path_read(item, key)
+        except:
+            if stats_enabled and not item:
+                stats_incr('reads_denied', type(self).__name__)
+            raise
+        if stats_enabled and not item:
+            stats_incr('reads', type(self).__name__)
+        return ret
+
+    cdef tuple path_read(self, bint item, key):
+        '''See path_step'''
+        if isinstance(self, PrivacyDict) or self.freeze_opts is not None:
+            if item:
+                return path_unwrap(self[key])
+            return path_unwrap(self.get_1(key))
+        if item:
+            return (self.pvt_o.__getitem__(key), self.frozen)
+        if (
+            key in indirect_attributes or
+            (self.frozen and isinstance(self.pvt_o, types.ModuleType)) or
+            (isinstance(self, Protected) and (<Protected>self).recording_on) or
+            not self.visible(key)
+        ):
+            return path_unwrap(self.get_1(key))
+        try:
+            x = getattr(self.pvt_o, key)
+        except AttributeError:
+            # Raise the same exception as getattr(self, key)
+            self.get_1(key)
+            raise
+        if self.frozen:
+            return (x, True)
+        if isinstance(self, Protected):
+            # Read-only attributes of Protected are frozen
+            return (x, not self.writeable(key))
+        return (x, False)
+
     cdef get_rules(self):
         return dict()
 
+    cdef owned_parts(self):
+        '''
+        Returns-->tuple: objects created for and held only by this wrapper
+        Used by __sizeof__
+        hidden_private_attr is shared by all wrappers of the class - it is
+        counted once in memory_report()['shared']
+        '''
+        return (self.protected_attribute, self.rules)
+
     cdef comparator(self, other, op):
         '''
         Operations:
@@ -319,7 +506,7 @@ cdef class Wrapped(Proxy):
     cdef wrapped_getattr(self, a):
         # protected_attribute
         if a == PROT_ATTR_NAME:
-            return self.protected_attribute
+            return self.protection_data()
         if a in overridden_always:
             return __HiddenPartial(getattr(Wrapped, a), self)
 
@@ -327,20 +514,20 @@ cdef class Wrapped(Proxy):
         if a in pickle_attributes:
             raise AttributeError('Wrapped object cannot be pickled')
 
-        delegated = getattr(self.pvt_o, a, None)
-        if a in always_delegated:
-            return delegated
-
         # Container mutating methods - implemented and selectively blocked
         if a in m_block and hasattr(Wrapped, a):
             return __HiddenPartial(getattr(Wrapped, a), self)
+
+        # All policy decisions are made - fetch the attribute exactly once
+        if a in always_delegated:
+            return getattr(self.pvt_o, a, None)
         # Any non-method or missing attribute or special callable method
         # that is not delegated or blocked
-        if delegated is None:
-            if delegated in dir(self.pvt_o):
-                return delegated
-            raise AttributeError(
-                "Object Wrapped('%s') has no attribute '%s'" % (self.cn, a)
+        try:
+            delegated = getattr(self.pvt_o, a)
+        except AttributeError:
+            raise LazyAttributeError(
+                "Object Wrapped('%s') has no attribute '%s'", self.cn, a
             )
         # If frozen, freeze all the way down
         if self.frozen:
@@ -350,26 +537,26 @@ cdef class Wrapped(Proxy):
             #   FROM the module by methods, classes are not
             # However module's __dict__ is still frozen
             if a == '__dict__' or not isinstance(self.pvt_o, types.ModuleType):
-                delegated = freeze(delegated)
+                delegated = self.freeze_child(delegated)
         return delegated
 
     cdef wrapped_check_setattr(self, a, val):
         if self.frozen:
             raise frozen_error
         if a in overridden_always or a in special_attributes:
-            raise ProtectionError('Cannot modify attribute: %s' % (a,))
+            raise LazyProtectionError('Cannot modify attribute: %s', a)
 
     cdef wrapped_check_delattr(self, a):
         if self.frozen:
             raise frozen_error
         if a in overridden_always or a in special_attributes:
-            raise ProtectionError('Cannot delete attribute: %s' % (a,))
+            raise LazyProtectionError('Cannot delete attribute: %s', a)
         if not hasattr(self.pvt_o, a) and a in self.__dir__():
-            raise ProtectionError('Cannot delete attribute: %s' % (a,))
+            raise LazyProtectionError('Cannot delete attribute: %s', a)
 
     cdef wrapped_dir(self):
         res_set = special_attributes
-        delegated = set(dir(self.pvt_o))
+        delegated = set(pvt_dir(self.pvt_o))
         res_set = res_set.union(delegated)
         res_set = res_set.difference(pickle_attributes)
         return list(res_set)
@@ -379,25 +566,63 @@ cdef class Wrapped(Proxy):
     # --------------------------------------------------------------------
 
     def __getattribute__(self, a):
-        return self.wrapped_getattr(a)
+        try:
+            x = self.wrapped_getattr(a)
+            if self.frozen and a in array_export_attributes:
+                x = self.array_export(a, x)
+        except:
+            if stats_enabled:
+                stats_incr('reads_denied', type(self).__name__)
+            raise
+        if stats_enabled:
+            stats_incr('reads', type(self).__name__)
+        return x
 
     def __setattr__(self, a, val):
         # Only checks and raises exceptions
-        self.wrapped_check_setattr(a, val)
+        try:
+            self.wrapped_check_setattr(a, val)
+        except:
+            if stats_enabled:
+                stats_incr('writes_denied', type(self).__name__)
+            raise
+        if stats_enabled:
+            stats_incr('writes', type(self).__name__)
         setattr(self.pvt_o, a, val)
 
     def __delattr__(self, a):
         # Only checks and raises exceptions
-        self.wrapped_check_delattr(a)
+        try:
+            self.wrapped_check_delattr(a)
+        except:
+            if stats_enabled:
+                stats_incr('deletes_denied', type(self).__name__)
+            raise
+        if stats_enabled:
+            stats_incr('deletes', type(self).__name__)
         delattr(self.pvt_o, a)
 
     def __dir__(self):
+        if stats_enabled:
+            stats_incr('dir', type(self).__name__)
         return self.wrapped_dir()
 
     def __richcmp__(self, other, int op):
         '''Use common method for all Wrapped objects'''
         return self.comparator(other, op)
 
+    def __sizeof__(self):
+        '''
+        Bytes used by wrapper - NOT including wrapped object
+        Counts protection data, partials, rules and caches - NOT shared
+        objects like the compiled regex for private attributes
+        '''
+        seen = set([id(self), id(self.pvt_o)])
+        n = object.__sizeof__(self)
+        for x in self.owned_parts():
+            n += owned_sizeof(x, seen)
+        return n
+
     # Needs to be class-specific
     # Depends on pvt_o being hashable
     def __hash__(self):
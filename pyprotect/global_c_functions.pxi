@@ -150,6 +150,209 @@ cdef get_immutables():
 # ------------------------------------------------------------------------
 
 
+cdef stats_incr(str counter, key=None):
+    '''
+    counter-->str: name of counter
+    key-->str or None: If not None, counter is a dict keyed by 'key'
+    Callers check stats_enabled BEFORE calling
+    '''
+    if key is None:
+        stats_data[counter] = stats_data.get(counter, 0) + 1
+    else:
+        d = stats_data.setdefault(counter, {})
+        d[key] = d.get(key, 0) + 1
+
+
+cdef slow_path(str event, a, o):
+    '''
+    event-->str: name of slow-path event
+    a-->str or None: attribute name
+    o-->object: wrapped object
+    Calls slow_path_hook(event, a, type(o))
+    Callers check slow_path_hook is not None BEFORE calling
+    Events raised while the hook is running are not reported
+    '''
+    global in_slow_path_hook
+    if in_slow_path_hook:
+        return
+    in_slow_path_hook = True
+    try:
+        slow_path_hook(event, a, type(o))
+    finally:
+        in_slow_path_hook = False
+
+
+cdef list pvt_dir(o, a=None):
+    '''
+    o-->object: wrapped object
+    a-->str or None: attribute name that needed dir(o)
+    Returns-->list: dir(o)
+    All calls to dir() on the WRAPPED object go through here
+    '''
+    if stats_enabled:
+        stats_incr('dir_wrapped')
+    if slow_path_hook is not None:
+        slow_path('dir', a, o)
+    return dir(o)
+
+
+cdef bint default_dir(o):
+    '''
+    o-->object
+    Returns-->bool: dir(o) depends ONLY on the instance __dict__ of 'o'
+        and the attributes of its class (of 'o' itself if 'o' is a class)
+    False if 'o' or its class customize __dir__
+    '''
+    t = type(o)
+    if isinstance(o, type):
+        return t.__dir__ is type.__dir__
+    if isinstance(o, types.ModuleType):
+        return (
+            t.__dir__ is types.ModuleType.__dir__ and
+            '__dir__' not in o.__dict__
+        )
+    return t.__dir__ is object.__dir__
+
+
+cdef int attr_kind(t, a):
+    '''
+    t-->type
+    a-->str: attribute name
+    Returns-->int: one of KIND_MISSING, KIND_DATA_DESCRIPTOR, KIND_METHOD,
+        KIND_DATA - for attribute 'a' found through the MRO of 't'
+    Cached per (type, name), keyed on version tag of 't' - changing 't'
+    or any of its bases changes the version tag
+    Never calls descriptors
+    '''
+    cdef unsigned int v = type_version(t)
+    k = (id(t), a)
+    if v != 0:
+        e = attr_kind_cache.get(k, None)
+        if e is not None and e[0] == v:
+            return e[1]
+    kind = KIND_MISSING
+    for b in t.__mro__:
+        d = b.__dict__
+        if a in d:
+            x = d[a]
+            if isinstance(x, (classmethod, staticmethod)):
+                kind = KIND_METHOD
+            elif (
+                hasattr(type(x), '__set__') or
+                hasattr(type(x), '__delete__')
+            ):
+                kind = KIND_DATA_DESCRIPTOR
+            elif callable(x):
+                kind = KIND_METHOD
+            else:
+                kind = KIND_DATA
+            break
+    if v != 0:
+        if len(attr_kind_cache) >= attr_kind_cache_max:
+            attr_kind_cache.clear()
+        attr_kind_cache[k] = (v, kind)
+    return kind
+
+
+cdef bint is_method(o, a):
+    '''
+    o-->object
+    a-->str: attribute name
+    Returns-->bool: attribute 'a' of 'o' is a method (callable)
+    Classified from the class attribute found through the MRO (see
+    attr_kind) or the value in the instance __dict__
+    Never calls properties or other descriptors on 'o'. Only falls back
+    to getattr() for attributes not found in class or instance __dict__
+    (e.g. provided by __getattr__)
+    '''
+    if isinstance(o, type):
+        # Attributes of a class - looked up in the class itself
+        kind = attr_kind(o, a)
+        if kind == KIND_DATA_DESCRIPTOR:
+            # Accessed on the class, e.g. property objects
+            kind = KIND_DATA
+    else:
+        kind = attr_kind(type(o), a)
+        if kind == KIND_DATA_DESCRIPTOR:
+            # Data descriptors (property, __slots__) take precedence
+            return False
+        d = instance_dict(o)
+        if d is not None and a in d:
+            return callable(d[a])
+    if kind == KIND_MISSING:
+        return callable(getattr(o, a, None))
+    return kind == KIND_METHOD
+
+
+cdef bint has_attr(o, a):
+    '''
+    o-->object
+    a-->str: attribute name
+    Returns-->bool: 'o' has attribute 'a'
+    Uses the class attribute found through the MRO (see attr_kind) or
+    the instance __dict__ - never calls properties or other descriptors.
+    Only falls back to hasattr() for attributes found in neither
+    (e.g. provided by __getattr__ or the metaclass)
+    '''
+    t = o if isinstance(o, type) else type(o)
+    if attr_kind(t, a) != KIND_MISSING:
+        return True
+    d = instance_dict(o)
+    if d is not None and a in d:
+        return True
+    return hasattr(o, a)
+
+
+# Held by wrappers but shared with other objects - never counted by
+# owned_sizeof: types, compiled regexes (re.compile() returns the same
+# pattern to every wrapper of a class) and strings (attribute names are
+# interned and shared with the wrapped object and its class)
+cdef tuple shared_types = (type, str, type(re.compile('')))
+
+
+cdef owned_sizeof(o, set seen):
+    '''
+    o-->object: held by a wrapper
+    seen-->set of int: ids already counted - updated
+    Returns-->int: bytes used by 'o' and the containers / internal
+        objects it holds that are not in 'seen'
+    Does not descend into any other object - never counts shared_types
+    '''
+    if o is None or id(o) in seen or isinstance(o, shared_types):
+        return 0
+    seen.add(id(o))
+    n = sys.getsizeof(o)
+    if isinstance(o, __HiddenPartial):
+        n += owned_sizeof((<__HiddenPartial>o).args, seen)
+        n += owned_sizeof((<__HiddenPartial>o).kwargs, seen)
+    elif isinstance(o, __ProtectionData):
+        n += owned_sizeof((<__ProtectionData>o).attributes_map, seen)
+    elif type(o) is dict:
+        for v in (<dict>o).values():
+            n += owned_sizeof(v, seen)
+    elif type(o) in (list, tuple):
+        for v in o:
+            n += owned_sizeof(v, seen)
+    return n
+
+
+cdef policy_key(Wrapped w):
+    '''
+    w-->Wrapped
+    Returns-->str: describes wrapping policy of 'w' - used in memory_report
+    '''
+    if not isinstance(w, Protected):
+        return type(w).__name__
+    kwargs = dict(w.rules.get('kwargs', {}))
+    l = []
+    for k in sorted(kwargs):
+        v = kwargs[k]
+        if isinstance(v, (list, tuple, set, frozenset)):
+            v = sorted([str(x) for x in v])
+        l.append('%s=%r' % (k, v))
+    return '%s(%s)' % (type(w).__name__, ', '.join(l))
+
+
 cdef protected_rules_from_kwargs(kwargs):
     '''
     kwargs-->dict
@@ -206,8 +409,15 @@ cdef protected_rules_from_kwargs(kwargs):
         'ro_method': bool(ro_method),
         'ro_data': bool(ro_data),
     }
-    d['dynamic'] = kwargs.get('dynamic', False)
+    dynamic = kwargs.get('dynamic', False)
+    if dynamic != 'auto':
+        dynamic = bool(dynamic)
+    d['dynamic'] = dynamic
     d['frozen'] = bool(kwargs.get('frozen', False))
+    if 'view' in kwargs:
+        d['view'] = frozenset(kwargs['view'])
+    if kwargs.get('cow', False):
+        d['cow'] = True
     d['kwargs'] = kwargs
 
     d['attr_type_check'] = False
@@ -217,6 +427,73 @@ cdef protected_rules_from_kwargs(kwargs):
 
     return d
 
+cdef bint rules_allow(dict d, o, a, op, bint frozen, int method):
+    '''
+    d-->dict: returned by protected_rules_from_kwargs
+    o-->object: wrapped object - only used if method < 0
+    a-->str: attribute name
+    op-->str: one of ('r', 'w')
+    frozen-->bool
+    method-->int: 1 if 'a' is a method, 0 if data, -1 to use is_method(o, a)
+    Returns-->bool: protect() rules in 'd' allow 'op' on 'a'
+    Does NOT hide private mangled attributes - see Wrapped.attr_hidden
+    Used by Protected.check_1_op() and protect_class()
+    '''
+    attr_type_check = bool(d.get('attr_type_check', False))
+    ro_method = bool(d.get('ro_method', False))
+    ro_data = bool(d.get('ro_data', False))
+    hide_private = bool(d.get('hide_private', False))
+
+    if op == 'r':
+        # special_attributes always visible
+        if a in special_attributes:
+            return True
+        # always_frozen are .... always frozen
+        if a in always_frozen:
+            return True
+
+        if hide_private and ro_private_attr.match(a):
+            return False
+        if (
+            'hide_regex' in d and
+            d['hide_regex'].pattern and
+            d['hide_regex'].match(a)
+        ):
+            return False
+    elif op == 'w':
+        if frozen:
+            return False
+        # special_attributes never writeable
+        if a in special_attributes:
+            return False
+        if ro_private_attr.match(a):
+            return False
+        # rw overrides ro_*
+        if (
+            'rw_regex' in d and
+            d['rw_regex'].pattern and
+            d['rw_regex'].match(a)
+        ):
+            return True
+        if (
+            'ro_regex' in d and
+            d['ro_regex'].pattern and
+            d['ro_regex'].match(a)
+        ):
+            return False
+
+    if attr_type_check is True:
+        if op == 'w' and (ro_method or ro_data):
+            if method < 0:
+                method = is_method(o, a)
+            bMethod = bool(method)
+            if ro_method:
+                return not bMethod
+            elif ro_data:
+                return bMethod
+    return True
+
+
 cdef protected_merge_kwargs(kw1: dict, kw2: dict):
     '''
     Merges kw1 and kw2 to return dict with most restrictive options
@@ -228,14 +505,24 @@ cdef protected_merge_kwargs(kw1: dict, kw2: dict):
     d = {}
     # Permissive bool options - must be 'and-ed'
     # dynamic defaults to True while add defaults to False
+    # dynamic='auto' is as safe as dynamic=True
     a = 'dynamic'
-    d[a] = (kw1.get(a, True) and kw2.get(a, True))
+    (v1, v2) = (kw1.get(a, True), kw2.get(a, True))
+    if not (v1 and v2):
+        d[a] = False
+    elif 'auto' in (v1, v2):
+        d[a] = 'auto'
+    else:
+        d[a] = True
 
     # Restrictive bool options must be 'or-ed'
     for a in (
         'frozen', 'hide_private', 'ro_data', 'ro_method',
     ):
         d[a] = (kw1.get(a, False) or kw2.get(a, False))
+    # Writes never reaching the wrapped object is restrictive - 'or-ed'
+    if kw1.get('cow', False) or kw2.get('cow', False):
+        d['cow'] = True
 
     # Restrictive lists (non-bool) are unioned
     for a in (
@@ -255,6 +542,11 @@ cdef protected_merge_kwargs(kw1: dict, kw2: dict):
         d[a] = list(
             s1.intersection(s2)
         )
+    # Names of view() are intersected - if present in either
+    a = 'view'
+    if a in kw1 or a in kw2:
+        l = [set(list(kw[a])) for kw in (kw1, kw2) if a in kw]
+        d[a] = list(set.intersection(*l))
     return d
 
 
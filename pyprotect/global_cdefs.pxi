@@ -1,4 +1,142 @@
 
+# C-API helpers used to validate caches cheaply
+# On PyPy type_version() always returns 0: caches are never trusted
+cdef extern from *:
+    """
+    static unsigned int pyprotect_type_version(PyObject *t)
+    {
+    #if defined(PYPY_VERSION)
+        return 0;
+    #else
+        /* Returns: version tag of type 't' - 0 if not available */
+        PyTypeObject *tp = (PyTypeObject *)t;
+    #if PY_VERSION_HEX >= 0x030C0000
+        if (tp->tp_version_tag == 0)
+            PyUnstable_Type_AssignVersionTag(tp);
+        return tp->tp_version_tag;
+    #else
+        if (!PyType_HasFeature(tp, Py_TPFLAGS_VALID_VERSION_TAG)) {
+            /* A successful MRO lookup assigns a version tag */
+            PyObject *name = PyUnicode_InternFromString("__dir__");
+            if (name == NULL) {
+                PyErr_Clear();
+                return 0;
+            }
+            (void)_PyType_Lookup(tp, name);
+            Py_DECREF(name);
+            if (!PyType_HasFeature(tp, Py_TPFLAGS_VALID_VERSION_TAG))
+                return 0;
+        }
+        return tp->tp_version_tag;
+    #endif
+    #endif
+    }
+
+    static PyObject *pyprotect_instance_dict(PyObject *o)
+    {
+        /* Returns: NEW reference to instance __dict__ of 'o' or None */
+        PyObject *d = NULL;
+    #if !defined(PYPY_VERSION)
+        if (!PyType_Check(o) && Py_TYPE(o)->tp_dictoffset != 0) {
+            d = PyObject_GenericGetDict(o, NULL);
+            if (d == NULL)
+                PyErr_Clear();
+        }
+    #endif
+        if (d == NULL) {
+            Py_INCREF(Py_None);
+            d = Py_None;
+        }
+        return d;
+    }
+
+    static PyObject *pyprotect_type_lookup(PyObject *t, PyObject *name)
+    {
+        /* Returns: NEW reference to attribute 'name' in the MRO of
+           type 't' or None - never raises. Uses the type method cache */
+        PyObject *x = NULL;
+    #if defined(PYPY_VERSION)
+        x = PyObject_GetAttr(t, name);
+        if (x == NULL)
+            PyErr_Clear();
+    #else
+        x = _PyType_Lookup((PyTypeObject *)t, name);
+        Py_XINCREF(x);
+    #endif
+        if (x == NULL) {
+            Py_INCREF(Py_None);
+            x = Py_None;
+        }
+        return x;
+    }
+
+    static int pyprotect_managed_dict(PyObject *t)
+    {
+        /* Returns: instances of type 't' have a managed __dict__ */
+    #if defined(Py_TPFLAGS_MANAGED_DICT) && !defined(PYPY_VERSION)
+        return PyType_HasFeature((PyTypeObject *)t, Py_TPFLAGS_MANAGED_DICT);
+    #else
+        return 0;
+    #endif
+    }
+
+    /* Dict and type watchers: Python 3.12+ (not PyPy) */
+    #if PY_VERSION_HEX >= 0x030C0000 && !defined(PYPY_VERSION)
+    #define PYPROTECT_HAVE_WATCHERS 1
+    #define PYPROTECT_DICT_EVENT_MODIFIED PyDict_EVENT_MODIFIED
+    #define PYPROTECT_DICT_EVENT_DEALLOCATED PyDict_EVENT_DEALLOCATED
+    static int pyprotect_add_dict_watcher(void *cb)
+    {
+        int i = PyDict_AddWatcher((PyDict_WatchCallback)cb);
+        if (i < 0)
+            PyErr_Clear();
+        return i;
+    }
+    static int pyprotect_add_type_watcher(void *cb)
+    {
+        int i = PyType_AddWatcher((PyType_WatchCallback)cb);
+        if (i < 0)
+            PyErr_Clear();
+        return i;
+    }
+    static int pyprotect_watch_dict(int i, PyObject *d)
+    {
+        if (PyDict_Watch(i, d) < 0) {
+            PyErr_Clear();
+            return -1;
+        }
+        return 0;
+    }
+    static int pyprotect_watch_type(int i, PyObject *t)
+    {
+        if (PyType_Watch(i, t) < 0) {
+            PyErr_Clear();
+            return -1;
+        }
+        return 0;
+    }
+    #else
+    #define PYPROTECT_HAVE_WATCHERS 0
+    #define PYPROTECT_DICT_EVENT_MODIFIED 1
+    #define PYPROTECT_DICT_EVENT_DEALLOCATED 5
+    static int pyprotect_add_dict_watcher(void *cb) { return -1; }
+    static int pyprotect_add_type_watcher(void *cb) { return -1; }
+    static int pyprotect_watch_dict(int i, PyObject *d) { return -1; }
+    static int pyprotect_watch_type(int i, PyObject *t) { return -1; }
+    #endif
+    """
+    unsigned int type_version "pyprotect_type_version"(object t)
+    object instance_dict "pyprotect_instance_dict"(object o)
+    bint managed_dict "pyprotect_managed_dict"(object t)
+    object type_lookup "pyprotect_type_lookup"(object t, object name)
+    bint HAVE_WATCHERS "PYPROTECT_HAVE_WATCHERS"
+    int DICT_EVENT_MODIFIED "PYPROTECT_DICT_EVENT_MODIFIED"
+    int DICT_EVENT_DEALLOCATED "PYPROTECT_DICT_EVENT_DEALLOCATED"
+    int add_dict_watcher "pyprotect_add_dict_watcher"(void *cb)
+    int add_type_watcher "pyprotect_add_type_watcher"(void *cb)
+    int watch_dict "pyprotect_watch_dict"(int i, object d)
+    int watch_type "pyprotect_watch_type"(int i, object t)
+
 cdef frozenset immutable_types_set
 cdef frozenset builtins_ids
 cdef frozenset builtin_module_immutable_attributes
@@ -6,6 +144,88 @@ cdef frozenset builtin_module_immutable_attributes
 # PROT_ATTR_NAME is set ONLY in get_protected_attr_name()
 cdef str PROT_ATTR_NAME = get_protected_attr_name()
 cdef Exception frozen_error = ProtectionError('Object is read-only')
+
+
+class LazyMessage(object):
+    '''
+    Mixin for exceptions created with (fmt: str, *values)
+    fmt and values are stored as BaseException.args - the message is
+    formatted only if str(), repr() or args is used
+    args returns (message,) - like an exception created with the
+    formatted message
+    '''
+    def __str__(self):
+        a = BaseException.args.__get__(self)
+        return a[0] % a[1:]
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, str(self))
+
+    def __reduce__(self):
+        # Pickle and copy the unformatted values
+        return (type(self), BaseException.args.__get__(self))
+
+    @property
+    def args(self):
+        return (str(self),)
+
+    @args.setter
+    def args(self, values):
+        BaseException.args.__set__(
+            self, ('%s', str(BaseException(*values)))
+        )
+
+
+class LazyAttributeError(LazyMessage, AttributeError):
+    '''
+    LazyAttributeError(fmt: str, *values)
+    Message is formatted only if it is used - probes like hasattr() and
+    getattr(o, a, default) never format it
+    '''
+
+
+class LazyProtectionError(LazyMessage, ProtectionError):
+    '''
+    LazyProtectionError(fmt: str, *values)
+    Message is formatted only if it is used
+    '''
+
+
+# Runtime statistics - see enable_stats(), stats(), reset_stats()
+# When stats_enabled is False, the ONLY cost is checking this flag
+cdef bint stats_enabled = False
+cdef dict stats_data = {}
+# Slow-path profiling hook - see set_slow_path_hook()
+# When slow_path_hook is None, the ONLY cost is checking for None
+cdef object slow_path_hook = None
+cdef bint in_slow_path_hook = False
+# isimmutable() reports hashing tuples / frozensets at least this long
+cdef Py_ssize_t slow_path_hash_len = 64
+# Dict / type watchers - see Watchers.pxi
+# watcher ids: -2: not yet registered; -1: not available
+cdef int dict_watcher_id = -2
+cdef int type_watcher_id = -2
+# id(watched dict or type)-->__WatchToken
+# Entries are removed when the dict or type is deallocated
+cdef dict watch_tokens = {}
+# Method / data classification of class attributes - see attr_kind()
+# (id(type), name)-->(type version tag, kind)
+cdef dict attr_kind_cache = {}
+cdef Py_ssize_t attr_kind_cache_max = 4096
+# path str-->__CompiledPath - see compile_path()
+cdef dict path_cache = {}
+cdef Py_ssize_t path_cache_max = 1024
+# (type, specialization_key())-->__Specialization - see specialize()
+cdef dict specializations = {}
+# Class generated by specialize()-->__Specialization
+cdef dict specialized_classes = {}
+# (class name, field names)-->record class - see seal()
+cdef dict sealed_classes = {}
+# Values of kind
+cdef int KIND_MISSING = 0
+cdef int KIND_DATA_DESCRIPTOR = 1
+cdef int KIND_METHOD = 2
+cdef int KIND_DATA = 3
 (
     immutable_types_set,
     builtin_module_immutable_attributes,
@@ -13,8 +233,13 @@ cdef Exception frozen_error = ProtectionError('Object is read-only')
 ) = get_immutables()
 cimport cython
 from cpython.object cimport (
+    PyObject,
     Py_LT, Py_EQ, Py_GT, Py_LE, Py_NE, Py_GE,
 )
+from cpython.buffer cimport (
+    PyObject_GetBuffer, PyBuffer_Release, PyBUF_WRITABLE,
+)
+from cpython.mem cimport PyMem_Malloc, PyMem_Free
 cdef object overridden_always = frozenset([
     '__getattribute__', '__delattr__', '__setattr__',
     '__hash__',
@@ -31,10 +256,26 @@ cdef object always_delegated = frozenset([
     '__weakref__',
     '__package__', 
 ])
+# Methods implemented by PrivacyDict
+cdef object privacydict_partials = frozenset([
+    '__getitem__', '__setitem__', '__delitem__',
+    '__str__', '__repr__',
+    'copy',
+    'iterkeys', 'iteritems', 'itervalues',
+    'viewkeys', 'viewitems', 'viewvalues',
+])
+cdef object privacydict_views = frozenset([
+    'keys', 'items', 'values', 'copy',
+])
 cdef object always_frozen = frozenset([
     '__dict__', '__slots__', '__class__',
     '__module__',
 ])
+# Array exports of frozen wrappers - __array_interface__ is made
+# read-only; the others would hand out the wrapped (writeable) data
+cdef object array_export_attributes = frozenset([
+    '__array_interface__', '__array_struct__', '__array__',
+])
 
 # Use compiled regex - no function call, no str operations
 # Python 2 str does not have isidentifier() method
@@ -70,6 +311,12 @@ cdef set m_block = set([
     'add', 'append', 'clear', 'discard', 'popitem', 'insert', 'pop',
     'remove', 'reverse', 'setdefault', 'sort', 'update',
 ])
+# Attributes that wrappers do not simply read from the wrapped object
+# View and get_path() read all other attributes directly
+cdef frozenset indirect_attributes = frozenset(m_block).union(
+    overridden_always, pickle_attributes, special_attributes,
+    always_delegated, always_frozen,
+)
 #
 
 cdef set m_numeric = set([
@@ -19,5 +19,13 @@ import types
 import functools
 import pydoc
 import math
+import operator
+import copy
+import array
+import weakref
+if PY2:
+    from thread import get_ident
+else:
+    from _thread import get_ident
 if PYPY and PY2:
     int = long
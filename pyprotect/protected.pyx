@@ -85,6 +85,40 @@ clutter the pydoc documentation for the module.
         - Features of Protected PLUS prevents modification of ANY attribute
         - Mutability: NO ATTRIBUTES can be changed or deleted
 
+    View: subclass of Protected
+        - Created by calling view(o, names, frozen=False) on an object 'o'
+        - ONLY attributes in 'names' can be visible
+        - Visible and writeable attributes are computed once at creation
+
+    FrozenView: subclass of View
+        - Created by calling view(o, names) on an object 'o'
+        - Features of View PLUS prevents modification of ANY attribute
+
+    Specialized, FrozenSpecialized: subclasses of Protected
+        - Created by protect() for types registered with specialize()
+        - Rules are evaluated once per (type, policy, name)
+
+    CopyOnWrite: subclass of Protected
+        - Created by calling protect(o, cow=True) on an object 'o'
+        - Writes go to an overlay - 'o' is never modified
+
+    FrozenCopyOnWrite: subclass of CopyOnWrite
+        - Created by calling freeze() on a CopyOnWrite
+        - Features of CopyOnWrite PLUS prevents modification of ANY attribute
+
+    DeepFrozen: subclass of Wrapped
+        - Created by calling freeze_deep(o)
+        - Attributes and items were frozen once, at creation
+
+    FrozenMap, FrozenVector: persistent collections - not wrappers
+        - Created by calling freeze(o, persistent=True) on a dict or list
+        - set(), delete(), append(), evolve() return a changed copy that
+          shares structure with the original
+
+    ArenaMapping, ArenaSequence: read-only views - not wrappers
+        - Created by calling freeze_arena(o) on a dict, list or tuple
+        - Nodes share one compact array-backed arena
+
     PrivacyDict: subclass of Private
         - Not created directly
 
@@ -97,7 +131,15 @@ Key methods in the module API:
 
 wrap(o: object) -> Wrapped:
 
-freeze(o: object) -> object:
+freeze(o: object, persistent: bool = False, depth: int = None,
+        skip_types: type | tuple = None) -> object:
+    - If 'persistent' is True and 'o' is a dict or list, returns
+      FrozenMap or FrozenVector
+    - If 'o' is an instance of a type in 'skip_types', returns 'o'
+      UNCHANGED. Values read are not frozen below 'depth' levels or if
+      of a type in 'skip_types'
+    - Frozen objects export the buffer of the wrapped object READ-ONLY
+      without copying
     - If 'o' is immutable (e.g. int , string), returns 'o' UNCHANGED
     - If 'o' is Wrapped, returns 'o' UNCHANGED if object WRAPPPED INSIDE
       'o' is immutable, returns Frozen otherwise
@@ -106,10 +148,21 @@ freeze(o: object) -> object:
       returns 'o' UNCHANGED
     - If 'o' is Private, returns FrozenPrivate
     - If 'o' is Protected, returns FrozenProtected
+    - If 'o' is View, returns FrozenView
     - Otherwise, returns Frozen
 
     Object returned prevents modification of ANY attribute
 
+freeze_deep(o: object) -> object:
+    - Visits the object graph of 'o' once, with a memo table keyed by
+      id() - shared and cyclic objects get ONE DeepFrozen wrapper, whose
+      attributes and items are frozen at creation
+
+freeze_arena(o: object) -> object:
+    - Flattens dicts, lists, tuples and scalars into ONE arena of arrays
+      with interned strings - returns an ArenaMapping or ArenaSequence
+      view of the root
+
 private(o: object, frozen: bool = False) -> object:
     - If 'frozen' is False:
         - If 'o' is an instance of Private, returns 'o' UNCHANGED
@@ -122,7 +175,7 @@ private(o: object, frozen: bool = False) -> object:
 
 protect(
     o: object,
-    frozen: bool = False, dynamic: bool = True,
+    frozen: bool = False, dynamic: object = True,
     hide_private: bool = False,
     ro_data: bool = False, ro_method: bool = True,
     ro=[], rw=[], hide=[],
@@ -131,12 +184,17 @@ protect(
     frozen: bool: No attribute can be modified
         PLUS: if 'o' is NOT a module, results returned by methods,
         including __call__ will be frozen
-    dynamic: bool: Attribute additions, deletions, type changes in wrapped
-        object are automatically considered by hide_private, ro_data,
-        ro_method, ro, rw, hide
+    dynamic: bool or 'auto': Attribute additions, deletions, type changes
+        in wrapped object are automatically considered by hide_private,
+        ro_data, ro_method, ro, rw, hide
         If dynamic is False, it is a pledge that attributes of wrapped
         object will not change, and visibility and mutability rules of
         WRAPPING object use a cache to make them faster.
+        If dynamic is 'auto', rules use a cache that is checked on each
+        access against the class, class version tag and instance
+        __dict__ of the wrapped object, and rebuilt only when they
+        change. Objects whose changes cannot be detected this way
+        (custom __dir__, PyPy) are handled as if dynamic is True
         Rules imposed by Private() are always dynamic
     hide_private: bool: Private vars (_var) will be hidden
     ro_data: bool: Data attributes cannot be deleted or assigned to
@@ -169,6 +227,23 @@ protect(
             - No previously hidden attribute will become visible
             - No previously read-only attribute will become mutable
 
+protect_class(cls: type, **kwargs) -> type:
+    - Same keyword arguments as protect() except 'dynamic'
+    - Returns a subclass of 'cls' whose INSTANCES apply the rules of
+      protect() to code outside the class, without a wrapper:
+      hidden attributes are data descriptors in the returned class,
+      writes are checked in __setattr__ / __delattr__
+    - @protected(**kwargs) is the decorator form
+
+seal(o: object) -> object:
+    - Returns an immutable tuple-backed record with a snapshot of the
+      visible DATA attributes of 'o' - methods are not in the record
+
+protect(o, cow=True) -> CopyOnWrite:
+    - Writes allowed by the rules go to an overlay held by the wrapper -
+      'o' is never modified. Mutable values read are copied on first
+      write. cow_diff(w) returns the overlay
+
 
 Calling wrap operations multiple times
 ======================================
@@ -260,7 +335,7 @@ Will wrapper detect attributes deleted, added or changed at RUN-TIME?
 wrap / freeze / private: YES !
 
 protect:
-    If 'dynamic' is True (default): YES !
+    If 'dynamic' is True (default) or 'auto': YES !
 
     If 'dynamic' is False, dir(wrapped_object) will not
     accurately reflect attributes added or deleted at run-time
@@ -383,9 +458,19 @@ include "python_visible.pxi"
 include "global_cdefs.pxi"
 include "global_c_functions.pxi"
 include "ProtectionData.pxi"
+include "Watchers.pxi"
+include "Paths.pxi"
 include "Proxy.pxi"
 include "Wrapped_Frozen.pxi"
 include "PrivacyDict_FrozenPrivacyDict.pxi"
 include "Private_FrozenPrivate.pxi"
 include "Protected_FrozenProtected.pxi"
+include "View_FrozenView.pxi"
+include "Specialized_FrozenSpecialized.pxi"
+include "CopyOnWrite_FrozenCopyOnWrite.pxi"
+include "Sealed.pxi"
+include "Persistent.pxi"
+include "DeepFrozen.pxi"
+include "Arena.pxi"
+include "ClassProtection.pxi"
 include "HiddenPartial.pxi"
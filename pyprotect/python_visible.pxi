@@ -127,6 +127,12 @@ def isimmutable(o: object) -> bool:
         # Although 'tuple' is immutable in python, for our purposes, 'tuple' does
         # NOT prevent modification to MEMBERS of the tuple that may be mutable
         # Hence, check if 'o' has a stable hash - python hash() does this for us
+        if (
+            slow_path_hook is not None and
+            isinstance(o, (tuple, frozenset)) and
+            len(o) >= slow_path_hash_len
+        ):
+            slow_path('immutable_hash', None, o)
         try:
             hash(o)
             return True
@@ -145,11 +151,20 @@ def iswrapped(o: object) -> bool:
 
 def isfrozen(o: object) -> bool:
     '''
-    isfrozen(o: object) -> bool: 'o' was created using freeze()
+    isfrozen(o: object) -> bool: 'o' was created using freeze(), seal() or
+    freeze_arena() or is an instance of a class returned by
+    protect_class(frozen=True)
     '''
-    return isinstance(o, (
+    if isinstance(o, (
         Frozen, FrozenPrivate, FrozenPrivacyDict, FrozenProtected,
-    ))
+        FrozenView, FrozenSpecialized, FrozenCopyOnWrite,
+        FrozenMap, FrozenVector, DeepFrozen, ArenaMapping, ArenaSequence,
+    )):
+        return True
+    if is_sealed(o):
+        return True
+    p = class_policy(o)
+    return p is not None and p.frozen
 
 
 def isprivate(o: object) -> bool:
@@ -165,11 +180,14 @@ def isprivate(o: object) -> bool:
 def isprotected(o: object) -> bool:
     '''
     isprotected(o: object) -> bool: 'o' was created using protect()
+    or is an instance of a class returned by protect_class()
     '''
-    return isinstance(o, (
+    if isinstance(o, (
         Protected,
         FrozenProtected,
-    ))
+    )):
+        return True
+    return class_policy(o) is not None
 
 
 def isreadonly(o: object, a: str) -> bool:
@@ -180,16 +198,20 @@ def isreadonly(o: object, a: str) -> bool:
     This represents RULE of wrapped object - does not guarantee
     that WRAPPED OBJECT has attribute 'a' or that setting attribute
     'a' in object 'o' will not raise any exception
+    Answered from the rules of 'o' - never reads attribute 'a'
+    For an instance of a class returned by protect_class(), answers
+    for code outside the class
     '''
-    try:
-        if isimmutable(o):
+    if isinstance(o, Wrapped):
+        if isfrozen(o):
             return True
-    except:
-        pass
-    if isprivate(o) or isprotected(o):
-        return not getattr(o, PROT_ATTR_NAME).testop(a, 'w')
-    else:
+        if isinstance(o, Private):
+            return not (<Wrapped>o).testop(a, 'w')
         return False
+    p = class_policy(o)
+    if p is not None:
+        return not p.writeable(None, a)
+    return isimmutable(o)
 
 
 def isvisible(o: object, a: str) -> bool:
@@ -202,10 +224,92 @@ def isvisible(o: object, a: str) -> bool:
     'a' in object 'o' will not raise any exception
 
     If 'o' is not a wrapped object, unconditionally returns False
+    Answered from the rules of 'o' - never reads attribute 'a'
+    For an instance of a class returned by protect_class(), answers
+    for code outside the class
     '''
-    if not iswrapped(o):
+    if not isinstance(o, Wrapped):
+        p = class_policy(o)
+        if p is not None:
+            return p.visible(a)
         return False
-    return getattr(o, PROT_ATTR_NAME).testop(a, 'r')
+    return (<Wrapped>o).testop(a, 'r')
+
+
+def acl(w: object, names: object = None) -> tuple:
+    '''
+    acl(w: object, names: object = None) -> tuple:
+    w: wrapped object
+    names: iterable of str or None: attribute names to check
+        None: all names in dir() of wrapped object and the special
+            attributes of wrappers
+    Returns-->tuple of 2 frozensets: (visible, writeable)
+        visible: names 'a' for which isvisible(w, a) is True
+        writeable: names 'a' for which isreadonly(w, a) is False
+    Evaluates the rules of 'w' for ALL names in one pass, against ONE
+    snapshot of dir() of the wrapped object - much faster than calling
+    isvisible() and isreadonly() for each name. Never reads attributes
+    '''
+    if not isinstance(w, Wrapped):
+        raise TypeError('Not a wrapped object: %s' % (type(w),))
+    return (<Wrapped>w).acl(names)
+
+
+def getattrs(w: object, names: object) -> tuple:
+    '''
+    getattrs(w: object, names: object) -> tuple:
+    w: wrapped object
+    names: iterable of str: attribute names
+    Returns-->tuple: same as tuple(getattr(w, a) for a in names)
+    Raises the same exception as getattr(w, a) for the first name
+    that cannot be read
+    Names are checked against ONE snapshot of dir() of the wrapped
+    object, without a Python-level call per attribute
+    '''
+    if not isinstance(w, Wrapped):
+        raise TypeError('Not a wrapped object: %s' % (type(w),))
+    return (<Wrapped>w).getattrs(names)
+
+
+def setattrs(w: object, mapping: dict) -> None:
+    '''
+    setattrs(w: object, mapping: dict) -> None:
+    w: wrapped object
+    mapping: dict: attribute name-->value
+    Same as setattr(w, a, v) for (a, v) in mapping.items(), except that
+    ALL attributes are checked before ANY attribute is set - if any
+    attribute cannot be set, raises the same exception as setattr()
+    and no attribute is set
+    '''
+    if not isinstance(w, Wrapped):
+        raise TypeError('Not a wrapped object: %s' % (type(w),))
+    (<Wrapped>w).setattrs(mapping)
+
+
+def compile_path(path: str) -> object:
+    '''
+    compile_path(path: str) -> object:
+    path: str: attribute names separated by '.' and integer or quoted
+        string subscripts - e.g. "a.b.c[3].d" or "a['key'].b"
+    Returns-->object: compiled path for get_path()
+    Raises ValueError if path is invalid
+    '''
+    return compiled_path(path)
+
+
+def get_path(o: object, path: object) -> object:
+    '''
+    get_path(o: object, path: object) -> object:
+    o: object - wrapped or not
+    path: str or object returned by compile_path()
+    Returns-->object: same as evaluating the path on 'o' - for example
+        get_path(o, 'a.b[3].c') is the same as o.a.b[3].c
+    Visibility rules of each wrapper on the path are applied, and the
+    result is frozen if o.a.b[3].c would be, but intermediate values
+    are read directly - without creating a Frozen for each of them
+    Raises the same exception as evaluating the path on 'o'
+    '''
+    return walk_path(o, compiled_path(path))
 
 
 # ------------------------------------------------------------------------
@@ -236,26 +340,119 @@ def wrap(o: object) -> object:
     return Wrapped(o, frozen=False)
 
 
-def freeze(o: object) -> object:
+def freeze(
+    o: object,
+    persistent: bool = False,
+    depth: int = None,
+    skip_types: object = None,
+) -> object:
     '''
-    freeze(o: object) -> object:
+    freeze(o: object, persistent: bool = False, depth: int = None,
+        skip_types: type | tuple = None) -> object:
     Returns: Instance of Frozen | FrozenPrivacyDict | FrozenPrivate |
         FrozenProtected, depending on what 'o' is
-
-    Object returned prevents modification of ANY attribute
+    persistent: bool: If True, a dict is returned as FrozenMap and a
+        list as FrozenVector - persistent collections whose set(),
+        delete(), append() and evolve() return a changed copy sharing
+        structure with the original. Values are frozen
+    depth: int >= 1: Number of levels frozen - 1 freezes only 'o';
+        values read at deeper levels are returned as-is. Default: all
+    skip_types: type or tuple of types: Values of these types are
+        trusted and returned as-is, including 'o' itself
+
+    Object returned prevents modification of ANY attribute and exports
+    the buffer of 'o' read-only
+    depth and skip_types are kept by the wrapper returned and by the
+    wrappers returned from reading it. They do not change an object that
+    is already frozen and are not used with persistent=True
     '''
+    opts = None
+    if depth is not None or skip_types is not None:
+        if depth is not None:
+            depth = operator.index(depth)
+            if depth < 1:
+                raise ValueError('depth must be >= 1: %d' % (depth,))
+        if skip_types is None:
+            skip_types = ()
+        elif not isinstance(skip_types, tuple):
+            skip_types = (skip_types,)
+        for t in skip_types:
+            if not isinstance(t, type):
+                raise TypeError('skip_types must be types: %r' % (t,))
+        if (
+            skip_types and
+            not isinstance(o, Wrapped) and
+            isinstance(o, skip_types)
+        ):
+            if stats_enabled:
+                stats_incr('freeze_unchanged')
+            return o
+        opts = (-1 if depth is None else depth - 1, skip_types)
+    if persistent:
+        x = persistent_freeze(o)
+        if x is not None:
+            if stats_enabled:
+                stats_incr('freeze_allocated')
+            return x
     if isfrozen(o):
         # Never freeze twice
+        if stats_enabled:
+            stats_incr('freeze_unchanged')
         return o
     elif isimmutable(o):
         # Object is KNOWN to be immutable - return as-is
+        if stats_enabled:
+            stats_incr('freeze_unchanged')
         return o
     # Must freeze
+    if stats_enabled:
+        stats_incr('freeze_allocated')
 
     # If Wrapped, avoid double wrapping
     if iswrapped(o):
-        return getattr(o, PROT_ATTR_NAME).freeze()
-    return Frozen(o)
+        x = getattr(o, PROT_ATTR_NAME).freeze()
+    else:
+        x = Frozen(o)
+    if opts is not None and isinstance(x, Proxy):
+        (<Proxy>x).freeze_opts = opts
+    return x
+
+
+def freeze_deep(o: object) -> object:
+    '''
+    freeze_deep(o: object) -> object:
+    Returns: frozen graph of 'o' - DeepFrozen for containers (dict,
+        list, tuple, set, frozenset) and objects with __dict__ or
+        __slots__; same as freeze() for other objects
+
+    Visits the object graph ONCE - attributes, items and iterated
+    values of every DeepFrozen are frozen at creation, so reading them
+    needs no freeze(). An object reached by more than one path, or by a
+    cycle, gets ONE wrapper. Wrapped objects are frozen with freeze()
+    and not visited - their rules are kept. Later changes to attributes
+    and items of the visited objects are not seen
+    '''
+    return deep_freeze(o)
+
+
+def freeze_arena(o: object) -> object:
+    '''
+    freeze_arena(o: object) -> object:
+    Returns: ArenaMapping if 'o' is a dict, ArenaSequence if 'o' is a list
+        or tuple; 'o' if immutable
+
+    Flattens the dicts, lists and tuples reachable from 'o' into ONE
+    arena: values are 64-bit words in an array, strings are stored once,
+    and dicts with the same keys share one key index. Views of the
+    nodes are created on read and are read-only. Values must be dicts,
+    lists, tuples, str, int, float, bool, None or immutable objects -
+    TypeError is raised otherwise. Shared containers are stored once.
+    Later changes to 'o' are not seen
+    '''
+    x = arena_freeze(o)
+    if x is not o and stats_enabled:
+        stats_incr('freeze_allocated')
+    return x
 
 
 def private(o: object, frozen: bool = False) -> object:
@@ -293,30 +490,35 @@ def private(o: object, frozen: bool = False) -> object:
 
 def protect(
     o: object,
-    frozen: bool = False, dynamic: bool = True,
+    frozen: bool = False, dynamic: object = True,
     hide_private: bool = False,
     ro_data: bool = False, ro_method: bool = True,
-    ro=[], rw=[], hide=[],
+    ro=[], rw=[], hide=[], cow: bool = False,
 ):
     '''
     protect(
         o: object,
-        frozen: bool = False, dynamic: bool = True,
+        frozen: bool = False, dynamic: object = True,
         hide_private: bool = False,
         ro_data: bool = False, ro_method: bool = True,
-        ro=[], rw=[], hide=[],
+        ro=[], rw=[], hide=[], cow: bool = False,
     ):
 
     o: object to be wrapped
     frozen: bool: No attribute can be modified
         PLUS: if 'o' is NOT a module, results returned by methods,
         including __call__ will be frozen
-    dynamic: bool: Attribute additions, deletions, type changes in wrapped
-        object are automatically considered by hide_private, ro_data,
-        ro_method, ro, rw, hide
+    dynamic: bool or 'auto': Attribute additions, deletions, type changes
+        in wrapped object are automatically considered by hide_private,
+        ro_data, ro_method, ro, rw, hide
         If dynamic is False, it is a pledge that attributes of wrapped
         object will not change, and visibility and mutability rules of
         WRAPPING object use a cache to make them faster.
+        If dynamic is 'auto', rules use a cache that is checked on each
+        access against the class, class version tag and instance
+        __dict__ of the wrapped object, and rebuilt only when they
+        change. Objects whose changes cannot be detected this way
+        (custom __dir__, PyPy) are handled as if dynamic is True
         Rules imposed by Private() are always dynamic
     hide_private: bool: Private vars (_var) will be hidden
     ro_data: bool: Data attributes cannot be deleted or assigned to
@@ -325,8 +527,14 @@ def protect(
     rw: list of str: attributes that will be read-write
         Overrides 'ro_*'
     hide: list of str: attributes that will be hidden
+    cow: bool: Copy-on-write - writes allowed by the rules go to an
+        overlay held by the wrapper and never modify 'o'. Mutable values
+        read, including results of methods, are copied on first write.
+        See cow_diff(). Ignored if frozen. 'o' cannot be a list, dict,
+        set or bytearray
 
-    Returns-->Instance of FrozenProtected if frozen; Protected otherwise
+    Returns-->Instance of FrozenProtected if frozen; CopyOnWrite if cow;
+        Protected otherwise
 
     Protected:
         Features of Private PLUS additional restrictions on:
@@ -359,6 +567,8 @@ def protect(
         'hide': hide,
         'dynamic': dynamic,
     }
+    if cow:
+        kwargs['cow'] = True
 
     # Avoid double-wrapping
     if isprotected(o):
@@ -376,15 +586,243 @@ def protect(
     if want_frozen and not isfrozen(o):
         # Frozen objects remain frozen
         rules['frozen'] = True
+    if rules.get('cow', False) and not want_frozen:
+        if isinstance(o, CopyOnWrite):
+            return (<CopyOnWrite>o).cow_rewrap(rules)
+        if iswrapped(o):
+            return CopyOnWrite((<Wrapped>o).pvt_o, rules)
+        return CopyOnWrite(o, rules)
     if iswrapped(o):
         return getattr(o, PROT_ATTR_NAME).protect(rules)
     else:
+        if specializations:
+            c = specialized_class(o, kwargs, want_frozen)
+            if c is not None:
+                return c(o, rules)
         if want_frozen:
             return FrozenProtected(o, rules)
         else:
             return Protected(o, rules)
 
 
+def view(o: object, names: object, frozen: bool = True) -> object:
+    '''
+    view(o: object, names: object, frozen: bool = True) -> object:
+    o: object to be wrapped
+    names: iterable of str: ONLY these attributes can be visible
+    frozen: bool: No attribute can be modified
+
+    Returns-->Instance of FrozenView if frozen; View otherwise
+
+    View: subclass of Protected
+        - Visible and writeable attributes are decided ONCE, at creation,
+          by applying rules of Private to each name in 'names'
+        - dir() is constant - the visible names
+        - Reading a visible attribute is one set lookup - dir(o) is
+          never called
+        - Cheap to create - cost depends only on len(names)
+        - Cannot add or delete attributes
+
+    If 'o' is a Protected object, rules of 'o' are also applied and
+    names are intersected with names of 'o' if 'o' is a View
+    protect() on a View returns a View
+    '''
+    if isinstance(names, str):
+        names = (names,)
+    names = list(names)
+    frozen = bool(frozen) or isfrozen(o)
+    if isprotected(o):
+        kwargs = protected_merge_kwargs(
+            getattr(o, PROT_ATTR_NAME).rules.get('kwargs', {}),
+            {'view': names, 'frozen': frozen},
+        )
+        rules = dict(protected_rules_from_kwargs(kwargs))
+    else:
+        rules = {
+            'view': frozenset(names),
+            'frozen': frozen,
+            'kwargs': {'view': names, 'frozen': frozen},
+        }
+    if iswrapped(o):
+        o = (<Wrapped>o).pvt_o
+    if rules['frozen']:
+        return FrozenView(o, rules)
+    return View(o, rules)
+
+
+def seal(o: object) -> object:
+    '''
+    seal(o: object) -> object:
+    o: object - wrapped or not
+
+    Returns-->Sealed record: immutable snapshot of the visible DATA
+        attributes of 'o'
+
+    - Visible attributes are those of 'o' if 'o' is wrapped, those of
+      private(o) otherwise
+    - Values are read ONCE (properties are evaluated) and frozen
+    - The record is a tuple subclass generated per (class name, fields)
+      - each field is a property reading one index, so reads run at
+      native speed and take no memory per record beyond the tuple
+    - Methods of 'o' are NOT in the record and cannot be called through
+      it - nor can attributes whose names start with '__' or that are
+      attributes of the record itself (_asdict, _fields, _index, count,
+      index)
+    - Callable on the record: _asdict() and the methods of tuple
+    - The record cannot be modified or pickled. isfrozen() and
+      isimmutable() are True, freeze() and seal() return it unchanged
+    '''
+    if is_sealed(o):
+        return o
+    return seal_object(o)
+
+
+def specialize(t: type, policy: dict = None) -> type:
+    '''
+    specialize(t: type, policy: dict = None) -> type:
+    t: class of objects that will be wrapped with protect()
+    policy: dict: keyword arguments of protect() - 'frozen', 'dynamic',
+        'hide_private', 'ro_data', 'ro_method', 'ro', 'rw', 'hide'
+
+    Returns-->type: wrapper class generated for 't' and 'policy' -
+        subclass of Protected (of FrozenProtected if frozen)
+
+    Registers a wrapper class with an attribute table computed ONCE
+    for attributes of class 't' under 'policy'. protect(o, **policy)
+    returns an instance of the generated class when type(o) is EXACTLY
+    't' - reading attributes of the class is one set lookup plus
+    getattr() instead of evaluating the policy on every access.
+    Instance attributes and attributes whose writeability depends on
+    being a method or data use the generic path of protect().
+    Wrapped objects behave exactly as with protect() without
+    specialize() - 'dynamic' is honored for names not in the table.
+    Calling specialize() again with the same 't' and policy returns
+    the same class
+    '''
+    if policy is None:
+        policy = {}
+    unknown = set(policy).difference(specialize_keywords)
+    if unknown:
+        raise TypeError('Unknown protect() arguments: %s' % (
+            ', '.join(sorted([str(x) for x in unknown])),
+        ))
+    if issubclass(t, (type, types.ModuleType)) or issubclass(t, Wrapped):
+        raise TypeError('Cannot specialize: %s' % (t,))
+    # Same defaults as protect()
+    kwargs = {
+        'frozen': False,
+        'hide_private': False,
+        'ro_data': False,
+        'ro_method': True,
+        'ro': [],
+        'rw': [],
+        'hide': [],
+        'dynamic': True,
+    }
+    kwargs.update(policy)
+    k = (t, specialization_key(kwargs, bool(kwargs.get('frozen', False))))
+    spec = specializations.get(k, None)
+    if spec is None:
+        spec = build_specialization(t, kwargs)
+        specializations[k] = spec
+        specialized_classes[(<__Specialization>spec).cls] = spec
+    return (<__Specialization>spec).cls
+
+
+def protect_class(
+    cls: type,
+    frozen: bool = False,
+    hide_private: bool = False,
+    ro_data: bool = False, ro_method: bool = True,
+    ro=[], rw=[], hide=[],
+) -> type:
+    '''
+    protect_class(
+        cls: type,
+        frozen: bool = False,
+        hide_private: bool = False,
+        ro_data: bool = False, ro_method: bool = True,
+        ro=[], rw=[], hide=[],
+    ) -> type:
+
+    cls: class to be protected
+    Other arguments: same as protect()
+
+    Returns-->type: subclass of 'cls' with the same name whose INSTANCES
+    apply the rules of protect() to code OUTSIDE the class - no wrapper
+    is created per instance:
+        - Reading a visible attribute runs at native speed
+        - Hidden attributes are replaced by data descriptors in the
+          returned class - code outside the class gets AttributeError
+        - Setting and deleting attributes is checked in __setattr__
+          and __delattr__ of the returned class
+        - dir() and __dir__ of instances do not show hidden attributes
+        - __dict__ of instances is a FrozenPrivacyDict without hidden
+          items for code outside the class
+
+    Code INSIDE the class - functions defined in the class body of 'cls',
+    its bases and subclasses (including nested functions, lambdas,
+    comprehensions and property functions) - is not restricted, like
+    methods of an object wrapped with protect(). frozen=True therefore
+    allows __init__ and other methods to set attributes, but not code
+    outside the class.
+
+    Unlike protect():
+        - Values read are not frozen, and results of methods are not
+          frozen even if frozen is True
+        - Class attributes are not protected - only instances
+        - object.__setattr__(), object.__delattr__() and
+          object.__getattribute__() bypass the rules
+        - Copying or unpickling instances needs __setstate__ defined
+          in the class body
+
+    isprotected(), isfrozen(), isvisible() and isreadonly() report the
+    rules for instances; iswrapped() is False.
+    If 'cls' was returned by protect_class(), rules are merged as in
+    protect()
+    '''
+    kwargs = {
+        'frozen': frozen,
+        'hide_private': hide_private,
+        'ro_data': ro_data,
+        'ro_method': ro_method,
+        'ro': ro,
+        'rw': rw,
+        'hide': hide,
+    }
+    return make_protected_class(cls, kwargs)
+
+
+def protected(
+    cls: type = None,
+    frozen: bool = False,
+    hide_private: bool = False,
+    ro_data: bool = False, ro_method: bool = True,
+    ro=[], rw=[], hide=[],
+) -> object:
+    '''
+    protected(
+        cls: type = None,
+        frozen: bool = False,
+        hide_private: bool = False,
+        ro_data: bool = False, ro_method: bool = True,
+        ro=[], rw=[], hide=[],
+    ) -> object:
+    Class decorator - see protect_class()
+
+    Use as @protected or @protected(frozen=True, hide=['x'], ...)
+    '''
+    def _decorate(c):
+        return protect_class(
+            c, frozen=frozen, hide_private=hide_private,
+            ro_data=ro_data, ro_method=ro_method, ro=ro, rw=rw, hide=hide,
+        )
+
+    if cls is None:
+        return _decorate
+    return _decorate(cls)
+
+
 # ------------------------------------------------------------------------
 # Other python-accesssible attributes
 # ------------------------------------------------------------------------
@@ -427,6 +865,215 @@ def immutable_builtin_attributes():
     '''
     return builtin_module_immutable_attributes
 
+
+# ------------------------------------------------------------------------
+# Runtime statistics and profiling
+# ------------------------------------------------------------------------
+
+def memory_report() -> dict:
+    '''
+    memory_report() -> dict: memory used by live wrappers
+    Walks all objects tracked by the garbage collector
+    Returns-->dict:
+        total: dict: count-->int, bytes-->int
+        by_class: dict: wrapper class name-->dict(count, bytes)
+        by_policy: dict: str describing class and protect() options-->
+            dict(count, bytes)
+        shared: dict: count-->int, bytes-->int - compiled regexes shared
+            by wrappers, each counted once
+    bytes is sys.getsizeof(wrapper) - NOT including wrapped objects
+    sys.getsizeof(wrapper) counts the protection data, partials, rules,
+    ACL cache and cached dir() output held by the wrapper. It does not
+    count Cython-internal closure objects, so it is a lower bound.
+    '''
+    import gc
+    total = {'count': 0, 'bytes': 0}
+    by_class = {}
+    by_policy = {}
+    shared = {}
+    for x in gc.get_objects():
+        if not isinstance(x, Wrapped):
+            continue
+        r = (<Wrapped>x).hidden_private_attr
+        if r is not None:
+            shared[id(r)] = sys.getsizeof(r)
+        n = sys.getsizeof(x)
+        for (d, k) in (
+            (by_class, type(x).__name__),
+            (by_policy, policy_key(x)),
+        ):
+            e = d.setdefault(k, {'count': 0, 'bytes': 0})
+            e['count'] += 1
+            e['bytes'] += n
+        total['count'] += 1
+        total['bytes'] += n
+    return {
+        'total': total,
+        'by_class': by_class,
+        'by_policy': by_policy,
+        'shared': {'count': len(shared), 'bytes': sum(shared.values())},
+    }
+
+
+def record_access(w: object, enable: bool = True) -> bool:
+    '''
+    record_access(w: object, enable: bool = True) -> bool:
+    Start (or stop if enable is False) recording attribute accesses
+    through 'w'
+    w: object returned by protect()
+    Starting discards any previous recording of 'w'
+    Stopping keeps the recording - see access_report()
+    Returns-->bool: whether 'w' was recording
+    When not recording (default), the only cost is checking a C flag
+    '''
+    if not isinstance(w, Protected):
+        raise TypeError('Not a protect()-ed object: %s' % (type(w),))
+    prev = (<Protected>w).recording_on
+    if enable:
+        (<Protected>w).start_recording()
+    else:
+        (<Protected>w).recording_on = False
+    return prev
+
+
+def access_report(w: object) -> dict:
+    '''
+    access_report(w: object) -> dict:
+    w: object returned by protect()
+    Returns-->dict:
+        recording: bool: whether 'w' is still recording
+        reads, writes, deletes: sorted lists of attributes successfully
+            read, written, deleted through 'w' while recording
+        denied: sorted list of attributes whose access was refused
+        changed: bool: attributes of wrapped object were added, removed
+            or changed between method and data while recording
+        suggested: dict: keyword arguments for protect() with:
+            hide: attributes that were visible, but never read or written
+            ro: attributes that were read, writeable, but never written
+            rw: attributes in 'rw' that were written
+            dynamic: False if 'changed' is False
+            Other keyword arguments are unchanged
+    Only named attributes (not starting with '__') are added to
+    'hide' or 'ro'
+    '''
+    if not isinstance(w, Protected):
+        raise TypeError('Not a protect()-ed object: %s' % (type(w),))
+    return (<Protected>w).recording_report()
+
+
+def cow_diff(w: object) -> dict:
+    '''
+    cow_diff(w: object) -> dict:
+    w: object returned by protect() with cow=True
+    Returns-->dict: attribute name-->value, for attributes written
+        through 'w' - directly or by writing to a value read from 'w'
+        (the copy that was made is the value)
+    Values are not wrapped. The wrapped object is unchanged - applying
+    the result with setattr() makes the same changes to it
+    '''
+    if not isinstance(w, CopyOnWrite):
+        raise TypeError('Not a protect(cow=True)-ed object: %s' % (type(w),))
+    return (<CopyOnWrite>w).cow_diff()
+
+
+def set_slow_path_hook(hook: object = None) -> object:
+    '''
+    set_slow_path_hook(hook: object = None) -> object:
+    hook: callable(event: str, a: str or None, t: type) or None
+        Called when a wrapper takes a slow path:
+            event: one of:
+                'acl_dynamic': protect() rules evaluated without cache
+                    (dynamic=True)
+                'dir': full dir() of the wrapped object
+                'policy_compile': protect() rules processed for a new
+                    wrapper
+                'build_cache': ACL cache built for protect() with
+                    dynamic=False or dynamic='auto'
+                'immutable_hash': isimmutable() hashing a tuple or
+                    frozenset with 64 or more items
+            a: attribute name (None if not specific to an attribute)
+            t: type of the wrapped object
+        None removes the hook
+    Returns-->previous hook or None
+    Slow-path events triggered by the hook itself are not reported
+    To emit audit events instead:
+        set_slow_path_hook(
+            lambda e, a, t: sys.audit('pyprotect.' + e, a, t)
+        )
+    '''
+    global slow_path_hook
+    if hook is not None and not callable(hook):
+        raise TypeError('hook must be callable or None')
+    prev = slow_path_hook
+    slow_path_hook = hook
+    return prev
+
+
+def enable_stats(enable: bool = True) -> bool:
+    '''
+    enable_stats(enable: bool = True) -> bool:
+    Start (or stop if enable is False) collecting runtime statistics
+    Returns-->bool: previous setting
+    Counters are NOT reset - use reset_stats()
+    When disabled (default), the only cost is checking a C flag
+    '''
+    global stats_enabled
+    prev = stats_enabled
+    stats_enabled = bool(enable)
+    return prev
+
+
+def reset_stats() -> None:
+    '''
+    reset_stats() -> None: Reset all runtime statistics counters
+    '''
+    stats_data.clear()
+
+
+def stats() -> dict:
+    '''
+    stats() -> dict: Snapshot of runtime statistics
+    Counters keyed by wrapper class name (dict of str-->int):
+        created: wrappers created
+        reads, reads_denied: attribute reads - allowed and refused
+            (hidden or missing)
+        writes, writes_denied: attribute assignments - allowed and refused
+        deletes, deletes_denied: attribute deletions - allowed and refused
+        dir: dir() calls on wrappers
+    Global counters (int):
+        dir_wrapped: dir() calls on WRAPPED objects made by wrappers
+        acl_cache_hits, acl_cache_misses: ACL lookups for protect()
+            with dynamic=False found / not found in cache
+        acl_dynamic: ACL rules evaluated without cache (dynamic=True)
+        acl_cache_rebuilds: ACL cache rebuilt because wrapped object
+            changed (dynamic='auto')
+        watch_events: changes to watched instance __dict__ or class
+            reported by dict / type watchers (Python 3.12+)
+        freeze_unchanged: freeze() returned its argument unchanged
+        freeze_allocated: freeze() created a new wrapper
+    enabled: bool: whether statistics are being collected
+    Only updated while enable_stats(True) is in effect
+    '''
+    ret = {
+        'enabled': bool(stats_enabled),
+    }
+    for k in (
+        'created',
+        'reads', 'reads_denied',
+        'writes', 'writes_denied',
+        'deletes', 'deletes_denied',
+        'dir',
+    ):
+        ret[k] = dict(stats_data.get(k, {}))
+    for k in (
+        'dir_wrapped',
+        'acl_cache_hits', 'acl_cache_misses', 'acl_dynamic',
+        'acl_cache_rebuilds', 'watch_events',
+        'freeze_unchanged', 'freeze_allocated',
+    ):
+        ret[k] = stats_data.get(k, 0)
+    return ret
+
 __all__ = [
     'contains', 'freeze', 'id_protected', 'immutable_builtin_attributes',
     'isfrozen', 'isimmutable', 'isinstance_protected', 'isprivate',
@@ -436,6 +1083,11 @@ __all__ = [
     'hidden_pickle_attributes', 'always_delegated_attributes',
     'ProtectionError', 'issubclass_protected',
     'instance_of_protected', 'subclass_of_protected', 'same_class_protected',
+    'enable_stats', 'reset_stats', 'stats', 'set_slow_path_hook',
+    'memory_report', 'record_access', 'access_report', 'acl',
+    'getattrs', 'setattrs', 'view', 'compile_path', 'get_path',
+    'protect_class', 'protected', 'specialize', 'seal', 'cow_diff',
+    'freeze_deep', 'freeze_arena',
     # 'Wrapped', 'Private', 'Protected', 'PrivacyDict',
     # 'Frozen', 'FrozenPrivate', 'FrozenProtected', 'FrozenPrivacyDict',
 ]
@@ -0,0 +1,662 @@
+#!/usr/bin/python
+'''
+Benchmarks for pyprotect wrapper operations
+
+Measures the cost of common operations on each kind of wrapper and on
+the raw (unwrapped) object, so that each wrapper cost can be read as a
+ratio against the raw cost.
+
+Usage:
+    python -B bench_pyprotect.py run [-o OUT.json] [-n NUMBER] [-r REPEAT]
+    python -B bench_pyprotect.py scale [-o OUT.json] [--attrs 10,100,...]
+        [--policy 0,10,...] [--depth 1,10,...] [--max-seconds SECS]
+    python -B bench_pyprotect.py memory [-o OUT.json] [-c COUNT]
+    python -B bench_pyprotect.py compare OLD.json NEW.json [-t THRESHOLD]
+
+'run' writes JSON results to OUT.json (stdout if not given) and prints
+a readable table on stderr.
+'scale' sweeps number of attributes of the wrapped object, size of
+hide / ro / rw lists and nesting depth, recording time and memory per
+operation and the log-log slope between consecutive sizes - a slope
+near 1 is linear, near 2 is quadratic. Output goes where 'run' output goes.
+'memory' records steady-state memory of COUNT (default 1,000,000)
+frozen objects - bytes per object measured with tracemalloc and
+reported by pyprotect.memory_report(). Output goes where 'run' output goes.
+'compare' prints per-operation changes and exits with status 1 if any
+operation is slower by more than THRESHOLD (fraction, default 0.10)
+Works on output of 'run' as well as 'scale'
+'''
+
+import sys
+sys.dont_write_bytecode = True
+import argparse
+import gc
+import json
+import math
+import platform
+import time
+import timeit
+import tracemalloc
+from module_finder import pyprotect    # noqa: F401
+from cls_gen import class_with_attrs_methods
+from obj_utils import nested_obj
+from pyprotect import (
+    freeze, private, protect, wrap,
+    ProtectionError,
+    memory_report,
+)
+
+DEFAULT_NUMBER = 2000
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.10
+RAW_KIND = 'raw'
+# Sizes swept by 'scale'
+DEFAULT_SCALE_ATTRS = [10, 100, 1000, 10000, 100000]
+DEFAULT_SCALE_POLICY = [0, 10, 100, 1000, 10000]
+DEFAULT_SCALE_DEPTH = [1, 10, 100, 500]
+# Number of attributes of wrapped object when sweeping policy size
+SCALE_POLICY_ATTRS = 100
+# Once a single call of an operation takes longer than this, larger
+# sizes of the same operation are skipped
+DEFAULT_MAX_SECONDS = 2.0
+# Target total time for one timing in 'scale'
+SCALE_TARGET_SECONDS = 0.05
+# Number of frozen objects created by 'memory'
+DEFAULT_MEMORY_COUNT = 1000000
+
+
+class BenchObj(object):
+    '''Plain object exercising attributes, methods and container protocol'''
+    cls_attr = 1
+
+    def __init__(self):
+        self.a = 1
+        self.l = list(range(10))
+
+    def meth(self):
+        return self.a
+
+    def __getitem__(self, i):
+        return self.l[i]
+
+    def __iter__(self):
+        return iter(self.l)
+
+    def __len__(self):
+        return len(self.l)
+
+    def __hash__(self):
+        return hash(self.a)
+
+    def __eq__(self, other):
+        return self is other
+
+
+# kind-->callable(o) returning the object operated upon
+# ORDER matters only for readability of output
+KINDS = [
+    (RAW_KIND, lambda o: o),
+    ('wrap', wrap),
+    ('freeze', freeze),
+    ('private', private),
+    ('private_frozen', lambda o: private(o, frozen=True)),
+    ('protect_dynamic', lambda o: protect(o, dynamic=True)),
+    ('protect_static', lambda o: protect(o, dynamic=False)),
+    ('protect_auto', lambda o: protect(o, dynamic='auto')),
+    ('protect_frozen_dynamic', lambda o: protect(o, frozen=True, dynamic=True)),
+    ('protect_frozen_static', lambda o: protect(o, frozen=True, dynamic=False)),
+]
+
+
+def _setattr(w):
+    try:
+        w.a = 1
+    except ProtectionError:
+        # Denied writes (frozen wrappers) are measured too
+        pass
+
+
+def _iterate(w):
+    for x in w:
+        pass
+
+
+# op-->callable(w, o, wrapper) where 'w' is the object from KINDS
+# 'o' the raw object and 'wrapper' the callable from KINDS
+OPS = [
+    ('construct', lambda w, o, f: f(o)),
+    ('getattr', lambda w, o, f: w.a),
+    ('setattr', lambda w, o, f: _setattr(w)),
+    ('dir', lambda w, o, f: dir(w)),
+    ('call_method', lambda w, o, f: w.meth()),
+    ('getitem', lambda w, o, f: w[3]),
+    ('iterate', lambda w, o, f: _iterate(w)),
+    ('hash', lambda w, o, f: hash(w)),
+    ('compare', lambda w, o, f: w == o),
+]
+
+
+def time_op(fn, number, repeat):
+    '''
+    fn-->callable with no args
+    Returns-->float: best time per call in seconds
+    '''
+    t = timeit.Timer(fn)
+    return min(t.repeat(repeat=repeat, number=number)) / number
+
+
+def run(number=DEFAULT_NUMBER, repeat=DEFAULT_REPEAT, kinds=None, ops=None):
+    '''
+    number-->int: calls per timing
+    repeat-->int: timings per operation - best is kept
+    kinds-->list of str or None: restrict to these kinds
+    ops-->list of str or None: restrict to these operations
+    Returns-->dict: JSON-serializable results
+    '''
+    results = {}
+    for (kind, f) in KINDS:
+        if kinds and kind not in kinds and kind != RAW_KIND:
+            continue
+        o = BenchObj()
+        w = f(o)
+        d = {}
+        for (op, fn) in OPS:
+            if ops and op not in ops:
+                continue
+            d[op] = {
+                'time': time_op(
+                    lambda: fn(w, o, f), number=number, repeat=repeat
+                ),
+            }
+        results[kind] = d
+
+    raw = results.get(RAW_KIND, {})
+    for (kind, d) in results.items():
+        for (op, r) in d.items():
+            base = raw.get(op, {}).get('time', 0)
+            r['ratio'] = (r['time'] / base) if base else None
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'pyprotect': getattr(pyprotect, '__version__', None),
+            'number': number,
+            'repeat': repeat,
+            'timestamp': time.time(),
+        },
+        'results': results,
+    }
+
+
+# ------------------------------------------------------------------------
+# Scaling matrix
+# ------------------------------------------------------------------------
+
+def time_scaled(fn, repeat, max_seconds):
+    '''
+    fn-->callable with no args
+    repeat-->int
+    max_seconds-->float
+    Returns-->tuple(float, bool): best time per call in seconds and
+        whether a single call exceeded max_seconds
+    '''
+    t0 = time.perf_counter()
+    fn()
+    t1 = time.perf_counter() - t0
+    if t1 > max_seconds:
+        return (t1, True)
+    number = max(1, int(SCALE_TARGET_SECONDS / max(t1, 1e-9)))
+    return (time_op(fn, number=number, repeat=repeat), False)
+
+
+def mem_op(fn, keep=False):
+    '''
+    fn-->callable with no args
+    keep-->bool: If True, count memory still held by the return value
+        of fn; otherwise count peak memory allocated during the call
+    Returns-->int: bytes
+    '''
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        x = fn()    # noqa: F841
+        (current, peak) = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    if keep:
+        return current - base
+    return peak - base
+
+
+def slopes(points):
+    '''
+    points-->list of dict with keys 'size' and 'time'
+    Returns-->list of float: log-log slope between consecutive sizes
+    '''
+    ret = []
+    for (p1, p2) in zip(points, points[1:]):
+        (s1, s2) = (max(p1['size'], 1), max(p2['size'], 1))
+        if s1 == s2 or p1['time'] <= 0 or p2['time'] <= 0:
+            continue
+        ret.append(
+            math.log(p2['time'] / p1['time']) / math.log(float(s2) / s1)
+        )
+    return ret
+
+
+def sweep(sizes, make, kinds, ops, repeat, max_seconds):
+    '''
+    sizes-->list of int
+    make-->callable(size) returning the object to be wrapped
+    kinds-->list of tuple(str, callable(o)) or callable(size) returning
+        such a list
+    ops-->list of tuple(str, callable(w, o, wrapper))
+    Returns-->dict: kind-->op-->list of dict(size, time, mem)
+    '''
+    results = {}
+    skip = set()
+    for size in sizes:
+        o = make(size)
+        for (kind, f) in (kinds(size) if callable(kinds) else kinds):
+            w = f(o)
+            d = results.setdefault(kind, {})
+            for (op, fn) in ops:
+                if (kind, op) in skip:
+                    continue
+                call = (lambda fn=fn, w=w: fn(w, o, f))
+                (t, over) = time_scaled(call, repeat, max_seconds)
+                if over:
+                    skip.add((kind, op))
+                d.setdefault(op, []).append({
+                    'size': size,
+                    'time': t,
+                    'mem': mem_op(call, keep=(op == 'construct')),
+                })
+    return results
+
+
+def _policy_kinds(names):
+    '''names-->list of str: split evenly between hide, ro and rw'''
+    n = len(names)
+    names = list(names)
+    (hide, ro, rw) = (
+        names[:n // 3], names[n // 3:2 * n // 3], names[2 * n // 3:]
+    )
+    return [
+        ('protect_dynamic', lambda o: protect(
+            o, dynamic=True, hide=hide, ro=ro, rw=rw
+        )),
+        ('protect_static', lambda o: protect(
+            o, dynamic=False, hide=hide, ro=ro, rw=rw
+        )),
+        ('protect_auto', lambda o: protect(
+            o, dynamic='auto', hide=hide, ro=ro, rw=rw
+        )),
+    ]
+
+
+def _bench_obj(n):
+    '''Returns-->instance of class with n attributes and n methods'''
+    C = class_with_attrs_methods(n, prefix='bench')
+    # Chosen outside the timed operations
+    C.bench_attr = sorted(C.attr_dict['attrs'])[0]
+    return C()
+
+
+def _walk(w):
+    '''Follow 'dict' keys of nested_obj down to the innermost level'''
+    while True:
+        x = w['dict']
+        if x is None:
+            return w
+        w = x
+
+
+def scale(
+    attrs=DEFAULT_SCALE_ATTRS,
+    policy=DEFAULT_SCALE_POLICY,
+    depth=DEFAULT_SCALE_DEPTH,
+    repeat=DEFAULT_REPEAT,
+    max_seconds=DEFAULT_MAX_SECONDS,
+):
+    '''
+    attrs-->list of int: number of attributes AND methods of wrapped object
+    policy-->list of int: total number of names in hide + ro + rw
+    depth-->list of int: nesting depth of wrapped object
+    Returns-->dict: JSON-serializable results
+    '''
+    attr_kinds = [
+        (k, f) for (k, f) in KINDS if k in (
+            RAW_KIND, 'private', 'protect_dynamic', 'protect_static',
+            'protect_auto',
+        )
+    ]
+    # getattr: private_visible; dir: private_dir;
+    # construct (protect_static): build_cache
+    attr_ops = [
+        ('construct', lambda w, o, f: f(o)),
+        ('getattr', lambda w, o, f: getattr(w, type(o).bench_attr)),
+        ('setattr', lambda w, o, f: setattr(w, type(o).bench_attr, 'x')),
+        ('dir', lambda w, o, f: dir(w)),
+    ]
+
+    res = {}
+    res['attrs'] = sweep(
+        attrs, _bench_obj, attr_kinds, attr_ops, repeat, max_seconds
+    )
+
+    # Policy names are half existing attributes, half missing
+    policy_o = _bench_obj(SCALE_POLICY_ATTRS)
+    existing = sorted(type(policy_o).attr_dict['attrs'])
+
+    def policy_names(p):
+        return [
+            existing[i % len(existing)] if i % 2 else 'missing_%d' % (i,)
+            for i in range(p)
+        ]
+
+    res['policy'] = sweep(
+        policy, lambda p: policy_o,
+        lambda p: _policy_kinds(policy_names(p)),
+        attr_ops, repeat, max_seconds,
+    )
+
+    depth_kinds = [
+        (k, f) for (k, f) in KINDS if k in (RAW_KIND, 'freeze', 'private')
+    ]
+    depth_ops = [
+        ('construct', lambda w, o, f: f(o)),
+        ('walk', lambda w, o, f: _walk(w)),
+    ]
+    res['depth'] = sweep(
+        depth,
+        lambda n: nested_obj(depth=n, no_cycles=True, custom_obj=False),
+        depth_kinds, depth_ops, repeat, max_seconds,
+    )
+
+    for (dim, r) in res.items():
+        for (kind, d) in r.items():
+            for (op, l) in d.items():
+                d[op] = {'points': l, 'slopes': slopes(l)}
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'pyprotect': getattr(pyprotect, '__version__', None),
+            'repeat': repeat,
+            'max_seconds': max_seconds,
+            'timestamp': time.time(),
+        },
+        'scale': res,
+    }
+
+
+def format_scale_table(res):
+    '''res-->dict: as returned by scale(); Returns-->str'''
+    lines = []
+    for (dim, r) in sorted(res['scale'].items()):
+        lines.append('%s:' % (dim,))
+        for (kind, d) in sorted(r.items()):
+            for (op, x) in sorted(d.items()):
+                cells = ' '.join([
+                    '%d:%.3gus/%dB' % (p['size'], p['time'] * 1e6, p['mem'])
+                    for p in x['points']
+                ])
+                slope = x['slopes'][-1] if x['slopes'] else float('nan')
+                lines.append('  %-18s %-10s slope %5.2f  %s' % (
+                    kind, op, slope, cells
+                ))
+    return '\n'.join(lines)
+
+
+# ------------------------------------------------------------------------
+# Steady-state memory
+# ------------------------------------------------------------------------
+
+def traced_after(fn):
+    '''
+    fn-->callable with no args
+    Returns-->tuple(object, int): return value of fn and bytes still
+        allocated after fn returns and garbage is collected
+    '''
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        x = fn()
+        gc.collect()
+        current = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (x, current - base)
+
+
+def memory(count=DEFAULT_MEMORY_COUNT):
+    '''
+    count-->int: number of frozen objects
+    Returns-->dict: JSON-serializable results
+    '''
+    (objs, raw_bytes) = traced_after(
+        lambda: [BenchObj() for i in range(count)]
+    )
+    (frozen, frozen_bytes) = traced_after(
+        lambda: [freeze(o) for o in objs]
+    )
+    report = memory_report()
+    by_class = report['by_class'].get('Frozen', {'count': 0, 'bytes': 0})
+    ret = {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'pyprotect': getattr(pyprotect, '__version__', None),
+            'count': count,
+            'timestamp': time.time(),
+        },
+        'memory': {
+            'raw_bytes': raw_bytes,
+            'raw_bytes_per_object': raw_bytes / float(count),
+            'frozen_bytes': frozen_bytes,
+            'frozen_bytes_per_object': frozen_bytes / float(count),
+            'report_frozen_count': by_class['count'],
+            'report_frozen_bytes': by_class['bytes'],
+        },
+    }
+    del frozen, objs
+    return ret
+
+
+def format_memory_table(res):
+    '''res-->dict: as returned by memory(); Returns-->str'''
+    m = res['memory']
+    return '\n'.join([
+        'objects            : %d' % (res['meta']['count'],),
+        'raw bytes/object   : %.1f' % (m['raw_bytes_per_object'],),
+        'frozen bytes/object: %.1f (tracemalloc)' % (
+            m['frozen_bytes_per_object'],
+        ),
+        'frozen bytes/object: %.1f (memory_report)' % (
+            m['report_frozen_bytes'] / float(max(1, m['report_frozen_count'])),
+        ),
+    ])
+
+
+# ------------------------------------------------------------------------
+# Comparing runs
+# ------------------------------------------------------------------------
+
+def flatten(res):
+    '''
+    res-->dict: as returned by run() or scale()
+    Returns-->dict: tuple of str (key)-->float (time)
+    '''
+    ret = {}
+    for (kind, d) in res.get('results', {}).items():
+        for (op, r) in d.items():
+            ret[(kind, op)] = r['time']
+    for (k, v) in res.get('memory', {}).items():
+        # Memory regressions are reported like time regressions
+        if k.endswith('_per_object'):
+            ret[('memory', k)] = v
+    for (dim, r) in res.get('scale', {}).items():
+        for (kind, d) in r.items():
+            for (op, x) in d.items():
+                for p in x['points']:
+                    ret[(dim, kind, op, str(p['size']))] = p['time']
+    return ret
+
+
+def compare(old, new, threshold=DEFAULT_THRESHOLD):
+    '''
+    old, new-->dict: as returned by run() or scale()
+    threshold-->float: relative slowdown above which an op is a regression
+    Returns-->list of tuple(key, old_time, new_time, change, regressed)
+        key is a str
+    '''
+    ret = []
+    old_r = flatten(old)
+    new_r = flatten(new)
+    for k in sorted(set(old_r).intersection(new_r)):
+        (t_old, t_new) = (old_r[k], new_r[k])
+        if not t_old:
+            continue
+        change = (t_new - t_old) / t_old
+        ret.append((
+            '/'.join(k), t_old, t_new, change, change > threshold
+        ))
+    return ret
+
+
+def format_table(res):
+    '''res-->dict: as returned by run(); Returns-->str'''
+    results = res['results']
+    op_names = [op for (op, fn) in OPS if any(
+        op in d for d in results.values()
+    )]
+    lines = []
+    lines.append('%-24s' % ('usec (ratio to raw)',) + ''.join(
+        ['%18s' % (op,) for op in op_names]
+    ))
+    for (kind, f) in KINDS:
+        if kind not in results:
+            continue
+        cells = []
+        for op in op_names:
+            r = results[kind].get(op)
+            if r is None:
+                cells.append('%18s' % ('-',))
+            elif r['ratio'] is None:
+                cells.append('%18.3f' % (r['time'] * 1e6,))
+            else:
+                cells.append('%10.3f (%5.1fx)' % (r['time'] * 1e6, r['ratio']))
+        lines.append('%-24s' % (kind,) + ''.join(cells))
+    return '\n'.join(lines)
+
+
+def _int_list(s):
+    return [int(x) for x in s.split(',') if x.strip()]
+
+
+def write_output(res, output):
+    if output:
+        with open(output, 'w') as f:
+            json.dump(res, f, indent=2, sort_keys=True)
+    else:
+        json.dump(res, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='pyprotect benchmarks')
+    sub = parser.add_subparsers(dest='cmd')
+
+    p_run = sub.add_parser('run', help='Run benchmarks')
+    p_run.add_argument('-o', '--output', default=None)
+    p_run.add_argument('-n', '--number', type=int, default=DEFAULT_NUMBER)
+    p_run.add_argument('-r', '--repeat', type=int, default=DEFAULT_REPEAT)
+    p_run.add_argument('-k', '--kind', action='append', default=None)
+    p_run.add_argument('--op', action='append', default=None)
+
+    p_scale = sub.add_parser('scale', help='Run scaling matrix')
+    p_scale.add_argument('-o', '--output', default=None)
+    p_scale.add_argument('-r', '--repeat', type=int, default=DEFAULT_REPEAT)
+    p_scale.add_argument(
+        '--attrs', type=_int_list, default=DEFAULT_SCALE_ATTRS
+    )
+    p_scale.add_argument(
+        '--policy', type=_int_list, default=DEFAULT_SCALE_POLICY
+    )
+    p_scale.add_argument(
+        '--depth', type=_int_list, default=DEFAULT_SCALE_DEPTH
+    )
+    p_scale.add_argument(
+        '--max-seconds', type=float, default=DEFAULT_MAX_SECONDS
+    )
+
+    p_mem = sub.add_parser('memory', help='Steady-state memory')
+    p_mem.add_argument('-o', '--output', default=None)
+    p_mem.add_argument(
+        '-c', '--count', type=int, default=DEFAULT_MEMORY_COUNT
+    )
+
+    p_cmp = sub.add_parser('compare', help='Compare two benchmark runs')
+    p_cmp.add_argument('old')
+    p_cmp.add_argument('new')
+    p_cmp.add_argument(
+        '-t', '--threshold', type=float, default=DEFAULT_THRESHOLD
+    )
+
+    args = parser.parse_args(argv)
+    if args.cmd == 'run':
+        res = run(
+            number=args.number, repeat=args.repeat,
+            kinds=args.kind, ops=args.op,
+        )
+        sys.stderr.write(format_table(res) + '\n')
+        write_output(res, args.output)
+        return 0
+    elif args.cmd == 'scale':
+        res = scale(
+            attrs=args.attrs, policy=args.policy, depth=args.depth,
+            repeat=args.repeat, max_seconds=args.max_seconds,
+        )
+        sys.stderr.write(format_scale_table(res) + '\n')
+        write_output(res, args.output)
+        return 0
+    elif args.cmd == 'memory':
+        res = memory(count=args.count)
+        sys.stderr.write(format_memory_table(res) + '\n')
+        write_output(res, args.output)
+        return 0
+    elif args.cmd == 'compare':
+        with open(args.old) as f:
+            old = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        regressed = 0
+        for (key, t_old, t_new, change, bad) in compare(
+            old, new, threshold=args.threshold
+        ):
+            # times shown in usec, memory in bytes
+            mult = 1 if key.startswith('memory/') else 1e6
+            print('%-48s %12.3f %12.3f %+7.1f%% %s' % (
+                key, t_old * mult, t_new * mult, change * 100,
+                'REGRESSION' if bad else '',
+            ))
+            if bad:
+                regressed += 1
+        if regressed:
+            print('%d operation(s) slower by more than %.1f%%' % (
+                regressed, args.threshold * 100,
+            ))
+            return 1
+        return 0
+    parser.print_help()
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
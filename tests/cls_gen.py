@@ -28,6 +28,7 @@ def gen_random(n=LEN_RANDOM_ATTR_PART):
         x = ''.join(choices(SRC_RANDOM_ATTR_PART, k=n))
         if x in s:
             continue
+        s.add(x)
         yield x
 
 
@@ -84,10 +85,13 @@ class MyClass:
         if prefix:
             attr_name = prefix + '_attr_' + rnd_a
             meth_name = prefix + '_method_' + rnd_a
-            class_source += src_attr(attr_name)
-            class_source += src_inst_m(meth_name)
-            attr_dict['attrs'].add(attr_name)
-            attr_dict['methods'].add(meth_name)
+        else:
+            attr_name = 'attr_' + rnd_a
+            meth_name = 'method_' + rnd_a
+        class_source += src_attr(attr_name)
+        class_source += src_inst_m(meth_name)
+        attr_dict['attrs'].add(attr_name)
+        attr_dict['methods'].add(meth_name)
 
     local_d = {}
     exec(class_source, None, local_d)
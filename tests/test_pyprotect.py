@@ -5,6 +5,10 @@ sys.dont_write_bytecode = True
 from math import ceil, floor, trunc
 from functools import partial
 import pickle
+import copy
+import gc
+import types
+import collections.abc
 from itertools import permutations
 import unittest
 import warnings
@@ -23,7 +27,15 @@ from test_utils import (
     always_frozen,
     isfrozen, isprotected, isprivate, isimmutable,
     freeze, private, protect, wrap,
-    iswrapped,
+    iswrapped, isvisible, isreadonly,
+    enable_stats, reset_stats, stats,
+    set_slow_path_hook,
+    memory_report,
+    record_access, access_report,
+    acl, getattrs, setattrs, view, compile_path, get_path,
+    protect_class, protected, specialize, seal, cow_diff, freeze_deep,
+    freeze_arena,
+    ProtectionError,
 )
 import platform
 PYPY = (platform.python_implementation() == 'PyPy')
@@ -1541,6 +1553,1382 @@ class test_pyprotect(unittest.TestCase):
             cp.check(dp)
             assert(type(complex(w)) is complex)
 
+    def test_70_stats(self):
+        class C(object):
+            a = 1
+            b = 2
+
+            def m(self):
+                pass
+
+        prev = enable_stats(False)
+        try:
+            reset_stats()
+            w = protect(C(), hide=['b'])
+            w.a
+            d = stats()
+            assert(d['enabled'] is False)
+            assert(d['created'] == {})
+            assert(d['reads'] == {})
+
+            enable_stats(True)
+            w = protect(C(), hide=['b'])
+            w.a
+            try:
+                w.b
+            except AttributeError:
+                pass
+            w.a = 3
+            try:
+                w.m = None
+            except ProtectionError:
+                pass
+            dir(w)
+            freeze(1)
+            freeze([1])
+            d = stats()
+            assert(d['enabled'] is True)
+            assert(d['created']['Protected'] == 1)
+            assert(d['created']['Frozen'] == 1)
+            assert(d['reads']['Protected'] == 1)
+            assert(d['reads_denied']['Protected'] == 1)
+            assert(d['writes']['Protected'] == 1)
+            assert(d['writes_denied']['Protected'] == 1)
+            assert(d['dir']['Protected'] == 1)
+            assert(d['dir_wrapped'] > 0)
+            assert(d['acl_dynamic'] > 0)
+            assert(d['freeze_unchanged'] == 1)
+            assert(d['freeze_allocated'] == 1)
+
+            w = protect(C(), dynamic=False)
+            reset_stats()
+            w.a
+            # Special attribute is visible but not in dir() of wrapped object
+            getattr(w, PROT_ATTR)
+            d = stats()
+            assert(d['acl_cache_hits'] > 0)
+            assert(d['acl_cache_misses'] > 0)
+            assert(d['acl_dynamic'] == 0)
+        finally:
+            enable_stats(prev)
+            reset_stats()
+        assert(stats()['reads'] == {})
+
+    def test_71_slow_path_hook(self):
+        class C(object):
+            a = 1
+            b = 2
+
+        events = []
+
+        def hook(event, a, t):
+            events.append((event, a, t))
+            # Slow paths triggered inside the hook are not reported
+            dir(private(C()))
+
+        prev = set_slow_path_hook(hook)
+        try:
+            w = protect(C(), hide=['b'])
+            assert(('policy_compile', None, C) in events)
+            del events[:]
+            try:
+                w.b
+            except AttributeError:
+                pass
+            # Python 3.12+: dir() is cached, refreshed by watchers
+            assert(('dir', 'b', C) in events or ('dir', None, C) in events)
+            assert(('acl_dynamic', 'b', C) in events)
+
+            del events[:]
+            protect(C(), dynamic=False)
+            assert(('build_cache', None, C) in events)
+
+            del events[:]
+            isimmutable(tuple(range(10)))
+            assert(events == [])
+            isimmutable(tuple(range(1000)))
+            assert(events == [('immutable_hash', None, tuple)])
+            self.assertRaises(TypeError, set_slow_path_hook, 1)
+        finally:
+            set_slow_path_hook(prev)
+        del events[:]
+        dir(private(C()))
+        assert(events == [])
+
+    def test_72_memory(self):
+        class C(object):
+            pass
+
+        o = C()
+        for a in range(100):
+            setattr(o, 'a_%d' % (a,), a)
+        base = sys.getsizeof(object.__new__(C))
+        for op in wrap, freeze, private, protect:
+            w = op(o)
+            assert(sys.getsizeof(w) > base)
+        w1 = protect(o)
+        w2 = protect(o, dynamic=False, hide=['a_1'])
+        # ACL cache and cached dir() are counted
+        assert(sys.getsizeof(w2) > sys.getsizeof(w1))
+
+        gc.collect()
+        d = memory_report()
+        assert(d['total']['count'] >= 2)
+        assert(d['by_class']['Protected']['count'] >= 2)
+        assert(d['by_class']['Protected']['bytes'] >= (
+            sys.getsizeof(w1) + sys.getsizeof(w2)
+        ))
+        policies = [
+            k for k in d['by_policy']
+            if k.startswith('Protected(dynamic=False') and "'a_1'" in k
+        ]
+        assert(len(policies) == 1)
+        assert(d['total']['bytes'] == sum(
+            v['bytes'] for v in d['by_class'].values()
+        ))
+        # Regexes shared by wrappers of a class are counted once - not
+        # charged to every wrapper
+        l = [freeze(o) for i in range(10)]
+        gc.collect()
+        d = memory_report()
+        assert(1 <= d['shared']['count'] < d['total']['count'])
+        regex_size = d['shared']['bytes'] // d['shared']['count']
+        for w in l:
+            assert(sys.getsizeof(w) - object.__sizeof__(w) < regex_size)
+
+    def test_73_record_access(self):
+        class C(object):
+            def __init__(self):
+                self.a = 1
+                self.b = 2
+                self.c = 3
+
+            def m(self):
+                return 1
+
+        o = C()
+        w = protect(o, rw=['c'])
+        self.assertRaises(TypeError, record_access, private(o))
+        self.assertRaises(TypeError, access_report, o)
+        # isprotected(), but not a wrapper
+        pc = protect_class(C)()
+        assert(isprotected(pc))
+        self.assertRaises(TypeError, record_access, pc)
+        self.assertRaises(TypeError, access_report, pc)
+        assert(record_access(w) is False)
+        w.a
+        w.b = 5
+        w.m()
+        try:
+            w.no_such_attr
+        except AttributeError:
+            pass
+        d = access_report(w)
+        assert(d['recording'] is True)
+        assert(d['reads'] == ['a', 'm'])
+        assert(d['writes'] == ['b'])
+        assert(d['denied'] == ['no_such_attr'])
+        assert(d['changed'] is False)
+        kw = d['suggested']
+        assert(kw['dynamic'] is False)
+        assert(kw['hide'] == ['c'])
+        assert(kw['ro'] == ['a'])
+        assert(kw['rw'] == [])
+        w2 = protect(o, **kw)
+        assert(not isvisible(w2, 'c'))
+        assert(isreadonly(w2, 'a'))
+        assert(not isreadonly(w2, 'b'))
+
+        # Attribute changed from data to method
+        w.b = len
+        assert(access_report(w)['changed'] is True)
+        # Attribute added to wrapped object
+        assert(record_access(w) is True)
+        o.d = 4
+        d = access_report(w)
+        assert(d['changed'] is True)
+        assert(d['suggested']['dynamic'] is True)
+        assert(record_access(w, False) is True)
+        w.a
+        assert(access_report(w)['reads'] == [])
+        assert(access_report(w)['recording'] is False)
+
+    def test_74_dynamic_auto(self):
+        class C(object):
+            x = 1
+
+            def __init__(self):
+                self.a = 1
+                self.b = 2
+
+            def m(self):
+                return 1
+
+        o = C()
+        w = protect(o, dynamic='auto', hide=['b'])
+        assert(w.a == 1)
+        assert(not isvisible(w, 'b'))
+        assert('a' in dir(w) and 'b' not in dir(w))
+        prev = enable_stats()
+        reset_stats()
+        try:
+            for i in range(10):
+                w.a
+            d = stats()
+            assert(d['acl_dynamic'] == 0)
+            assert(d['dir_wrapped'] == 0)
+            assert(d['acl_cache_hits'] > 0)
+
+            # Attribute added to instance
+            o.c = 3
+            assert(w.c == 3)
+            assert('c' in dir(w))
+            assert(stats()['acl_cache_rebuilds'] == 1)
+            # Same number of attributes, different names
+            del o.c
+            o.d = 4
+            assert('d' in dir(w) and 'c' not in dir(w))
+            self.assertRaises(AttributeError, getattr, w, 'c')
+            # Same size, different names - read before dir()
+            o.e = 5
+            w.e
+            del o.e
+            o.f = 6
+            assert(w.f == 6)
+            self.assertRaises(AttributeError, getattr, w, 'e')
+            assert('f' in dir(w) and 'e' not in dir(w))
+            # Attribute added to class
+            C.y = 5
+            assert(w.y == 5)
+            # Data attribute rebound to method - ro_method
+            assert(not isreadonly(w, 'a'))
+            o.a = len
+            assert(isreadonly(w, 'a'))
+            self.assertRaises(ProtectionError, setattr, w, 'a', 1)
+        finally:
+            enable_stats(prev)
+
+        # Merging: False wins, 'auto' over True
+        w2 = protect(protect(o, dynamic=True), dynamic='auto')
+        assert(getattr(w2, PROT_ATTR).rules['dynamic'] == 'auto')
+        w2 = protect(protect(o, dynamic='auto'), dynamic=False)
+        assert(getattr(w2, PROT_ATTR).rules['dynamic'] is False)
+
+        # Custom __dir__: handled like dynamic=True
+        class D(object):
+            def __dir__(self):
+                return ['a'] + (['b'] if self.show_b else [])
+
+        o = D()
+        o.a = o.b = 1
+        o.show_b = False
+        w = protect(o, dynamic='auto')
+        assert('b' not in dir(w))
+        self.assertRaises(AttributeError, getattr, w, 'b')
+        o.show_b = True
+        assert(w.b == 1)
+
+    def test_75_watchers(self):
+        class B(object):
+            pass
+
+        class C(B):
+            def __init__(self):
+                self.a = 1
+
+        watched = (sys.version_info[:2] >= (3, 12) and not PYPY)
+        o = C()
+        w = private(o)
+        prev = enable_stats()
+        reset_stats()
+        try:
+            for i in range(10):
+                assert(w.a == 1)
+            if watched:
+                assert(stats()['dir_wrapped'] == 1)
+            else:
+                assert(stats()['dir_wrapped'] >= 10)
+            # Instance attribute added / deleted
+            o.b = 2
+            assert(w.b == 2)
+            del o.b
+            self.assertRaises(AttributeError, getattr, w, 'b')
+            # Class and base class changed
+            C.c = 3
+            assert(w.c == 3)
+            B.d = 4
+            assert(w.d == 4)
+            del B.d
+            self.assertRaises(AttributeError, getattr, w, 'd')
+            # Value rebound: dir() unchanged
+            reset_stats()
+            o.a = 5
+            assert(w.a == 5)
+            if watched:
+                assert(stats()['dir_wrapped'] == 0)
+            # Instance __dict__ and __class__ replaced
+            o.__dict__ = {'e': 6}
+            assert(w.e == 6)
+            self.assertRaises(AttributeError, getattr, w, 'a')
+            o.__class__ = B
+            self.assertRaises(AttributeError, getattr, w, 'c')
+
+            # protect(dynamic='auto') cache invalidated by watchers
+            o = C()
+            w = protect(o, dynamic='auto', ro_method=True)
+            w.a
+            o.f = 7
+            assert(w.f == 7)
+            o.a = len
+            assert(isreadonly(w, 'a'))
+            # Attributes added after first access - Python 3.12 reports
+            # adding a key to a shared-keys __dict__ as a modification
+            for op in (
+                private, protect, lambda x: protect(x, dynamic='auto'),
+            ):
+                for i in range(20):
+                    o = C()
+                    o.x = 0
+                    w = op(o)
+                    w.x
+                    setattr(o, 'n%d' % (i,), i)
+                    assert(getattr(w, 'n%d' % (i,)) == i)
+                    assert('n%d' % (i,) in dir(w))
+                    o.__dict__['m'] = 1
+                    assert(w.m == 1)
+                    del o.x
+                    self.assertRaises(AttributeError, getattr, w, 'x')
+                    # Same size - one key swapped for another
+                    del o.m
+                    o.y = 2
+                    assert(w.y == 2)
+                    self.assertRaises(AttributeError, getattr, w, 'm')
+            # Module
+            m = types.ModuleType('m')
+            w = private(m)
+            m.x = 1
+            assert(w.x == 1)
+            if watched:
+                assert(stats()['watch_events'] > 0)
+        finally:
+            enable_stats(prev)
+
+    def test_76_method_data_classification(self):
+        calls = []
+
+        class C(object):
+            x = 1
+
+            def __init__(self):
+                self.a = 1
+                self.f = len
+
+            @property
+            def p(self):
+                calls.append('p')
+                return len
+
+            @p.setter
+            def p(self, val):
+                pass
+
+            def m(self):
+                return 1
+
+            @classmethod
+            def cm(cls):
+                return 1
+
+            @staticmethod
+            def sm():
+                return 1
+
+        for dynamic in (True, False, 'auto'):
+            o = C()
+            w = protect(o, ro_method=True, dynamic=dynamic)
+            for a in ('m', 'cm', 'sm', 'f'):
+                assert(isreadonly(w, a))
+            for a in ('a', 'x', 'p'):
+                assert(not isreadonly(w, a))
+            w.a = 2
+            w.p = 3
+            self.assertRaises(ProtectionError, setattr, w, 'm', 1)
+            w = protect(o, ro_data=True, ro_method=False, dynamic=dynamic)
+            assert(isreadonly(w, 'a'))
+            assert(not isreadonly(w, 'm'))
+            # Property getter is never called to classify 'p'
+            assert(isreadonly(w, 'p'))
+            assert(calls == [])
+
+        # Classification follows changes to the class
+        o = C()
+        w = protect(o, ro_method=True)
+        assert(not isreadonly(w, 'x'))
+        C.x = staticmethod(len)
+        assert(isreadonly(w, 'x'))
+        C.x = 2
+        assert(not isreadonly(w, 'x'))
+        assert(calls == [])
+
+    def test_77_single_fetch(self):
+        calls = []
+
+        class C(object):
+            n = None
+
+            @property
+            def p(self):
+                calls.append('p')
+                return [1]
+
+        for op in (
+            wrap, freeze, private, protect,
+            partial(protect, dynamic=False), partial(protect, frozen=True),
+        ):
+            w = op(C())
+            del calls[:]
+            assert(list(w.p) == [1])
+            assert(calls == ['p'])
+            # None-valued attributes are visible
+            assert(w.n is None)
+        # Blocked access does not evaluate the property
+        del calls[:]
+        w = protect(C(), hide=['p'])
+        self.assertRaises(AttributeError, getattr, w, 'p')
+        assert(calls == [])
+        # Missing attributes are detected without dir()
+        events = []
+        prev = set_slow_path_hook(lambda e, a, t: events.append(e))
+        try:
+            w = wrap(C())
+            self.assertRaises(AttributeError, getattr, w, 'missing')
+            assert(getattr(w, 'missing', 1) == 1)
+            assert('dir' not in events)
+        finally:
+            set_slow_path_hook(prev)
+
+    def test_78_lazy_messages(self):
+        calls = []
+
+        class C(object):
+            def __init__(self):
+                self.a = 1
+                self._b = 2
+
+            @property
+            def p(self):
+                calls.append('p')
+                return 1
+
+        o = C()
+        for (w, cn) in (
+            (wrap(o), 'Wrapped'),
+            (private(o), 'Private'),
+            (protect(o, hide=['a']), 'Protected'),
+        ):
+            assert(getattr(w, 'missing', None) is None)
+            try:
+                w.missing
+                assert(False)
+            except AttributeError as e:
+                msg = "Object %s('C') has no attribute 'missing'" % (cn,)
+                assert(str(e) == msg)
+                # args holds the formatted message, as for AttributeError
+                assert(e.args == (msg,))
+                assert(repr(e).endswith('(%r)' % (msg,)))
+                for e2 in (copy.copy(e), pickle.loads(pickle.dumps(e))):
+                    assert(type(e2) is type(e) and e2.args == (msg,))
+                e.args = ('100%',)
+                assert(str(e) == '100%' and e.args == ('100%',))
+        try:
+            private(o)._b = 3
+            assert(False)
+        except ProtectionError as e:
+            assert(str(e) == 'Cannot set attribute: C._b')
+        try:
+            private(o).c = 3
+            assert(False)
+        except ProtectionError as e:
+            assert(str(e) == 'Cannot set attribute: C.c')
+        try:
+            protect(o, ro=['a']).a = 3
+            assert(False)
+        except ProtectionError as e:
+            assert(str(e) == 'Read only attribute: a')
+            assert(e.args == ('Read only attribute: a',))
+        try:
+            private(o).__dict__['_b'] = 3
+            assert(False)
+        except ProtectionError as e:
+            assert(str(e) == 'Cannot set private attribute: C._b')
+
+        # Probes do not read the attribute
+        for w in (wrap(o), freeze(o), private(o), protect(o)):
+            assert(isvisible(w, 'p'))
+            assert(not isvisible(w, 'missing'))
+        assert(not isvisible(private(o).__dict__, '_C__x'))
+        assert(calls == [])
+
+    def test_79_probes_do_not_read(self):
+        class C(object):
+            def __init__(self):
+                self.a = [1]
+                self.b = {}
+
+            def m(self):
+                return 1
+
+        o = C()
+        ws = [
+            wrap(o), freeze(o), private(o), private(o, frozen=True),
+            protect(o, ro=['a']), protect(o, dynamic=False, hide=['b']),
+            protect(o, dynamic='auto', frozen=True),
+        ]
+        prev = enable_stats()
+        reset_stats()
+        try:
+            for w in ws:
+                for a in ('a', 'b', 'm', 'missing', '__dict__'):
+                    isvisible(w, a)
+                    isreadonly(w, a)
+            d = stats()
+            assert(d['reads'] == {})
+            assert(d['freeze_allocated'] == 0)
+        finally:
+            enable_stats(prev)
+        assert(isreadonly(ws[4], 'a') and not isreadonly(ws[4], 'b'))
+        assert(not isvisible(ws[5], 'b') and isvisible(ws[5], 'a'))
+        assert(isreadonly(ws[1], 'a') and not isreadonly(ws[0], 'a'))
+        assert(isreadonly((1, 2), 'a') and not isreadonly([1], 'a'))
+        assert(not isvisible(o, 'a'))
+
+    def test_80_acl(self):
+        class C(object):
+            def __init__(self):
+                self.a = 1
+                self.b = 2
+                self._c = 3
+
+            def m(self):
+                return 1
+
+        o = C()
+        names = ['a', 'b', '_c', 'm', 'missing', '__class__', '__dict__']
+        ws = [
+            wrap(o), freeze(o), private(o),
+            protect(o, ro=['a']), protect(o, dynamic=False, hide=['b']),
+            protect(o, dynamic='auto', rw=['m']),
+            protect(o, hide_private=True, frozen=True),
+        ]
+        for w in ws:
+            (r, wr) = acl(w, names)
+            for a in names:
+                assert((a in r) == isvisible(w, a))
+                assert((a in wr) == (not isreadonly(w, a)))
+            (r, wr) = acl(w)
+            assert(all(isvisible(w, a) for a in r))
+            assert(set(a for a in dir(w) if isvisible(w, a)) <= r)
+            assert(wr <= r)
+        assert(acl(ws[3], 'a') == (frozenset(['a']), frozenset()))
+
+        # One dir() of wrapped object for the whole batch
+        events = []
+        set_slow_path_hook(lambda k, a, x: events.append(k))
+        try:
+            acl(ws[3], ['x%d' % i for i in range(100)] + names)
+        finally:
+            set_slow_path_hook(None)
+        assert(events.count('dir') <= 1)
+        with self.assertRaises(TypeError):
+            acl(o)
+
+    def test_81_getattrs_setattrs(self):
+        class C(object):
+            def __init__(self):
+                self.a = [1]
+                self.b = 2
+                self._c = 3
+
+            def m(self):
+                return 1
+
+        o = C()
+        names = ('a', 'b', 'm', '__class__')
+        for w in (
+            wrap(o), freeze(o), private(o), private(o, frozen=True),
+            protect(o, ro=['a']), protect(o, dynamic=False, ro_data=True),
+            protect(o, dynamic='auto', frozen=True),
+        ):
+            vals = getattrs(w, names)
+            for (a, v) in zip(names, vals):
+                x = getattr(w, a)
+                assert(type(v) is type(x))
+                assert(isfrozen(v) == isfrozen(x))
+            assert(vals[0] == [1] and vals[1] == 2 and vals[2]() == 1)
+            assert(getattrs(w, 'b') == (2,))
+
+        w = protect(o, hide=['b'])
+        with self.assertRaises(AttributeError):
+            getattrs(w, ['a', 'b'])
+
+        # All checked before any is set
+        w = protect(o, ro=['b'])
+        with self.assertRaises(ProtectionError):
+            setattrs(w, {'a': 10, 'b': 20})
+        assert(o.a == [1] and o.b == 2)
+        setattrs(w, {'a': 10})
+        assert(o.a == 10)
+        with self.assertRaises(ProtectionError):
+            setattrs(private(o), {'a': 1, 'new': 2})
+        assert(o.a == 10 and not hasattr(o, 'new'))
+        with self.assertRaises(ProtectionError):
+            setattrs(freeze(o), {'a': 1})
+        setattrs(wrap(o), {'a': 1, 'new': 2})
+        assert(o.a == 1 and o.new == 2)
+
+        # One dir() of wrapped object for the whole batch
+        w = private(o)
+        events = []
+        set_slow_path_hook(lambda k, a, x: events.append(k))
+        try:
+            getattrs(w, ['a', 'b', 'm'] * 20)
+            setattrs(w, {'a': 3, 'b': 4})
+        finally:
+            set_slow_path_hook(None)
+        assert(events.count('dir') <= 2)
+        assert(o.a == 3 and o.b == 4)
+
+        w = protect(o)
+        record_access(w)
+        getattrs(w, ['a'])
+        setattrs(w, {'b': 5})
+        d = access_report(w)
+        assert(d['reads'] == ['a'] and d['writes'] == ['b'])
+        with self.assertRaises(TypeError):
+            getattrs(o, ['a'])
+        with self.assertRaises(TypeError):
+            setattrs(o, {'a': 1})
+
+    def test_82_view(self):
+        class C(object):
+            def __init__(self):
+                self.id = 1
+                self.name = ['x']
+                self.status = 2
+                self._p = 3
+                self.__q = 4
+                self.other = 5
+
+            def m(self):
+                return self.id
+
+        o = C()
+        names = ['id', 'name', 'm', '_p', '__q', '_C__q', 'missing']
+        events = []
+        set_slow_path_hook(lambda k, a, x: events.append(k))
+        try:
+            v = view(o, names)
+            w = view(o, names, frozen=False)
+            for x in (v, w):
+                x.id
+                x.name
+                dir(x)
+        finally:
+            set_slow_path_hook(None)
+        assert('dir' not in events)
+
+        for x in (v, w):
+            assert(isprotected(x) and iswrapped(x))
+            assert(sorted(dir(x)) == ['_p', 'id', 'm', 'name'])
+            assert(x.id == 1 and x.m() == 1 and x._p == 3)
+            for a in ('other', 'status', '_C__q', 'missing'):
+                assert(not hasattr(x, a))
+            assert(acl(x)[0] == set(dir(x)) | set([PROT_ATTR]))
+            assert(getattrs(x, ['id', '_p']) == (1, 3))
+        assert(isfrozen(v) and not isfrozen(w))
+        assert(isfrozen(v.name) and not isfrozen(w.name))
+        with self.assertRaises(ProtectionError):
+            v.id = 2
+        w.id = 2
+        assert(o.id == 2 and v.id == 2)
+        for a in ('_p', 'other', 'missing'):
+            with self.assertRaises(ProtectionError):
+                setattr(w, a, 1)
+        with self.assertRaises(ProtectionError):
+            del w.id
+        assert(acl(w)[1] == set(['id', 'name', 'm']))
+
+        # Views are never widened
+        f = freeze(w)
+        assert(isfrozen(f) and sorted(dir(f)) == sorted(dir(w)))
+        p = protect(w, ro=['id'])
+        assert(sorted(dir(p)) == sorted(dir(w)))
+        with self.assertRaises(ProtectionError):
+            p.id = 3
+        assert(sorted(dir(private(w))) == sorted(dir(w)))
+        assert(dir(view(w, ['id', 'other'])) == ['id'])
+        x = view(protect(o, hide=['name'], ro=['id']), ['id', 'name'], False)
+        assert(dir(x) == ['id'])
+        with self.assertRaises(ProtectionError):
+            x.id = 3
+        assert(dir(view(wrap(o), 'id')) == ['id'])
+        assert(isfrozen(view(freeze(o), ['id'], frozen=False)))
+
+    def test_83_get_path(self):
+        class D(object):
+            def __init__(self):
+                self.d = {'k': [1, 2]}
+                self.t = (1, 2)
+                self._p = 5
+
+        class C(object):
+            def __init__(self):
+                self.a = [D(), D()]
+                self.b = D()
+                self.n = 3
+
+            def m(self):
+                return 1
+
+        o = C()
+        paths = [
+            'a[1].d', "a[1].d['k']", 'a[-1].d["k"][0]', 'b.t[0]', 'n',
+            'b._p', 'b', 'a.append', 'b.__dict__', "b.__dict__['d']", 'm',
+            'b.__class__', 'missing', 'b.missing', 'a[5]',
+        ]
+
+        def run(f):
+            try:
+                x = f()
+            except Exception as e:
+                return (type(e), str(e))
+            return (type(x), isfrozen(x), iswrapped(x))
+
+        for w in (
+            o, wrap(o), freeze(o), private(o), private(o, frozen=True),
+            protect(o, ro=['a']), protect(o, dynamic=False, hide=['b']),
+            protect(o, frozen=True, dynamic='auto'),
+            view(o, ['a', 'b']), view(o, ['a', 'b'], frozen=False),
+        ):
+            for p in paths:
+                assert(run(lambda: eval('w.' + p, {'w': w})) == run(
+                    lambda: get_path(w, p)
+                )), (type(w), p)
+                assert(run(lambda: get_path(w, p)) == run(
+                    lambda: get_path(w, compile_path(p))
+                ))
+        fw = freeze(o)
+        assert(get_path(fw, 'a[1].d["k"][1]') == 2)
+        assert(get_path([o], '[0].n') == 3)
+
+        # Only the final value is frozen
+        prev = enable_stats()
+        reset_stats()
+        try:
+            get_path(fw, "a[1].d['k']")
+            assert(stats()['freeze_allocated'] == 1)
+        finally:
+            enable_stats(prev)
+
+        cp = compile_path('a.b')
+        assert(str(cp) == 'a.b' and 'a.b' in repr(cp))
+        for p in ('', '.a', 'a..b', 'a.[1]', 'a[x]', '[1]a', 'a b', 'a.'):
+            with self.assertRaises(ValueError):
+                compile_path(p)
+        with self.assertRaises(TypeError):
+            get_path(o, 1)
+
+    def test_84_protect_class(self):
+        @protected(hide_private=True, ro=['y'])
+        class C(object):
+            def __init__(self):
+                self.x = 1
+                self.y = [1]
+                self._s = 2
+                self.__m = 3
+
+            def get(self):
+                return self._s + self.__m + self._h()
+
+            def _h(self):
+                return 4
+
+            def set_y(self, v):
+                self.y = v
+
+        c = C()
+        assert(type(c).__name__ == 'C' and not iswrapped(c))
+        assert(c.x == 1 and c.get() == 9)
+        for a in ('_s', '_C__m', '_h'):
+            with self.assertRaises(AttributeError):
+                getattr(c, a)
+            assert(not isvisible(c, a))
+            assert(a not in dir(c) and a not in c.__dict__)
+        for a in ('y', 'get', '_s'):
+            with self.assertRaises(ProtectionError):
+                setattr(c, a, 1)
+            assert(isreadonly(c, a))
+        with self.assertRaises(ProtectionError):
+            c.z = 1
+        with self.assertRaises(ProtectionError):
+            del c.x
+        c.x = 5
+        c.set_y(6)
+        assert(c.x == 5 and c.y == 6 and not isreadonly(c, 'x'))
+        assert(isprotected(c) and not isfrozen(c))
+        assert(not isprotected(C) and not isprotected(object()))
+
+        # Methods of subclasses are not restricted
+        class D(C):
+            def peek(self):
+                return self._s
+        d = D()
+        assert(d.peek() == 2 and isprotected(d))
+        with self.assertRaises(AttributeError):
+            d._s
+
+        # Rules are merged like protect()
+        E = protect_class(C, hide=['x'])
+        e = E()
+        assert(not isvisible(e, 'x') and e.get() == 9)
+        with self.assertRaises(AttributeError):
+            e.x
+        w = protect(c, ro=['x'])
+        assert(w.x == 5)
+        with self.assertRaises(ProtectionError):
+            w.x = 1
+
+        @protected(frozen=True)
+        class F(object):
+            __slots__ = ('a',)
+
+            def __init__(self):
+                self.a = 1
+
+            def bump(self):
+                self.a += 1
+
+        f = F()
+        f.bump()
+        assert(f.a == 2 and isfrozen(f) and isreadonly(f, 'a'))
+        with self.assertRaises(ProtectionError):
+            f.a = 3
+        with self.assertRaises(TypeError):
+            protect_class(1)
+
+        # Policy is found through the MRO - subclasses, not other classes
+        class G(F):
+            __slots__ = ()
+
+        assert(isfrozen(G()) and isprotected(G()))
+        assert(not isfrozen(object()) and not isprotected(1))
+
+    def test_85_specialize(self):
+        def make():
+            class T(object):
+                cd = [1]
+
+                def __init__(self):
+                    self.a = [1]
+                    self._b = [2]
+                    self.__c = 3
+
+                def m(self):
+                    return 4
+
+                @property
+                def p(self):
+                    return [5]
+
+                @property
+                def bad(self):
+                    raise AttributeError('bad')
+
+            return T
+
+        names = [
+            'a', '_b', '_T__c', 'm', 'p', 'bad', 'cd', 'cd2', 'zz', 'new',
+            '__doc__', '__module__',
+        ]
+
+        def run(f):
+            try:
+                x = f()
+            except Exception as e:
+                return (type(e), str(e))
+            return (type(x), isfrozen(x), iswrapped(x))
+
+        def compare(pol, mutate=None, change=None):
+            # Wrappers of a class that is not specialized yet are generic
+            T = make()
+            (o1, o2) = (T(), T())
+            g = protect(o1, **pol)
+            assert(type(g).__name__ in ('Protected', 'FrozenProtected'))
+            C = specialize(T, pol)
+            assert(specialize(T, dict(pol)) is C)
+            assert(C.__name__.endswith('Specialized_T'))
+            s = protect(o2, **pol)
+            assert(type(s) is C)
+            assert(isprotected(s) and isfrozen(s) == bool(pol.get('frozen')))
+            if mutate:
+                mutate(o1)
+                mutate(o2)
+            if change:
+                change(T)
+            for n in names:
+                assert(run(lambda: getattr(g, n)) == run(
+                    lambda: getattr(s, n)
+                )), (pol, n)
+                assert(run(lambda: setattr(g, n, 9)) == run(
+                    lambda: setattr(s, n, 9)
+                )), (pol, n)
+                assert(run(lambda: delattr(g, n)) == run(
+                    lambda: delattr(s, n)
+                )), (pol, n)
+            assert(sorted(dir(g)) == sorted(dir(s)))
+            # Other types and policies are not specialized
+            assert(type(protect(T(), ro=['zz'])).__name__ == 'Protected')
+
+        def change(T):
+            T.cd2 = 1
+            T.m = [1]
+
+        for pol in (
+            {}, {'hide_private': True}, {'ro_data': True},
+            {'frozen': True}, {'hide': ['a'], 'ro': ['p']},
+            {'ro_method': False, 'rw': ['a', 'm']}, {'dynamic': False},
+        ):
+            compare(pol)
+            if pol.get('dynamic', True) is False:
+                # Pledge that wrapped objects do not change
+                continue
+            # Method and data changing places in an instance
+            compare(pol, mutate=lambda o: setattr(o, 'm', 1))
+            compare(pol, mutate=lambda o: setattr(o, 'a', len))
+            # Changes to the class are seen
+            compare(pol, change=change)
+
+        with self.assertRaises(TypeError):
+            specialize(make(), {'xyz': 1})
+        with self.assertRaises(TypeError):
+            specialize(type)
+
+    def test_86_seal(self):
+        class P(object):
+            k = 10
+
+            def __init__(self, n):
+                self.x = n
+                self.y = [1, 2]
+                self._p = 3
+                self.__m = 4
+                self.count = 5
+
+            def m(self):
+                return 1
+
+            @property
+            def area(self):
+                return self.x * 2
+
+        o = P(3)
+        r = seal(o)
+        assert(type(r).__name__ == 'P' and r._fields == (
+            '_p', 'area', 'k', 'x', 'y'
+        ))
+        assert((r.x, r.area, r.k, r._p) == (3, 6, 10, 3))
+        assert(r._asdict()['y'] == [1, 2] and isfrozen(r.y))
+        assert(isfrozen(r) and isimmutable(r) and not iswrapped(r))
+        assert(freeze(r) is r and seal(r) is r)
+        assert(type(seal(P(4))) is type(r))
+        for a in ('m', '_P__m', 'zz'):
+            with self.assertRaises(AttributeError):
+                getattr(r, a)
+        # Reserved names are not fields
+        assert(r.count(10) == 1)
+        with self.assertRaises(ProtectionError):
+            r.x = 1
+        with self.assertRaises(ProtectionError):
+            del r.x
+        with self.assertRaises(ProtectionError):
+            r.y.append(3)
+        with self.assertRaises(ProtectionError):
+            pickle.dumps(r)
+        o.x = 7
+        assert(r.x == 3 and r.area == 6)
+
+        # Rules of wrapped objects are applied
+        r = seal(protect(o, hide=['y'], hide_private=True))
+        assert(r._fields == ('area', 'k', 'x'))
+
+    def test_87_cow(self):
+        class In(object):
+            def __init__(self):
+                self.v = 1
+
+        class P(object):
+            def __init__(self):
+                self.x = 1
+                self.l = [1, [2, 3]]
+                self.d = {'a': [1]}
+                self.inner = In()
+                self._p = 2
+
+            def get(self):
+                return self.l
+
+            def set_x(self, x):
+                self.x = x
+
+            def touch(self):
+                self.inner.v = 8
+                self.l[1].append(0)
+                self._p = 3
+                return self._p
+
+        o = P()
+        w = protect(o, cow=True, ro=['d'])
+        assert(isprotected(w) and not isfrozen(w))
+        w.x = 5
+        w.l.append(4)
+        w.l[1].append(5)
+        w.inner.v = 7
+        assert((w.x, w.l, w.inner.v) == (5, [1, [2, 3, 5], 4], 7))
+        # Wrapped object is unchanged
+        assert((o.x, o.l, o.inner.v) == (1, [1, [2, 3]], 1))
+        # Rules still apply
+        with self.assertRaises(ProtectionError):
+            w.d['a'].append(2)
+        with self.assertRaises(ProtectionError):
+            w._p = 3
+        with self.assertRaises(ProtectionError):
+            w.y = 1
+        # Methods see the overlay - and their writes are copied too
+        r = w.get()
+        r.append(6)
+        assert(o.l == [1, [2, 3]] and w.l == [1, [2, 3, 5], 4, 6])
+        d = cow_diff(w)
+        assert(sorted(d) == ['inner', 'l', 'x'])
+        assert(d['l'] == [1, [2, 3, 5], 4, 6] and d['inner'].v == 7)
+        assert(not iswrapped(d['l']) and d['inner'] is not o.inner)
+        # Value read before a write of the attribute is detached
+        a = w.l
+        w.l = [0]
+        a.append(9)
+        assert(w.l == [0] and cow_diff(w)['l'] == [0])
+        assert(get_path(w, 'inner.v') == 7)
+        # freeze() and protect() keep the overlay
+        f = freeze(w)
+        assert(isfrozen(f) and f.x == 5)
+        with self.assertRaises(ProtectionError):
+            f.x = 6
+        w2 = protect(w, ro=['x'])
+        assert(w2.x == 5 and cow_diff(w2) == cow_diff(w))
+        with self.assertRaises(ProtectionError):
+            w2.x = 6
+        # Mutating methods never modify the wrapped object
+        o2 = P()
+        w4 = protect(o2, cow=True)
+        w4.set_x(9)
+        assert(w4.touch() == 3)
+        assert((o2.x, o2.inner.v, o2.l, o2._p) == (1, 1, [1, [2, 3]], 2))
+        assert((w4.x, w4.inner.v, w4.l[1]) == (9, 8, [2, 3, 0]))
+        with self.assertRaises(ProtectionError):
+            freeze(w4).set_x(10)
+        assert((o2.x, w4.x) == (1, 9))
+        # A View is never widened
+        o3 = P()
+        v = protect(view(o3, ['x', 'l', 'get'], frozen=False), cow=True)
+        assert(sorted(dir(v)) == ['get', 'l', 'x'])
+        assert(not isvisible(v, '_p') and not isvisible(v, 'd'))
+        with self.assertRaises(AttributeError):
+            v.d
+        with self.assertRaises(ProtectionError):
+            v.d = 1
+        v.x = 4
+        v.get().append(5)
+        assert((v.x, o3.x, o3.l) == (4, 1, [1, [2, 3]]))
+        assert(sorted(cow_diff(v)) == ['l', 'x'])
+        v2 = protect(v, cow=True, ro=['x'])
+        assert(sorted(dir(v2)) == ['get', 'l', 'x'])
+        with self.assertRaises(AttributeError):
+            v2.d
+        w3 = protect(o, cow=True, frozen=True)
+        assert(type(w3).__name__ == 'FrozenProtected')
+        with self.assertRaises(TypeError):
+            protect([1], cow=True)
+        with self.assertRaises(TypeError):
+            cow_diff(protect(o))
+
+    def test_88_persistent(self):
+        d = dict([(i, [i]) for i in range(100)])
+        m = freeze(d, persistent=True)
+        assert(type(m).__name__ == 'FrozenMap' and not iswrapped(m))
+        assert(isfrozen(m) and isimmutable(m) and freeze(m) is m)
+        assert(m == d and len(m) == 100 and m[5] == [5] and isfrozen(m[5]))
+        with self.assertRaises(ProtectionError):
+            m[5].append(1)
+        with self.assertRaises(TypeError):
+            m[1] = 2
+        m2 = m.set(100, 1).delete(0)
+        assert(len(m2) == 100 and 0 not in m2 and m2[100] == 1)
+        assert(m == d and 100 not in m)
+        with self.assertRaises(KeyError):
+            m.delete(-1)
+        m3 = m.evolve({0: 'a'}, b=2)
+        assert((m3[0], m3['b'], len(m3)) == ('a', 2, 101))
+        # Equal hashes
+        for k in (-1, -2):
+            m3 = m3.set(k, k)
+        assert((m3[-1], m3[-2]) == (-1, -2))
+        assert(m3.delete(-1).get(-2) == -2)
+        assert(isinstance(m, collections.abc.Mapping))
+        # Contents cannot be rebuilt in place
+        h = hash(freeze({'a': 1}, persistent=True))
+        m4 = freeze({'a': 1}, persistent=True)
+        with self.assertRaises(TypeError):
+            m4.__init__({'zzz': 9})
+        assert(m4 == {'a': 1} and hash(m4) == h)
+        with self.assertRaises(TypeError):
+            m.__init__()
+
+        l = list(range(2000))
+        v = freeze(l, persistent=True)
+        assert(type(v).__name__ == 'FrozenVector' and isfrozen(v))
+        assert(v == l and v[1500] == 1500 and v[-1] == 1999)
+        v2 = v.append(2000).set(0, 'a').delete(1)
+        assert((len(v2), v2[0], v2[1], v2[-1]) == (2000, 'a', 2, 2000))
+        assert(v == l and v[10:12] == [10, 11])
+        assert(v.evolve({1: 'b'})[1] == 'b' and v[1] == 1)
+        with self.assertRaises(IndexError):
+            v.set(2000, 1)
+        assert(hash(v) == hash(tuple(l)))
+        assert(pickle.loads(pickle.dumps(v)) == v)
+        assert(isinstance(v, collections.abc.Sequence))
+        with self.assertRaises(TypeError):
+            v.__init__([1])
+        assert(v == l)
+        # Other objects are not changed by persistent=True
+        assert(type(freeze((1, 2), persistent=True)) is tuple)
+
+    def test_89_freeze_deep(self):
+        class N(object):
+            def __init__(self, v):
+                self.v = v
+                self.next = None
+                self.data = [v, {'k': [v]}]
+
+            def m(self):
+                return self.data
+
+        class S(object):
+            __slots__ = ('a', '__b')
+
+            def __init__(self):
+                self.a = [1]
+                self.__b = 2
+
+        a = N(1)
+        b = N(2)
+        (a.next, b.next) = (b, a)
+        shared = [9]
+        cfg = {'a': a, 'l': [shared, shared], 't': (shared,), 's': S()}
+        f = freeze_deep(cfg)
+        assert(type(f).__name__ == 'DeepFrozen' and isfrozen(f))
+        assert(freeze(f) is f and f == cfg and list(f) == list(cfg))
+        # Cycles and sharing - ONE wrapper per object
+        assert(f['a'].next.next is f['a'])
+        assert(f['l'][0] is f['l'][1] is f['t'][0] is f['l'][-1])
+        assert([x is f['l'][0] for x in f['l']] == [True, True])
+        assert(f['a'].data[1]['k'] == [1] and isfrozen(f['a'].data[1]))
+        assert(get_path(f, "['a'].next.data") is f['a'].next.data)
+        assert((f['s'].a, f['s']._S__b) == ([1], 2))
+        with self.assertRaises(ProtectionError):
+            f['a'].data.append(1)
+        with self.assertRaises(ProtectionError):
+            f['a'].v = 2
+        # Methods are frozen on read
+        assert(isfrozen(f['a'].m()))
+        # Reads do not freeze
+        prev = enable_stats(True)
+        try:
+            reset_stats()
+            f['a'].next.data[1]['k']
+            assert(not stats().get('freeze_allocated', 0))
+        finally:
+            enable_stats(prev)
+        # Immutable and wrapped objects
+        assert(freeze_deep(5) == 5)
+        w = protect(a, hide=['v'])
+        assert(not isvisible(freeze_deep(w), 'v'))
+        # Rules of protect_class() apply - as with freeze()
+        class H(object):
+            __slots__ = ('s', 't', '__dict__')
+
+            def __init__(self):
+                self.a = [1]
+                self.b = 2
+                self.s = 3
+                self.t = 4
+
+        PH = protect_class(H, hide=['a', 's'])
+        ph = PH()
+        for f in (freeze(ph), freeze_deep(ph)):
+            with self.assertRaises(AttributeError):
+                f.a
+            with self.assertRaises(AttributeError):
+                f.s
+            assert((f.b, f.t) == (2, 4))
+        g = freeze_deep({'k': ph})
+        with self.assertRaises(AttributeError):
+            g['k'].a
+        assert(get_path(g, "['k'].b") == 2)
+
+    def test_90_freeze_depth(self):
+        class A:
+            pass
+
+        a = A()
+        a.b = A()
+        a.b.c = [1, [2]]
+        a.s = {'x'}
+        f = freeze(a, depth=2)
+        assert(isfrozen(f) and isfrozen(f.b))
+        # Below the depth - returned as-is
+        assert(type(f.b.c) is list and f.b.c is a.b.c)
+        with self.assertRaises(ProtectionError):
+            f.b.x = 1
+        assert(get_path(f, 'b.c') is a.b.c)
+        assert([type(x) for x in freeze([[1]], depth=1)] == [list])
+        assert(type(freeze({'k': [1]}, depth=1)['k']) is list)
+        # Unlimited depth, trusted types
+        g = freeze(a, skip_types=set)
+        assert(g.s is a.s)
+        assert(isfrozen(g.b.c) and isfrozen(g.b.c[1]))
+        with self.assertRaises(ProtectionError):
+            g.b.c[1].append(3)
+        l = [1]
+        assert(freeze(l, skip_types=(dict, list)) is l)
+        # Wrapped objects are never skipped
+        p = protect(a, ro_data=True)
+        assert(isfrozen(freeze(p, skip_types=A)))
+        assert(not isfrozen(freeze(p, depth=1).b))
+        # Default is unchanged: frozen all the way down
+        assert(isfrozen(freeze(a).b.c[1]))
+        with self.assertRaises(ValueError):
+            freeze(a, depth=0)
+        with self.assertRaises(TypeError):
+            freeze(a, skip_types=1)
+
+    def test_91_freeze_arena(self):
+        shared = {'k': -5, 'big': 1 << 70}
+        d = {
+            'a': 1, 'l': [1, 2.5, None, True, 'x', (1, 'y'), shared],
+            'c': shared, 'e': b'x',
+        }
+        a = freeze_arena(d)
+        assert(type(a).__name__ == 'ArenaMapping')
+        assert(isfrozen(a) and isimmutable(a) and freeze(a) is a)
+        assert(not iswrapped(a))
+        assert(a == d and d == a and list(a) == list(d) and len(a) == 4)
+        assert(isinstance(a, collections.abc.Mapping))
+        assert(isinstance(a['l'], collections.abc.Sequence))
+        assert(a['l'][5] == (1, 'y') and a['l'][5] != [1, 'y'])
+        assert(a['l'] == d['l'] and a['l'][1:3] == (2.5, None))
+        assert(a['l'][-1] == a['c'] and a['c']['big'] == 1 << 70)
+        assert(a.get('z') is None and 'c' in a and 'z' not in a)
+        assert(get_path(a, "['l'][6]['k']") == -5)
+        with self.assertRaises(KeyError):
+            a['z']
+        with self.assertRaises(IndexError):
+            a['l'][7]
+        with self.assertRaises(TypeError):
+            a['a'] = 2
+        with self.assertRaises(AttributeError):
+            a['l'].append(1)
+        # Records with the same keys share one key index
+        recs = [{'id': i, 'name': 'n%d' % (i % 3)} for i in range(10)]
+        r = freeze_arena(recs)
+        assert(r == recs and r[9]['name'] == 'n0')
+        assert(r[4]['name'] is r[7]['name'])
+        # Cycles
+        l = []
+        l.append(l)
+        c = freeze_arena(l)
+        assert(len(c) == 1 and c[0][0] == c)
+        l = [1]
+        l.append(l)
+        c = freeze_arena(l)
+        assert(repr(c) == 'ArenaSequence([1, [...]])')
+        assert(c == l and l == c and c == freeze_arena(copy.deepcopy(l)))
+        assert(hash(c) == hash(freeze_arena(copy.deepcopy(l))))
+        l2 = [2]
+        l2.append(l2)
+        assert(c != freeze_arena(l2) and c != l2)
+        cd = {'x': 1}
+        cd['d'] = cd
+        m = freeze_arena(cd)
+        assert(repr(m) == "ArenaMapping({'x': 1, 'd': {...}})")
+        assert(m == cd and cd == m and m['d']['d'] == m)
+        assert(isinstance(hash(m), int))
+        assert(freeze_arena(5) == 5)
+        with self.assertRaises(TypeError):
+            freeze_arena({'s': {1}})
+        with self.assertRaises(TypeError):
+            freeze_arena(set())
+
+    def test_92_frozen_buffer(self):
+        import array
+        import hashlib
+        import mmap
+        import struct
+
+        b = bytearray(b'abcdef')
+        f = freeze(b)
+        assert(hashlib.sha1(f).digest() == hashlib.sha1(b).digest())
+        assert(struct.unpack_from('<H', f, 1) == struct.unpack_from('<H', b, 1))
+        m = memoryview(f)
+        assert(m.readonly and m.obj is f and m.tobytes() == b'abcdef')
+        with self.assertRaises(TypeError):
+            m[0] = 1
+        # Zero-copy - the bytearray is exported while 'm' is alive
+        with self.assertRaises(BufferError):
+            b.append(1)
+        m.release()
+        b.append(0x67)
+        assert(bytes(memoryview(f)) == b'abcdefg')
+        a = memoryview(freeze(array.array('i', [1, 2, 3])))
+        assert(a.format == 'i' and a.tolist() == [1, 2, 3] and a.readonly)
+        assert(memoryview(freeze(memoryview(b))).readonly)
+        mm = mmap.mmap(-1, 16)
+        mm.write(b'hello')
+        assert(bytes(memoryview(freeze(mm))[:5]) == b'hello')
+        for w in (protect(b, frozen=True), private(b, frozen=True)):
+            assert(memoryview(w).tobytes() == b'abcdefg')
+        # Not frozen - no buffer
+        with self.assertRaises(TypeError):
+            memoryview(wrap(b))
+
+        class AI:
+            __array_struct__ = None
+
+            @property
+            def __array_interface__(self):
+                return {
+                    'shape': (8,), 'typestr': '|u1', 'data': (123, False),
+                    'version': 3,
+                }
+
+            def __array__(self):
+                return self
+
+        fi = freeze(AI())
+        d = fi.__array_interface__
+        assert(type(d) is dict and d['data'] == (123, True))
+        assert(protect(AI(), frozen=True).__array_interface__['data'][1])
+        assert(not hasattr(fi, '__array_struct__'))
+        assert(not hasattr(fi, '__array__'))
+        assert(wrap(AI()).__array_interface__['data'] == (123, False))
 
 if __name__ == '__main__':
     unittest.main(verbosity=1)
@@ -27,6 +27,14 @@ from pyprotect import (
     always_delegated_attributes,
     isreadonly,
     isvisible,
+    enable_stats, reset_stats, stats,
+    set_slow_path_hook,
+    memory_report,
+    record_access, access_report,
+    acl, getattrs, setattrs, view, compile_path, get_path,
+    protect_class, protected, specialize, seal, cow_diff, freeze_deep,
+    freeze_arena,
+    ProtectionError,
 )
 
 